@@ -6,6 +6,11 @@
  * `mv_*` tables on the worker — without this the Node process serves
  * stale blobs for up to 12h (the cached() TTL).
  *
+ * The pipeline daemon calls this after each materializer run that changed
+ * rows, once per cache-key prefix reading that view (see
+ * pipeline/runner/frontend_cache.py; enabled when the worker has
+ * REVALIDATE_API_KEY set). Runs with 0 changed rows are not busted.
+ *
  * Auth: header `x-revalidate-token: <REVALIDATE_API_KEY>`.
  *
  * Body: optional JSON `{ "prefix": "centroid_cal" }` to scope to one
@@ -1,5 +1,6 @@
 """WorldBrief Configuration Management"""
 
+import os
 from pathlib import Path
 from typing import List, Optional
 
@@ -38,6 +39,26 @@ class SNIConfig(BaseSettings):
     llm_retry_attempts: int = Field(default=3, env="LLM_RETRY_ATTEMPTS")
     llm_retry_backoff: float = Field(default=2.0, env="LLM_RETRY_BACKOFF")
 
+    # Shared async LLM client (core/llm_client.py): token bucket + adaptive
+    # in-flight limit that grows until 429s or slow responses push back
+    llm_http2: bool = Field(default=True, env="LLM_HTTP2")
+    llm_rate_limit_rps: float = Field(default=10.0, env="LLM_RATE_LIMIT_RPS")
+    llm_rate_limit_burst: int = Field(default=20, env="LLM_RATE_LIMIT_BURST")
+    llm_initial_concurrency: int = Field(default=5, env="LLM_INITIAL_CONCURRENCY")
+    llm_min_concurrency: int = Field(default=2, env="LLM_MIN_CONCURRENCY")
+    llm_max_concurrency: int = Field(default=48, env="LLM_MAX_CONCURRENCY")
+    llm_latency_backoff_factor: float = Field(
+        default=2.5, env="LLM_LATENCY_BACKOFF_FACTOR"
+    )
+    # Shared LLM result cache (core/llm_cache.py): identical model +
+    # temperature + prompts reuse the stored completion. Comma-separated
+    # phases in LLM_CACHE_BYPASS never use it
+    llm_cache: bool = Field(default=True, env="LLM_CACHE")
+    llm_cache_ttl_hours: float = Field(default=168, env="LLM_CACHE_TTL_HOURS")
+    llm_cache_max_entries: int = Field(default=5000, env="LLM_CACHE_MAX_ENTRIES")
+    llm_cache_max_rows: int = Field(default=200000, env="LLM_CACHE_MAX_ROWS")
+    llm_cache_bypass: str = Field(default="labels", env="LLM_CACHE_BYPASS")
+
     # ========================================================================
     # Pipeline Configuration
     # ========================================================================
@@ -47,19 +68,47 @@ class SNIConfig(BaseSettings):
     lookback_days: int = Field(default=3, env="LOOKBACK_DAYS")
     http_retries: int = Field(default=3, env="HTTP_RETRIES")
     http_timeout_sec: int = Field(default=30, env="HTTP_TIMEOUT_SEC")
+    # Concurrent ingestion (asyncio/httpx). Google News feeds all share one
+    # host, so the per-host cap is what actually bounds load on news.google.com.
+    ingest_concurrent: bool = Field(default=True, env="INGEST_CONCURRENT")
+    http_max_concurrency: int = Field(default=24, env="HTTP_MAX_CONCURRENCY")
+    http_max_per_host: int = Field(default=8, env="HTTP_MAX_PER_HOST")
+    ingest_db_pool_size: int = Field(default=8, env="INGEST_DB_POOL_SIZE")
+    # Title normalization + language detection process pool (0 =
+    # default_workers(), 1 = inline). Trusted feeds.language_code hints skip
+    # detection entirely.
+    ingest_normalize_workers: int = Field(default=0, env="INGEST_NORMALIZE_WORKERS")
+    ingest_language_hint: bool = Field(default=True, env="INGEST_LANGUAGE_HINT")
 
     # Phase 2: Centroid Matching (3-pass mechanical, no LLM)
     v3_p2_batch_size: int = Field(default=100, env="V3_P2_BATCH_SIZE")
     v3_p2_timeout_seconds: int = Field(default=180, env="V3_P2_TIMEOUT_SECONDS")
     v3_p2_max_titles: Optional[int] = Field(default=None, env="V3_P2_MAX_TITLES")
+    # Compiled taxonomy pickle in cache_dir, rebuilt when taxonomy_v3 changes
+    v3_p2_taxonomy_cache: bool = Field(default=True, env="V3_P2_TAXONOMY_CACHE")
+    # Streaming full rematch (match_centroids.py --rematch) worker processes,
+    # each with its own Postgres connection; 0 = default_workers()
+    v3_p2_rematch_workers: int = Field(default=0, env="V3_P2_REMATCH_WORKERS")
+    v3_p2_rematch_chunk_size: int = Field(default=20000, env="V3_P2_REMATCH_CHUNK_SIZE")
 
     # Phase 3.1: Event Label + Signal Extraction (ELO v2.0)
     v3_p31_temperature: float = Field(default=0.1, env="V3_P31_TEMPERATURE")
     v3_p31_max_tokens: int = Field(default=4000, env="V3_P31_MAX_TOKENS")
-    v3_p31_batch_size: int = Field(default=25, env="V3_P31_BATCH_SIZE")
+    # Calls are packed to the token budgets below; batch_size is only a hard cap
+    v3_p31_batch_size: int = Field(default=40, env="V3_P31_BATCH_SIZE")
+    v3_p31_batch_token_budget: int = Field(
+        default=2000, env="V3_P31_BATCH_TOKEN_BUDGET"
+    )
+    v3_p31_output_tokens_per_title: int = Field(
+        default=140, env="V3_P31_OUTPUT_TOKENS_PER_TITLE"
+    )
+    # Starting window only; the shared LLM client adapts from there
     v3_p31_concurrency: int = Field(default=5, env="V3_P31_CONCURRENCY")
     v3_p31_timeout_seconds: int = Field(default=180, env="V3_P31_TIMEOUT_SECONDS")
     v3_p31_max_titles: int = Field(default=500, env="V3_P31_MAX_TITLES")
+    # Per-title result cache (normalized title + ontology + prompt); 0 = no expiry
+    v3_p31_cache: bool = Field(default=True, env="V3_P31_CACHE")
+    v3_p31_cache_max_age_days: int = Field(default=30, env="V3_P31_CACHE_MAX_AGE_DAYS")
 
     # Phase 3.3: Intel Gating + Track Classification (LLM-based)
     v3_p33_temperature: float = Field(default=0.0, env="V3_P33_TEMPERATURE")
@@ -79,6 +128,9 @@ class SNIConfig(BaseSettings):
     v3_p4_temperature: float = Field(default=0.5, env="V3_P4_TEMPERATURE")
     v3_p4_max_tokens: int = Field(default=500, env="V3_P4_MAX_TOKENS")
     v3_p4_timeout_seconds: int = Field(default=180, env="V3_P4_TIMEOUT_SECONDS")
+    # Daemon event clustering process pool (0 = min(4, usable CPUs), 1 = inline).
+    # Each worker process holds one Postgres connection for the daemon's life
+    v3_p4_cluster_workers: int = Field(default=0, env="V3_P4_CLUSTER_WORKERS")
 
     # Phase 4.5: CTM Summaries
     v3_p45_cooldown_hours: int = Field(default=24, env="V3_P45_COOLDOWN_HOURS")
@@ -86,6 +138,16 @@ class SNIConfig(BaseSettings):
     # Phase 4.5a: Event Summaries
     v3_p45a_max_events: int = Field(default=500, env="V3_P45A_MAX_EVENTS")
     v3_p45a_interval: int = Field(default=900, env="V3_P45A_INTERVAL")  # 15 min
+    # Legacy full-scan 4.5a: events in flight across all CTMs, and finished
+    # events per writer-thread commit
+    v3_p45a_concurrency: int = Field(default=12, env="V3_P45A_CONCURRENCY")
+    v3_p45a_write_batch: int = Field(default=25, env="V3_P45A_WRITE_BATCH")
+    # Grown events: update the previous summary from the new headlines only
+    v3_p45a_delta: bool = Field(default=True, env="V3_P45A_DELTA")
+    # Full rewrites the model marks "coherent": false go to catchall
+    v3_p45a_incoherent_to_catchall: bool = Field(
+        default=False, env="V3_P45A_INCOHERENT_TO_CATCHALL"
+    )
 
     # Phase 5: CTM Narrative Extraction
     v3_p5_min_titles: int = Field(default=100, env="V3_P5_MIN_TITLES")
@@ -122,6 +184,17 @@ class SNIConfig(BaseSettings):
     v3_ctm_table: str = Field(default="ctm", env="V3_CTM_TABLE")
     v3_titles_table: str = Field(default="titles_v3", env="V3_TITLES_TABLE")
 
+    # ========================================================================
+    # Pipeline Daemon: multiple workers (pipeline/runner/leases.py)
+    # ========================================================================
+    # Blank = hostname:pid:<random>; must be unique per running daemon
+    daemon_worker_id: str = Field(default="", env="DAEMON_WORKER_ID")
+    # Leases not heartbeated for this long are reclaimed by other workers
+    work_lease_seconds: int = Field(default=300, env="WORK_LEASE_SECONDS")
+    # Busts the frontend cache after materializers change mv_* rows
+    # (POST <SOCIAL_BASE_URL>/api/admin/revalidate-cache); unset = disabled
+    revalidate_api_key: Optional[str] = Field(default=None, env="REVALIDATE_API_KEY")
+
     # ========================================================================
     # Slot 5: Social Posting
     # ========================================================================
@@ -195,6 +268,13 @@ class SNIConfig(BaseSettings):
         logs_path.mkdir(exist_ok=True)
         return logs_path
 
+    @property
+    def cache_dir(self) -> Path:
+        """Derived artifacts that are safe to delete (e.g. compiled taxonomy)"""
+        cache_path = self.project_root / "cache"
+        cache_path.mkdir(exist_ok=True)
+        return cache_path
+
 
 # Global config instance
 config = SNIConfig()
@@ -374,6 +454,21 @@ MAX_API_ERRORS = 3
 # there is no gate to skip.
 
 
+# Process pools (clustering, title normalization, rematch) default to at
+# most this many workers: os.cpu_count() is the host's count inside
+# containers, and pool workers that talk to Postgres hold a connection each.
+MAX_DEFAULT_WORKERS = 4
+
+
+def default_workers(cap: int = MAX_DEFAULT_WORKERS) -> int:
+    """min(cap, CPUs this process may run on)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on Windows / macOS
+        cpus = os.cpu_count() or 1
+    return max(1, min(cap, cpus))
+
+
 def get_track_weights(track: str) -> dict:
     """Get signal weights for a track."""
     return TRACK_WEIGHTS.get(track, TRACK_WEIGHTS["default"])
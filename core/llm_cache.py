@@ -0,0 +1,280 @@
+"""Pipeline-wide LLM result cache.
+
+Identical requests (same model, temperature, system prompt and user
+messages) get the stored completion instead of a new call. Keys are
+sha256(model, temperature, sha256(system), sha256(user)).
+
+Two layers:
+    memory  -- per-process LRU (LLM_CACHE_MAX_ENTRIES), entries expire after
+               LLM_CACHE_TTL_HOURS
+    table   -- llm_result_cache, shared by every process; lookups ignore rows
+               older than the TTL and prune() trims expired rows plus the
+               least recently used beyond LLM_CACHE_MAX_ROWS
+
+The table is reached over one connection per process (serialized by a
+lock). Lookups only read: hits are counted in memory and flush_stats()
+writes hit_count / last_hit_at for all of them in one UPDATE.
+
+Phases listed in LLM_CACHE_BYPASS never read or write the cache (labels has
+its own per-title cache; calls that must re-ask pass cache=False).
+
+Hits / misses are counted per phase and written by flush_stats() as
+llm_stats status='cache' rows via log_cache_stats().
+
+    cache = get_llm_cache()
+    key = cache.key(model, temperature, messages)
+    content = cache.get(phase, key)          # None on miss / bypass
+    ...
+    cache.put(phase, key, model, content)
+"""
+
+import hashlib
+import threading
+import time
+from collections import Counter, OrderedDict
+
+import psycopg2
+from loguru import logger
+from psycopg2 import errors as pg_errors
+from psycopg2.extras import execute_values
+
+from core.config import config
+from core.llm_logger import log_cache_stats
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class LLMResultCache:
+    """Memory LRU in front of the llm_result_cache table. Thread-safe;
+    table errors only disable the table layer, never the caller."""
+
+    def __init__(
+        self,
+        enabled: bool,
+        ttl_hours: float,
+        max_entries: int,
+        max_rows: int,
+        bypass: set,
+        persist: bool = True,
+    ):
+        self.enabled = enabled
+        self.ttl_sec = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.bypass = bypass
+        self.persist = persist
+        self._memory = OrderedDict()  # key -> (stored_at, content)
+        self._hits = Counter()
+        self._misses = Counter()
+        self._key_hits = Counter()  # key -> hits not yet written to the table
+        self._lock = threading.Lock()
+        self._conn = None
+        self._db_lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, temperature, messages: list[dict]) -> str:
+        """Content address of a chat request"""
+        system = "\n".join(m["content"] for m in messages if m["role"] == "system")
+        user = "\n".join(
+            "%s:%s" % (m["role"], m["content"])
+            for m in messages
+            if m["role"] != "system"
+        )
+        return _sha("\x1f".join((model, repr(temperature), _sha(system), _sha(user))))
+
+    def active(self, phase: str, cache: bool = None) -> bool:
+        """Whether `phase` uses the cache (`cache` overrides per call)"""
+        if cache is not None:
+            return cache and self.enabled
+        return self.enabled and phase not in self.bypass
+
+    def get(self, phase: str, key: str) -> str | None:
+        """Cached content for `key`, counting a hit or miss for `phase`"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry[0] <= self.ttl_sec:
+                self._memory.move_to_end(key)
+                self._hits[phase] += 1
+                self._key_hits[key] += 1
+                return entry[1]
+            if entry:
+                del self._memory[key]
+
+        content = self._load(key) if self.persist else None
+        with self._lock:
+            if content is None:
+                self._misses[phase] += 1
+                return None
+            self._hits[phase] += 1
+            self._key_hits[key] += 1
+            self._remember(key, content, now)
+        return content
+
+    def put(self, phase: str, key: str, model: str, content: str) -> None:
+        with self._lock:
+            self._remember(key, content, time.time())
+        if self.persist:
+            self._store(key, phase, model, content)
+
+    def _remember(self, key, content, now):
+        self._memory[key] = (now, content)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # -- table layer --------------------------------------------------------
+
+    def _run(self, fn):
+        """Run fn(cur) on the cache's connection; None on any failure"""
+        with self._db_lock:
+            try:
+                if self._conn is None or self._conn.closed:
+                    self._conn = psycopg2.connect(
+                        **config.db_connect_kwargs(), connect_timeout=3
+                    )
+                try:
+                    with self._conn.cursor() as cur:
+                        result = fn(cur)
+                    self._conn.commit()
+                    return result
+                except Exception:
+                    self._conn.rollback()
+                    raise
+            except pg_errors.UndefinedTable:
+                logger.warning(
+                    "llm_result_cache missing (run db/migrations/"
+                    "20261016_llm_result_cache.sql); caching in memory only"
+                )
+                self.persist = False
+            except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                # Broken connection: reconnect on the next call
+                logger.debug("LLM result cache unavailable: {}".format(e))
+                self.close()
+            except Exception as e:
+                logger.debug("LLM result cache unavailable: {}".format(e))
+        return None
+
+    def close(self) -> None:
+        """Drop the table connection (reopened on next use)"""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    def _load(self, key):
+        def fn(cur):
+            cur.execute(
+                """SELECT content FROM llm_result_cache
+                    WHERE cache_key = %s
+                      AND created_at > NOW() - make_interval(secs => %s)""",
+                (key, self.ttl_sec),
+            )
+            row = cur.fetchone()
+            return row[0] if row else None
+
+        return self._run(fn)
+
+    def _write_hits(self, hits: dict) -> None:
+        """Add per-key hit counts and stamp last_hit_at, one statement"""
+
+        def fn(cur):
+            execute_values(
+                cur,
+                """UPDATE llm_result_cache c
+                      SET hit_count = c.hit_count + v.n, last_hit_at = NOW()
+                     FROM (VALUES %s) AS v(cache_key, n)
+                    WHERE c.cache_key = v.cache_key""",
+                sorted(hits.items()),
+            )
+
+        self._run(fn)
+
+    def _store(self, key, phase, model, content):
+        def fn(cur):
+            cur.execute(
+                """INSERT INTO llm_result_cache (cache_key, phase, model, content)
+                   VALUES (%s, %s, %s, %s)
+                   ON CONFLICT (cache_key) DO UPDATE SET
+                       content = EXCLUDED.content,
+                       created_at = NOW()""",
+                (key, phase, model, content),
+            )
+
+        self._run(fn)
+
+    def prune(self) -> int:
+        """Drop expired rows and the least recently used beyond max_rows"""
+        if not self.persist:
+            return 0
+
+        def fn(cur):
+            cur.execute(
+                """DELETE FROM llm_result_cache
+                    WHERE created_at <= NOW() - make_interval(secs => %s)""",
+                (self.ttl_sec,),
+            )
+            deleted = cur.rowcount
+            cur.execute(
+                """DELETE FROM llm_result_cache
+                    WHERE cache_key IN (
+                        SELECT cache_key FROM llm_result_cache
+                         ORDER BY COALESCE(last_hit_at, created_at) DESC
+                        OFFSET %s)""",
+                (self.max_rows,),
+            )
+            return deleted + cur.rowcount
+
+        return self._run(fn) or 0
+
+    # -- metrics ------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """{phase: (hits, misses)} since the last flush"""
+        with self._lock:
+            phases = set(self._hits) | set(self._misses)
+            return {p: (self._hits[p], self._misses[p]) for p in phases}
+
+    def flush_stats(self) -> dict:
+        """Write one llm_stats cache row per phase and the pending per-key
+        hit counts, reset the counters and prune the table. Returns the
+        per-phase stats that were written."""
+        with self._lock:
+            phases = set(self._hits) | set(self._misses)
+            stats = {p: (self._hits[p], self._misses[p]) for p in phases}
+            key_hits = dict(self._key_hits)
+            self._hits.clear()
+            self._misses.clear()
+            self._key_hits.clear()
+        for phase, (hits, misses) in sorted(stats.items()):
+            log_cache_stats(phase, hits, misses)
+        if key_hits and self.persist:
+            self._write_hits(key_hits)
+        if stats:
+            self.prune()
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResultCache:
+    """Process-wide shared LLMResultCache (created on first use)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResultCache(
+                enabled=config.llm_cache,
+                ttl_hours=config.llm_cache_ttl_hours,
+                max_entries=config.llm_cache_max_entries,
+                max_rows=config.llm_cache_max_rows,
+                bypass={
+                    p.strip() for p in config.llm_cache_bypass.split(",") if p.strip()
+                },
+            )
+        return _cache
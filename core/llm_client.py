@@ -0,0 +1,420 @@
+"""Shared async LLM client.
+
+One long-lived httpx.AsyncClient (HTTP/2 when `h2` is installed, keep-alive
+otherwise) running on a dedicated event-loop thread, so every phase in the
+process reuses the same TLS connections across batches and daemon cycles.
+
+Requests pass through two process-wide gates:
+    TokenBucket          -- request rate; a 429/5xx pauses the whole bucket
+                            for the provider's Retry-After (see
+                            core.llm_utils.rate_limit_wait)
+    AdaptiveConcurrency  -- in-flight cap, AIMD: grows while calls succeed
+                            at normal latency, shrinks on 429s, timeouts or
+                            latency well above the phase's baseline
+
+Successful calls also land in a per-phase LatencyHistogram (client.latency).
+Identical requests are answered from the shared result cache
+(core/llm_cache.py) unless the phase bypasses it.
+
+Sync callers (the phases are sync, the daemon runs them in threads):
+    client = get_llm_client()
+    content, usage = client.chat_sync(messages, phase="labels", ...)
+    future = client.submit(client.chat(messages, phase="labels", ...))
+
+Coroutines on their own loop (asyncio.run in a phase script):
+    content, usage = await client.chat_from(messages, phase="...", ...)
+"""
+
+import asyncio
+import atexit
+import threading
+import time
+
+import httpx
+from loguru import logger
+
+from core.config import config
+from core.llm_cache import get_llm_cache
+from core.llm_logger import log_llm_call
+from core.llm_utils import rate_limit_wait
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class TokenBucket:
+    """Async token bucket (requests/sec) with a global pause for 429s.
+
+    Only used from the client's event loop, so no locking is needed.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for `seconds` (provider asked us to wait)"""
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0.0
+        self._updated = now
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on in-flight requests.
+
+    +1/limit per healthy response (about +1 per round of calls), x0.7 on
+    pushback, at most one decrease per cooldown so a burst of slow responses
+    from the same wave only counts once.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        latency_factor: float,
+        cooldown_sec: float = 2.0,
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.latency_factor = latency_factor
+        self.cooldown_sec = cooldown_sec
+        self._limit = float(min(max(initial, self.minimum), self.maximum))
+        self._in_flight = 0
+        self._baseline = {}  # phase -> EWMA latency (sec)
+        self._last_decrease = 0.0
+        self._observed = False
+        self._cond = None
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def seed(self, initial: int) -> None:
+        """Set the starting window, unless real observations exist already"""
+        if not self._observed:
+            self._limit = float(min(max(initial, self.minimum), self.maximum))
+
+    async def acquire(self) -> None:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < int(self._limit))
+            self._in_flight += 1
+
+    async def release(self) -> None:
+        async with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self, phase: str, latency_sec: float) -> None:
+        self._observed = True
+        baseline = self._baseline.get(phase)
+        if baseline is None:
+            self._baseline[phase] = latency_sec
+            baseline = latency_sec
+        else:
+            self._baseline[phase] = 0.95 * baseline + 0.05 * latency_sec
+
+        if latency_sec > self.latency_factor * baseline:
+            self.on_pushback()
+        else:
+            self._limit = min(self.maximum, self._limit + 1.0 / self._limit)
+
+    def on_pushback(self) -> None:
+        self._observed = True
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown_sec:
+            return
+        self._last_decrease = now
+        self._limit = max(self.minimum, self._limit * 0.7)
+        logger.info("LLM concurrency backed off to {}".format(int(self._limit)))
+
+
+class LatencyHistogram:
+    """Call latency counts in fixed, doubling buckets (seconds).
+
+    Cheap enough to feed on every call; quantiles are bucket upper bounds.
+    """
+
+    BOUNDS = (0.5, 1, 2, 4, 8, 16, 32, 64, 128)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)  # last = overflow
+        self.total = 0
+        self.sum_sec = 0.0
+        self.max_sec = 0.0
+
+    def observe(self, seconds: float) -> None:
+        i = 0
+        while i < len(self.BOUNDS) and seconds > self.BOUNDS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.total += 1
+        self.sum_sec += seconds
+        self.max_sec = max(self.max_sec, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (max on overflow)"""
+        if not self.total:
+            return 0.0
+        rank = q * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.BOUNDS[i] if i < len(self.BOUNDS) else self.max_sec
+        return self.max_sec
+
+    def format(self) -> str:
+        if not self.total:
+            return "no calls"
+        head = "n={} avg={:.1f}s p50<={:g}s p95<={:g}s max={:.1f}s".format(
+            self.total,
+            self.sum_sec / self.total,
+            self.quantile(0.5),
+            self.quantile(0.95),
+            self.max_sec,
+        )
+        labels = ["<={:g}s".format(b) for b in self.BOUNDS] + [
+            ">{:g}s".format(self.BOUNDS[-1])
+        ]
+        buckets = " ".join(
+            "{}:{}".format(label, count)
+            for label, count in zip(labels, self.counts)
+            if count
+        )
+        return "{} | {}".format(head, buckets)
+
+
+class LLMClient:
+    """Long-lived async chat-completions client on its own event loop."""
+
+    def __init__(self):
+        self.api_url = "{}/chat/completions".format(config.deepseek_api_url)
+        self.bucket = TokenBucket(
+            config.llm_rate_limit_rps, config.llm_rate_limit_burst
+        )
+        self.limiter = AdaptiveConcurrency(
+            initial=config.llm_initial_concurrency,
+            minimum=config.llm_min_concurrency,
+            maximum=config.llm_max_concurrency,
+            latency_factor=config.llm_latency_backoff_factor,
+        )
+        self.http2 = config.llm_http2 and HTTP2_AVAILABLE
+        self.latency = {}  # phase -> LatencyHistogram (successful calls)
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="llm-client", daemon=True
+        )
+        self._thread.start()
+        self._http = None
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            limits = httpx.Limits(
+                max_connections=config.llm_max_concurrency,
+                max_keepalive_connections=config.llm_max_concurrency,
+                keepalive_expiry=120,
+            )
+            self._http = httpx.AsyncClient(
+                http2=self.http2,
+                limits=limits,
+                headers={
+                    "Authorization": "Bearer {}".format(config.deepseek_api_key),
+                    "Content-Type": "application/json",
+                },
+            )
+        return self._http
+
+    async def chat(
+        self,
+        messages: list[dict],
+        *,
+        phase: str,
+        temperature: float = None,
+        max_tokens: int = None,
+        timeout: float = None,
+        model: str = None,
+        cache: bool = None,
+        validate=None,
+    ) -> tuple[str, dict]:
+        """Run one chat completion with retries.
+
+        `cache` overrides the phase's result-cache setting for this call
+        (False = always ask the model). Only complete answers
+        (finish_reason "stop") are cached, and only when `validate(content)`
+        (e.g. extract_json) returns a truthy value without raising -- a
+        malformed answer must not be replayed for the whole TTL.
+
+        Returns:
+            (content, usage) -- stripped message content and provider usage
+            ({} when answered from the result cache)
+        """
+        payload = {
+            "model": model or config.llm_model,
+            "messages": messages,
+        }
+        if temperature is not None:
+            payload["temperature"] = temperature
+        if max_tokens is not None:
+            payload["max_tokens"] = max_tokens
+
+        results = get_llm_cache()
+        cache_key = None
+        if results.active(phase, cache):
+            cache_key = results.key(payload["model"], temperature, messages)
+            cached = await asyncio.to_thread(results.get, phase, cache_key)
+            if cached is not None:
+                return cached, {}
+
+        client = self._client()
+        attempts = config.llm_retry_attempts
+        for attempt in range(attempts):
+            await self.bucket.acquire()
+            await self.limiter.acquire()
+            t0 = time.monotonic()
+            try:
+                response = await client.post(
+                    self.api_url,
+                    json=payload,
+                    timeout=timeout or config.llm_timeout_seconds,
+                )
+                latency = time.monotonic() - t0
+
+                wait = rate_limit_wait(response, attempt)
+                if wait is not None:
+                    logger.warning(
+                        "HTTP {} from LLM API, pausing requests {:.0f}s "
+                        "(attempt {})".format(response.status_code, wait, attempt + 1)
+                    )
+                    self.bucket.pause(wait)
+                    self.limiter.on_pushback()
+                    continue
+
+                if response.status_code != 200:
+                    raise Exception(
+                        "API error: {} - {}".format(
+                            response.status_code, response.text[:200]
+                        )
+                    )
+
+                data = response.json()
+                choice = data["choices"][0]
+                content = choice["message"]["content"].strip()
+                usage = data.get("usage") or {}
+                self.limiter.on_success(phase, latency)
+                if phase not in self.latency:
+                    self.latency[phase] = LatencyHistogram()
+                self.latency[phase].observe(latency)
+
+            except Exception as e:
+                if isinstance(e, httpx.TimeoutException):
+                    self.limiter.on_pushback()
+                if attempt == attempts - 1:
+                    logger.error(
+                        "LLM call failed after {} attempts: {}".format(attempts, e)
+                    )
+                    raise
+
+                delay = (config.llm_retry_backoff**attempt) + (0.1 * attempt)
+                logger.warning(
+                    "LLM attempt {} failed: {}. Retrying in {:.1f}s".format(
+                        attempt + 1, e, delay
+                    )
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            finally:
+                await self.limiter.release()
+
+            await asyncio.to_thread(
+                log_llm_call, phase, usage, int(latency * 1000), payload["model"]
+            )
+            if (
+                cache_key is not None
+                and choice.get("finish_reason") == "stop"
+                and _cacheable(content, validate)
+            ):
+                await asyncio.to_thread(
+                    results.put, phase, cache_key, payload["model"], content
+                )
+            return content, usage
+
+        raise Exception("LLM API still rate limited after {} attempts".format(attempts))
+
+    def submit(self, coro):
+        """Schedule a coroutine on the client loop; returns a
+        concurrent.futures.Future usable from any thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def chat_sync(self, messages: list[dict], **kwargs) -> tuple[str, dict]:
+        """Blocking chat() for sync callers"""
+        return self.submit(self.chat(messages, **kwargs)).result()
+
+    async def chat_from(self, messages: list[dict], **kwargs) -> tuple[str, dict]:
+        """chat() awaited from a coroutine on another event loop"""
+        return await asyncio.wrap_future(self.submit(self.chat(messages, **kwargs)))
+
+    def close(self) -> None:
+        cache = get_llm_cache()
+        cache.flush_stats()
+        cache.close()
+        if not self._loop.is_running():
+            return
+        if self._http is not None:
+            try:
+                self.submit(self._http.aclose()).result(timeout=5)
+            except Exception:
+                pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+def _cacheable(content: str, validate) -> bool:
+    """Whether `content` passes the caller's validate() (if any)"""
+    if validate is None:
+        return True
+    try:
+        return bool(validate(content))
+    except Exception:
+        return False
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    """Process-wide shared LLMClient (created on first use)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = LLMClient()
+            atexit.register(_client.close)
+        return _client
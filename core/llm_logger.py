@@ -13,6 +13,7 @@ Read the data back with:
 
 Phase naming convention (keep stable):
     labels              -- Phase 2.1
+    event_summary       -- Phase 4.5a legacy full-scan (generate_event_summaries)
     event_prose_full    -- Phase 5.1a (>=5 src)
     event_prose_title   -- Phase 5.1b (<5 src, foreign-only)
     de_batch_translate  -- Phase 5.1c
@@ -20,12 +21,27 @@ Phase naming convention (keep stable):
     narrative_discovery -- Phase 5.3
     narrative_review    -- Phase 5.4
     centroid_summary    -- Phase 5.5
+    centroid_merge      -- rebuild_centroid LLM cluster merge
+    topic_consolidation -- consolidate_topics
+    epic_filter         -- build_epics batch filter
+    outlet_stance       -- score_outlet_stance
+
+Result caches report per run via log_cache_stats(): one row with
+status='cache' and cache_hits / cache_misses (no tokens, no latency).
+The shared cache (core/llm_cache.py) writes one such row per phase from
+flush_stats().
 """
 
 import psycopg2
+from psycopg2 import errors as pg_errors
 
 from core.config import config
 
+# Flips to False once llm_stats turns out to lack tokens_cached
+# (20261016_llm_stats_cached_tokens.sql not applied)
+_has_cached_column = True
+_cache_columns_warned = False
+
 
 def log_llm_call(
     phase: str,
@@ -37,33 +53,53 @@ def log_llm_call(
     """Record one LLM call. Best-effort; swallows all exceptions.
 
     `usage` is the DeepSeek response.usage dict:
-        {"prompt_tokens": int, "completion_tokens": int, ...}
+        {"prompt_tokens": int, "completion_tokens": int,
+         "prompt_cache_hit_tokens": int, ...}
     """
     tokens_in = None
     tokens_out = None
+    tokens_cached = None
     if isinstance(usage, dict):
         tokens_in = usage.get("prompt_tokens") or usage.get("input_tokens")
         tokens_out = usage.get("completion_tokens") or usage.get("output_tokens")
+        tokens_cached = usage.get("prompt_cache_hit_tokens")
+        if tokens_cached is None:
+            details = usage.get("prompt_tokens_details") or {}
+            tokens_cached = details.get("cached_tokens")
 
+    global _has_cached_column
     try:
         conn = psycopg2.connect(
             **config.db_connect_kwargs(),
             connect_timeout=3,
         )
         try:
+            row = (phase, tokens_in, tokens_out, latency_ms, model or config.llm_model)
+            if _has_cached_column:
+                try:
+                    with conn.cursor() as cur:
+                        cur.execute(
+                            """INSERT INTO llm_stats
+                                 (phase, tokens_in, tokens_out, latency_ms, model,
+                                  status, tokens_cached)
+                               VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+                            row + (status, tokens_cached),
+                        )
+                    conn.commit()
+                    return
+                except pg_errors.UndefinedColumn:
+                    conn.rollback()
+                    _has_cached_column = False
+                    print(
+                        "llm_stats.tokens_cached missing; logging without it "
+                        "(apply 20261016_llm_stats_cached_tokens.sql)"
+                    )
             with conn.cursor() as cur:
                 cur.execute(
                     """INSERT INTO llm_stats
                          (phase, tokens_in, tokens_out, latency_ms, model, status)
                        VALUES (%s, %s, %s, %s, %s, %s)""",
-                    (
-                        phase,
-                        tokens_in,
-                        tokens_out,
-                        latency_ms,
-                        model or config.llm_model,
-                        status,
-                    ),
+                    row + (status,),
                 )
             conn.commit()
         finally:
@@ -71,3 +107,33 @@ def log_llm_call(
     except Exception:
         # Telemetry must never break the pipeline.
         pass
+
+
+def log_cache_stats(phase: str, hits: int, misses: int) -> None:
+    """Record one cache lookup round for `phase`. Best-effort like log_llm_call."""
+    try:
+        conn = psycopg2.connect(
+            **config.db_connect_kwargs(),
+            connect_timeout=3,
+        )
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """INSERT INTO llm_stats
+                         (phase, status, cache_hits, cache_misses)
+                       VALUES (%s, 'cache', %s, %s)""",
+                    (phase, hits, misses),
+                )
+            conn.commit()
+        finally:
+            conn.close()
+    except pg_errors.UndefinedColumn:
+        global _cache_columns_warned
+        if not _cache_columns_warned:
+            _cache_columns_warned = True
+            print(
+                "llm_stats.cache_hits missing; cache stats not recorded "
+                "(apply 20261016_label_result_cache.sql)"
+            )
+    except Exception:
+        pass
@@ -8,8 +8,8 @@ import time
 # --- Rate limit handling ---
 
 
-def check_rate_limit(response, attempt=0):
-    """Sleep and return True if response is a 429 rate limit. Sync version.
+def rate_limit_wait(response, attempt=0):
+    """Seconds to back off for a 429 / transient 5xx response, else None.
 
     Uses Retry-After header if present, otherwise exponential backoff
     starting at 5s (5, 15, 45s for attempts 0, 1, 2).
@@ -18,38 +18,44 @@ def check_rate_limit(response, attempt=0):
     if response.status_code == 429 or response.status_code in (502, 503, 504):
         retry_after = response.headers.get("Retry-After")
         if retry_after:
-            wait = int(retry_after)
-        else:
-            wait = 5 * (3**attempt)  # 5, 15, 45
-        print(
-            "HTTP %d, backing off %ds (attempt %d)..."
-            % (response.status_code, wait, attempt + 1)
-        )
-        time.sleep(wait)
-        return True
-    return False
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass  # HTTP-date form; fall through to exponential backoff
+        return 5 * (3**attempt)  # 5, 15, 45
+    return None
+
+
+def check_rate_limit(response, attempt=0):
+    """Sleep and return True if response is a 429 rate limit. Sync version.
+
+    See rate_limit_wait() for the backoff schedule.
+    """
+    wait = rate_limit_wait(response, attempt)
+    if wait is None:
+        return False
+    print(
+        "HTTP %d, backing off %ds (attempt %d)..."
+        % (response.status_code, wait, attempt + 1)
+    )
+    time.sleep(wait)
+    return True
 
 
 async def async_check_rate_limit(response, attempt=0):
     """Sleep and return True if response is a 429 rate limit. Async version.
 
-    Uses Retry-After header if present, otherwise exponential backoff
-    starting at 5s (5, 15, 45s for attempts 0, 1, 2).
-    Also backs off on 502/503/504 (transient server errors).
+    See rate_limit_wait() for the backoff schedule.
     """
-    if response.status_code == 429 or response.status_code in (502, 503, 504):
-        retry_after = response.headers.get("Retry-After")
-        if retry_after:
-            wait = int(retry_after)
-        else:
-            wait = 5 * (3**attempt)  # 5, 15, 45
-        print(
-            "HTTP %d, backing off %ds (attempt %d)..."
-            % (response.status_code, wait, attempt + 1)
-        )
-        await asyncio.sleep(wait)
-        return True
-    return False
+    wait = rate_limit_wait(response, attempt)
+    if wait is None:
+        return False
+    print(
+        "HTTP %d, backing off %ds (attempt %d)..."
+        % (response.status_code, wait, attempt + 1)
+    )
+    await asyncio.sleep(wait)
+    return True
 
 
 def extract_json(text):
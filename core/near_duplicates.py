@@ -0,0 +1,241 @@
+"""
+Near-duplicate candidate pairs over token sets (MinHash + LSH banding)
+
+Sibling reconciliation, saga chaining and topic consolidation all look for
+pairs of events whose title words / tags overlap enough. Comparing every
+pair is quadratic; a month can hold 100k+ events.
+
+MinHash signatures estimate Jaccard similarity, and LSH banding puts sets
+whose signatures agree on a whole band into the same bucket, so only
+bucket mates become candidates. Candidates are a superset guess, never a
+verdict: callers re-score them with their exact scorer (similar_pairs does
+that for single-function scores).
+
+Band/row counts are picked so a pair AT the Jaccard threshold becomes a
+candidate with probability >= `recall` (default 0.98); more similar pairs
+are found even more reliably. Inputs smaller than EXACT_BELOW sets skip
+hashing and return every pair, so small partitions behave exactly like
+the nested loops they replace.
+
+Low thresholds leave one row per band, and on skewed vocabularies (a few
+words in most titles) a band bucket can hold a large share of the input.
+Buckets above MAX_BUCKET members are split on further signature rows
+until they fit, so pairs that only meet through a very common token must
+agree on more hash values before they become candidates.
+
+Scores in this repo are Dice (2|A&B| / (|A|+|B|)); convert thresholds with
+dice_to_jaccard().
+
+Weighted Dice (tags scored with IDF weights) is not a Jaccard estimate, so
+weighted_dice_pairs() uses an exact prefix-filtered inverted index instead.
+"""
+
+import hashlib
+import random
+from collections import defaultdict
+from itertools import combinations
+from typing import Callable, Iterable
+
+# Below this many sets, all pairs are cheaper (and exact)
+EXACT_BELOW = 500
+
+# Band buckets larger than this are split on further signature rows
+MAX_BUCKET = 200
+
+_PRIME = (1 << 61) - 1
+
+
+def dice_to_jaccard(dice: float) -> float:
+    """Jaccard value equivalent to a Dice value (same pair, same overlap)"""
+    return dice / (2.0 - dice)
+
+
+def lsh_params(threshold: float, num_perm: int, recall: float) -> tuple:
+    """(bands, rows): the most rows per band that still catch a pair at
+    `threshold` with probability >= recall (more rows = fewer false
+    candidates)."""
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if 1.0 - (1.0 - threshold**rows) ** bands < recall:
+            break
+        best = (bands, rows)
+    return best
+
+
+class MinHashLSH:
+    """MinHash signatures + banded buckets for one similarity threshold.
+
+    Args:
+        threshold: Jaccard similarity that should become a candidate
+        num_perm: hash functions per signature
+        recall: probability a pair at `threshold` is emitted (before
+            oversized buckets are split)
+        seed: hash family seed (fixed, so runs are reproducible)
+        max_bucket: bucket size above which a bucket is split further
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        num_perm: int = 64,
+        recall: float = 0.98,
+        seed: int = 1,
+        max_bucket: int = MAX_BUCKET,
+    ):
+        rng = random.Random(seed)
+        self.perms = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME))
+            for _ in range(num_perm)
+        ]
+        self.bands, self.rows = lsh_params(threshold, num_perm, recall)
+        self.max_bucket = max_bucket
+        self._token_hashes = {}
+
+    def _hashes(self, token: str) -> list:
+        """Per-permutation hash values of one token (cached: vocabularies
+        repeat heavily across events)"""
+        values = self._token_hashes.get(token)
+        if values is None:
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            base = int.from_bytes(digest, "big")
+            values = [(a * base + b) % _PRIME for a, b in self.perms]
+            self._token_hashes[token] = values
+        return values
+
+    def signature(self, tokens: Iterable[str]) -> tuple:
+        """MinHash signature of a non-empty token set"""
+        vectors = [self._hashes(t) for t in tokens]
+        if len(vectors) == 1:
+            return tuple(vectors[0])
+        return tuple(map(min, *vectors))
+
+    def candidate_pairs(self, token_sets: list) -> set:
+        """{(i, j), i < j} of sets sharing at least one band bucket"""
+        buckets = defaultdict(list)
+        span = self.rows
+        sigs = {}
+        for i, tokens in enumerate(token_sets):
+            if not tokens:
+                continue
+            sig = sigs[i] = self.signature(tokens)
+            for band in range(self.bands):
+                buckets[(band, sig[band * span : (band + 1) * span])].append(i)
+
+        pairs = set()
+        for (band, _), members in buckets.items():
+            if len(members) > 1:
+                self._emit(members, sigs, (band + 1) * span, pairs)
+        return pairs
+
+    def _emit(self, members: list, sigs: dict, row: int, pairs: set) -> None:
+        """Pairs of one bucket; oversized buckets are split on signature
+        rows from `row` on (wrapping), never reusing the bucket's own band"""
+        stop = row + len(self.perms) - self.rows
+        while len(members) > self.max_bucket and row < stop:
+            split = defaultdict(list)
+            for i in members:
+                split[sigs[i][row % len(self.perms)]].append(i)
+            row += 1
+            if len(split) == 1:
+                continue
+            for group in split.values():
+                if len(group) > 1:
+                    self._emit(group, sigs, row, pairs)
+            return
+        pairs.update(combinations(members, 2))
+
+
+def candidate_pairs(
+    token_sets: list,
+    threshold: float,
+    exact_below: int = EXACT_BELOW,
+    **lsh_kwargs,
+) -> list:
+    """Candidate (i, j) index pairs, i < j, sorted; empty sets never pair.
+
+    Args:
+        token_sets: one set of tokens per item
+        threshold: Jaccard similarity the caller cares about
+        exact_below: below this many sets, return every pair instead
+        **lsh_kwargs: MinHashLSH options (num_perm, recall, seed)
+    """
+    present = [i for i, tokens in enumerate(token_sets) if tokens]
+    if len(present) < exact_below:
+        return list(combinations(present, 2))
+    lsh = MinHashLSH(threshold, **lsh_kwargs)
+    return sorted(lsh.candidate_pairs(token_sets))
+
+
+def similar_pairs(
+    token_sets: list,
+    min_score: float,
+    score: Callable,
+    lsh_threshold: float = None,
+    **kwargs,
+) -> list:
+    """Candidate pairs verified by an exact scorer.
+
+    Args:
+        token_sets: one set of tokens per item
+        min_score: keep pairs with score(i, j) >= min_score
+        score: exact scorer on indexes
+        lsh_threshold: Jaccard threshold for candidates (default: min_score
+            read as a Dice value)
+        **kwargs: candidate_pairs options
+
+    Returns:
+        [(i, j, score)] sorted by (i, j)
+    """
+    if lsh_threshold is None:
+        lsh_threshold = dice_to_jaccard(min_score)
+    out = []
+    for i, j in candidate_pairs(token_sets, lsh_threshold, **kwargs):
+        s = score(i, j)
+        if s >= min_score:
+            out.append((i, j, s))
+    return out
+
+
+def weighted_dice_pairs(
+    token_sets: list, min_dice: float, weight: Callable = None
+) -> list:
+    """Every (i, j), i < j, that can reach weighted Dice >= min_dice.
+
+    Weighted Dice is 2*w(A&B) / (w(A)+w(B)). A pair reaching min_dice
+    shares weight >= min_dice*w(A) / (2-min_dice) of each set. Each set is
+    indexed only on its prefix in a global order (heaviest token first):
+    tokens while the rest of the set still holds that much weight. The
+    pair's first shared token is then in both prefixes, so no qualifying
+    pair is missed, and light (common) tokens mostly stay out of the
+    index.
+
+    Args:
+        token_sets: one set of tokens per item
+        min_dice: weighted Dice the caller's scorer needs
+        weight: token -> weight (default 1.0, plain Dice)
+
+    Returns:
+        Sorted candidate pairs (a superset of the qualifying ones)
+    """
+    if weight is None:
+
+        def weight(token):
+            return 1.0
+
+    postings = defaultdict(list)
+    for i, tokens in enumerate(token_sets):
+        ordered = sorted(tokens, key=lambda t: (-weight(t), t))
+        rest = sum(weight(t) for t in ordered)
+        need = min_dice * rest / (2.0 - min_dice)
+        for token in ordered:
+            if rest + 1e-9 < need:
+                break
+            postings[token].append(i)
+            rest -= weight(token)
+
+    pairs = set()
+    for members in postings.values():
+        if len(members) > 1:
+            pairs.update(combinations(members, 2))
+    return sorted(pairs)
@@ -339,6 +339,34 @@ RULES:
     + PROSE_RULES
 )
 
+# -- Delta: grown event, previous summary + only the headlines added since --
+EVENT_SUMMARY_PROMPT_DELTA = (
+    _EVENT_SUMMARY_AUDIENCE
+    + """
+
+TASK: Update an existing title and summary with headlines added since it was written.
+OUTPUT: Return JSON: {"title_en": "...", "title_de": "...", "summary_en": "...", "summary_de": "...", "coherent": true}
+If the new headlines add no material facts, return {"unchanged": true} and nothing else.
+Set "coherent": false if the new headlines are about a different story than the existing summary.
+
+RULES:
+"""
+    + _EVENT_SUMMARY_SHARED
+    + "\n"
+    + """- Keep what is still accurate; fold in new facts, reactions, or outcomes.
+- If the story moved on, lead with the latest development and keep earlier facts as context.
+- Keep the paragraph structure and roughly the length of the existing summary.
+- Change the title only if it no longer describes the story.
+- """
+    + _EVENT_SUMMARY_IDENTIFY
+    + """
+- No phrases like "amid growing concerns" or "sparking debate".
+- title_de + summary_de: natural German, same facts, same tone, same length.
+
+"""
+    + PROSE_RULES
+)
+
 EVENT_SUMMARY_USER_PROMPT_TITLE = """Headlines ({num_titles} sources):
 
 {titles_text}
@@ -356,6 +384,18 @@ Focus ONLY on headlines about the backbone signals above. Ignore tangential ment
 
 Generate JSON:"""
 
+EVENT_SUMMARY_DELTA_USER_PROMPT = """Existing title: {title}
+
+Existing summary ({old_count} sources):
+{summary}
+
+New headlines since then ({new_count} new, {num_titles} sources now):
+{titles_text}
+
+Backbone signals: {backbone_signals}
+
+Generate JSON:"""
+
 # --- EPICS: SHARED ENRICHMENT RULES ---
 
 EPIC_ENRICH_RULES = (
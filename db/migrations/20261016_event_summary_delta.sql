@@ -0,0 +1,19 @@
+-- Delta summaries for grown events (2026-10-16)
+-- generate_event_summaries_4_5a.py rewrote a grown event's summary from
+-- scratch. It now sends the previous summary plus only the headlines added
+-- since summary_source_count (event_v3_titles.created_at order). Repeated
+-- deltas can drift, so a full rewrite is forced once the event has grown
+-- past 3x the size of its last full rewrite:
+--   summary_full_count   source_batch_count at the last full rewrite
+--                        (NULL on older rows -> summary_source_count)
+-- Additive + idempotent.
+
+BEGIN;
+
+ALTER TABLE events_v3 ADD COLUMN IF NOT EXISTS summary_full_count INTEGER;
+
+-- New headlines of an event, newest link first
+CREATE INDEX IF NOT EXISTS event_v3_titles_event_created_idx
+    ON event_v3_titles(event_id, created_at DESC);
+
+COMMIT;
@@ -0,0 +1,27 @@
+-- Phase 3.1 label result cache + cache counters in llm_stats (2026-10-16)
+-- Syndicated headlines recur across feeds with trivial differences. Parsed
+-- per-title label/signal results are stored under a content address:
+-- sha256(ONTOLOGY_VERSION, prompt fingerprint, normalized title). A new
+-- ontology version or any prompt/model change yields new keys, so stale
+-- rows are simply never hit again (purge by created_at when convenient).
+-- llm_stats gets cache_hits / cache_misses; cache rows use status='cache'.
+-- Additive + idempotent.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS llm_label_cache (
+    cache_key        text        PRIMARY KEY,
+    ontology_version text        NOT NULL,
+    result           jsonb       NOT NULL,   -- parse_llm_response item minus title_id
+    hit_count        integer     NOT NULL DEFAULT 0,
+    created_at       timestamptz NOT NULL DEFAULT NOW(),
+    last_hit_at      timestamptz
+);
+
+CREATE INDEX IF NOT EXISTS llm_label_cache_created_idx
+    ON llm_label_cache(created_at);
+
+ALTER TABLE llm_stats ADD COLUMN IF NOT EXISTS cache_hits integer;
+ALTER TABLE llm_stats ADD COLUMN IF NOT EXISTS cache_misses integer;
+
+COMMIT;
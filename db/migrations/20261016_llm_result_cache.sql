@@ -0,0 +1,30 @@
+-- Pipeline-wide LLM result cache (2026-10-16)
+-- core/llm_cache.py stores completions under a content address:
+-- sha256(model, temperature, sha256(system prompt), sha256(user messages)).
+-- Any prompt, model or temperature change yields a new key. Rows older
+-- than LLM_CACHE_TTL_HOURS are ignored by lookups and removed by prune(),
+-- which also trims the least recently used beyond LLM_CACHE_MAX_ROWS.
+-- Hit / miss counts go to llm_stats status='cache' rows (cache_hits /
+-- cache_misses from 20261016_label_result_cache.sql).
+-- Additive + idempotent.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS llm_result_cache (
+    cache_key   text        PRIMARY KEY,
+    phase       text        NOT NULL,   -- llm_stats phase that stored it
+    model       text        NOT NULL,
+    content     text        NOT NULL,   -- raw message content
+    hit_count   integer     NOT NULL DEFAULT 0,
+    created_at  timestamptz NOT NULL DEFAULT NOW(),
+    last_hit_at timestamptz
+);
+
+CREATE INDEX IF NOT EXISTS llm_result_cache_created_idx
+    ON llm_result_cache(created_at);
+
+-- LRU trim
+CREATE INDEX IF NOT EXISTS llm_result_cache_used_idx
+    ON llm_result_cache((COALESCE(last_hit_at, created_at)) DESC);
+
+COMMIT;
@@ -0,0 +1,11 @@
+-- Provider prompt-cache hits in llm_stats (2026-10-16)
+-- DeepSeek bills prompt tokens served from its prefix cache at a discount
+-- and reports them as usage.prompt_cache_hit_tokens (OpenAI-style APIs:
+-- usage.prompt_tokens_details.cached_tokens). tokens_cached is the part of
+-- tokens_in that hit the cache. Additive + idempotent.
+
+BEGIN;
+
+ALTER TABLE llm_stats ADD COLUMN IF NOT EXISTS tokens_cached integer;
+
+COMMIT;
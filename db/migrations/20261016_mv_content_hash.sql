@@ -0,0 +1,39 @@
+-- Content-hash guarded upserts for the JSONB mv_* tables (2026-10-16)
+-- Materializers rebuild every blob each run; most come out identical.
+-- content_hash = md5 of the canonical (sort_keys) JSON of the row's blobs.
+-- pipeline/phase_4/mv_upsert.upsert_changed only updates a row when the
+-- hash differs, so unchanged rows cost no dead tuple / WAL and updated_at
+-- now marks real content changes (frontend cache invalidation can target
+-- updated_at > last bust instead of clearing everything).
+-- mv_refresh_log records each completed run; the 12h staleness gates read
+-- it instead of MAX(updated_at), which no longer moves on no-op refreshes.
+-- Existing rows start with content_hash NULL and are rewritten once.
+-- Additive + idempotent (ALTER TABLE IF EXISTS: some mv_* tables were
+-- created outside db/migrations).
+
+BEGIN;
+
+ALTER TABLE IF EXISTS mv_centroid_month_view     ADD COLUMN IF NOT EXISTS content_hash text;
+ALTER TABLE IF EXISTS mv_calendar_month_view     ADD COLUMN IF NOT EXISTS content_hash text;
+ALTER TABLE IF EXISTS mv_global_month_view       ADD COLUMN IF NOT EXISTS content_hash text;
+ALTER TABLE IF EXISTS mv_narrative_detail        ADD COLUMN IF NOT EXISTS content_hash text;
+ALTER TABLE IF EXISTS mv_narratives_landing      ADD COLUMN IF NOT EXISTS content_hash text;
+ALTER TABLE IF EXISTS mv_outlet_landing          ADD COLUMN IF NOT EXISTS content_hash text;
+ALTER TABLE IF EXISTS mv_positions_landing       ADD COLUMN IF NOT EXISTS content_hash text;
+ALTER TABLE IF EXISTS mv_position_detail         ADD COLUMN IF NOT EXISTS content_hash text;
+ALTER TABLE IF EXISTS mv_signal_category         ADD COLUMN IF NOT EXISTS content_hash text;
+ALTER TABLE IF EXISTS mv_signal_detail           ADD COLUMN IF NOT EXISTS content_hash text;
+ALTER TABLE IF EXISTS mv_centroid_signals        ADD COLUMN IF NOT EXISTS content_hash text;
+ALTER TABLE IF EXISTS mv_publisher_stats         ADD COLUMN IF NOT EXISTS content_hash text;
+ALTER TABLE IF EXISTS mv_publisher_stats_monthly ADD COLUMN IF NOT EXISTS content_hash text;
+ALTER TABLE IF EXISTS mv_signal_graph            ADD COLUMN IF NOT EXISTS content_hash text;
+ALTER TABLE IF EXISTS mv_centroid_baselines      ADD COLUMN IF NOT EXISTS content_hash text;
+
+CREATE TABLE IF NOT EXISTS mv_refresh_log (
+    view_name    text        PRIMARY KEY,   -- mv_* table name
+    refreshed_at timestamptz NOT NULL,
+    rows_checked integer     NOT NULL,      -- blobs rebuilt this run
+    rows_changed integer     NOT NULL       -- blobs actually written
+);
+
+COMMIT;
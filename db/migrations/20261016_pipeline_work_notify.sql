@@ -0,0 +1,53 @@
+-- Event-driven daemon wakeups via LISTEN/NOTIFY (2026-10-16)
+-- Writers signal downstream work on channel 'sni_pipeline'; the payload is
+-- the daemon slot that should run next:
+--   titles_v3 -> processing_status becomes 'assigned' (Phase 2)  => 'classification'
+--   title_assignments INSERT (Phase 3.3)                         => 'clustering'
+-- Statement-level triggers: one NOTIFY per statement at most, and Postgres
+-- folds identical notifications within a transaction, so bulk writers stay
+-- cheap. Interval scheduling remains the fallback if nobody is listening.
+-- Idempotent.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION sni_notify_titles_assigned()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF EXISTS (
+        SELECT 1
+          FROM new_rows n
+          JOIN old_rows o ON o.id = n.id
+         WHERE n.processing_status = 'assigned'
+           AND o.processing_status IS DISTINCT FROM 'assigned'
+    ) THEN
+        PERFORM pg_notify('sni_pipeline', 'classification');
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS titles_v3_notify_assigned ON titles_v3;
+CREATE TRIGGER titles_v3_notify_assigned
+    AFTER UPDATE ON titles_v3
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION sni_notify_titles_assigned();
+
+CREATE OR REPLACE FUNCTION sni_notify_titles_tracked()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM new_rows) THEN
+        PERFORM pg_notify('sni_pipeline', 'clustering');
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS title_assignments_notify_clustering ON title_assignments;
+CREATE TRIGGER title_assignments_notify_clustering
+    AFTER INSERT ON title_assignments
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION sni_notify_titles_tracked();
+
+COMMIT;
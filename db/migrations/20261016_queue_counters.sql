@@ -0,0 +1,237 @@
+-- Incremental queue-depth counters for the daemon (2026-10-16)
+-- get_queue_stats() ran five COUNT(*) anti-joins over titles_v3 /
+-- title_labels / title_assignments / events_v3 at the top of every cycle.
+-- Statement-level triggers now keep running totals instead:
+--   status:<processing_status>  titles_v3 rows per status
+--   titles_need_labels          assigned, centroid_ids set, no title_labels row
+--   titles_need_track           assigned, centroid_ids set, no title_assignments
+--   ctms_for_clustering         ctm with title_count >= 3 and not frozen
+--   ctms_need_summary           time-dependent (24h cooldown): only set by
+--                               reconciliation
+-- Rows are sharded by backend pid so concurrent writers do not queue on one
+-- counter row; readers SUM(depth) per queue. Triggers see READ COMMITTED
+-- state, so totals can drift slightly; pipeline/runner/queue_counters.py
+-- reconcile() recounts exactly and adds the difference (daemon: hourly).
+-- Idempotent.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS pipeline_queue_counters (
+    queue          text        NOT NULL,
+    shard          smallint    NOT NULL,
+    depth          bigint      NOT NULL DEFAULT 0,
+    updated_at     timestamptz NOT NULL DEFAULT NOW(),
+    reconciled_at  timestamptz,
+    PRIMARY KEY (queue, shard)
+);
+
+CREATE OR REPLACE FUNCTION sni_bump_queue(p_queue text, p_delta bigint)
+RETURNS void AS $$
+BEGIN
+    IF p_delta <> 0 THEN
+        INSERT INTO pipeline_queue_counters (queue, shard, depth)
+        VALUES (p_queue, pg_backend_pid() % 8, p_delta)
+        ON CONFLICT (queue, shard) DO UPDATE
+           SET depth = pipeline_queue_counters.depth + EXCLUDED.depth,
+               updated_at = NOW();
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- titles_v3: status counts + both "need" queues (net +new / -old per statement).
+-- UPDATEs only count rows whose processing_status / centroid_ids changed:
+-- the rest net to zero, and skipping them keeps the label / assignment
+-- anti-joins off the common "touch other columns" updates.
+CREATE OR REPLACE FUNCTION sni_count_titles()
+RETURNS TRIGGER AS $$
+DECLARE
+    src text;
+    r record;
+BEGIN
+    src := CASE TG_OP
+        WHEN 'INSERT' THEN
+            'SELECT id, processing_status, centroid_ids, 1 AS sign FROM new_rows'
+        WHEN 'DELETE' THEN
+            'SELECT id, processing_status, centroid_ids, -1 AS sign FROM old_rows'
+        ELSE
+            'SELECT n.id, n.processing_status, n.centroid_ids, 1 AS sign
+               FROM new_rows n JOIN old_rows o ON o.id = n.id
+              WHERE (n.processing_status, n.centroid_ids)
+                    IS DISTINCT FROM (o.processing_status, o.centroid_ids)
+             UNION ALL
+             SELECT o.id, o.processing_status, o.centroid_ids, -1
+               FROM old_rows o JOIN new_rows n ON n.id = o.id
+              WHERE (n.processing_status, n.centroid_ids)
+                    IS DISTINCT FROM (o.processing_status, o.centroid_ids)'
+    END;
+
+    FOR r IN EXECUTE format($q$
+        WITH t AS (%s)
+        SELECT queue, SUM(sign) AS delta
+          FROM (
+            SELECT 'status:' || COALESCE(t.processing_status, 'null') AS queue, t.sign
+              FROM t
+            UNION ALL
+            SELECT 'titles_need_labels', t.sign
+              FROM t
+             WHERE t.processing_status = 'assigned'
+               AND t.centroid_ids IS NOT NULL
+               AND NOT EXISTS (SELECT 1 FROM title_labels tl WHERE tl.title_id = t.id)
+            UNION ALL
+            SELECT 'titles_need_track', t.sign
+              FROM t
+             WHERE t.processing_status = 'assigned'
+               AND t.centroid_ids IS NOT NULL
+               AND NOT EXISTS (SELECT 1 FROM title_assignments ta WHERE ta.title_id = t.id)
+          ) d
+         GROUP BY queue
+        HAVING SUM(sign) <> 0
+    $q$, src)
+    LOOP
+        PERFORM sni_bump_queue(r.queue, r.delta);
+    END LOOP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS titles_v3_count_insert ON titles_v3;
+CREATE TRIGGER titles_v3_count_insert
+    AFTER INSERT ON titles_v3
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sni_count_titles();
+
+DROP TRIGGER IF EXISTS titles_v3_count_update ON titles_v3;
+CREATE TRIGGER titles_v3_count_update
+    AFTER UPDATE ON titles_v3
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sni_count_titles();
+
+DROP TRIGGER IF EXISTS titles_v3_count_delete ON titles_v3;
+CREATE TRIGGER titles_v3_count_delete
+    AFTER DELETE ON titles_v3
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sni_count_titles();
+
+
+-- title_labels: a first label takes a queued title out of titles_need_labels
+CREATE OR REPLACE FUNCTION sni_count_title_labels()
+RETURNS TRIGGER AS $$
+DECLARE
+    n bigint;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT COUNT(*) INTO n
+          FROM new_rows l
+          JOIN titles_v3 t ON t.id = l.title_id
+         WHERE t.processing_status = 'assigned'
+           AND t.centroid_ids IS NOT NULL;
+        PERFORM sni_bump_queue('titles_need_labels', -n);
+    ELSE
+        SELECT COUNT(*) INTO n
+          FROM old_rows l
+          JOIN titles_v3 t ON t.id = l.title_id
+         WHERE t.processing_status = 'assigned'
+           AND t.centroid_ids IS NOT NULL
+           AND NOT EXISTS (SELECT 1 FROM title_labels tl WHERE tl.title_id = l.title_id);
+        PERFORM sni_bump_queue('titles_need_labels', n);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS title_labels_count_insert ON title_labels;
+CREATE TRIGGER title_labels_count_insert
+    AFTER INSERT ON title_labels
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sni_count_title_labels();
+
+DROP TRIGGER IF EXISTS title_labels_count_delete ON title_labels;
+CREATE TRIGGER title_labels_count_delete
+    AFTER DELETE ON title_labels
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sni_count_title_labels();
+
+
+-- title_assignments: several rows per title; only the first one / last one
+-- moves the title in or out of titles_need_track
+CREATE OR REPLACE FUNCTION sni_count_title_assignments()
+RETURNS TRIGGER AS $$
+DECLARE
+    n bigint;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT COUNT(*) INTO n
+          FROM (SELECT title_id, COUNT(*) AS k FROM new_rows GROUP BY title_id) a
+          JOIN titles_v3 t ON t.id = a.title_id
+         WHERE t.processing_status = 'assigned'
+           AND t.centroid_ids IS NOT NULL
+           AND (SELECT COUNT(*) FROM title_assignments ta
+                 WHERE ta.title_id = a.title_id) = a.k;
+        PERFORM sni_bump_queue('titles_need_track', -n);
+    ELSE
+        SELECT COUNT(*) INTO n
+          FROM (SELECT DISTINCT title_id FROM old_rows) a
+          JOIN titles_v3 t ON t.id = a.title_id
+         WHERE t.processing_status = 'assigned'
+           AND t.centroid_ids IS NOT NULL
+           AND NOT EXISTS (SELECT 1 FROM title_assignments ta
+                            WHERE ta.title_id = a.title_id);
+        PERFORM sni_bump_queue('titles_need_track', n);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS title_assignments_count_insert ON title_assignments;
+CREATE TRIGGER title_assignments_count_insert
+    AFTER INSERT ON title_assignments
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sni_count_title_assignments();
+
+DROP TRIGGER IF EXISTS title_assignments_count_delete ON title_assignments;
+CREATE TRIGGER title_assignments_count_delete
+    AFTER DELETE ON title_assignments
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sni_count_title_assignments();
+
+
+-- ctm: clustering candidates
+CREATE OR REPLACE FUNCTION sni_count_ctms()
+RETURNS TRIGGER AS $$
+DECLARE
+    n bigint := 0;
+    m bigint := 0;
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT COUNT(*) INTO n FROM new_rows
+         WHERE title_count >= 3 AND is_frozen = false;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT COUNT(*) INTO m FROM old_rows
+         WHERE title_count >= 3 AND is_frozen = false;
+    END IF;
+    PERFORM sni_bump_queue('ctms_for_clustering', n - m);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS ctm_count_insert ON ctm;
+CREATE TRIGGER ctm_count_insert
+    AFTER INSERT ON ctm
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sni_count_ctms();
+
+DROP TRIGGER IF EXISTS ctm_count_update ON ctm;
+CREATE TRIGGER ctm_count_update
+    AFTER UPDATE ON ctm
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sni_count_ctms();
+
+DROP TRIGGER IF EXISTS ctm_count_delete ON ctm;
+CREATE TRIGGER ctm_count_delete
+    AFTER DELETE ON ctm
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sni_count_ctms();
+
+COMMIT;
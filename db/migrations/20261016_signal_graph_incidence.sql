@@ -0,0 +1,184 @@
+-- Incremental signal co-occurrence graph (2026-10-16)
+-- materialize_signal_graph re-derived every edge with a self-join over
+-- event_v3_titles x title_labels x unnest for the whole window each run.
+-- Now:
+--   event_signals          event -> signal incidence (one row per distinct
+--                          signal of a live event: not catchall, not merged)
+--   signal_edges_monthly   events per (signal a, signal b, event month),
+--                          a < b by (value, signal_type)
+--   signal_graph_dirty     events whose signal set may have changed
+-- Statement-level triggers only queue event ids (titles linked / unlinked /
+-- moved, labels changed, event date / catchall / merged_into changed,
+-- event deleted). pipeline/phase_4/materialize_signal_graph.py drains the
+-- queue: recomputes the queued events' signal sets, swaps their incidence
+-- rows and applies the pair differences to the edge counters. It is the
+-- only writer of both tables, so counters never contend.
+-- Initial fill: materialize_signal_graph.py --rebuild (also automatic
+-- while event_signals is empty).
+-- Idempotent.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS event_signals (
+    event_id    uuid NOT NULL,
+    signal_type text NOT NULL,
+    value       text NOT NULL,
+    event_date  date NOT NULL,
+    PRIMARY KEY (event_id, signal_type, value)
+);
+
+CREATE INDEX IF NOT EXISTS event_signals_date_idx
+    ON event_signals(event_date);
+
+-- Rolling edges: incidence rows of the top signals inside the window
+CREATE INDEX IF NOT EXISTS event_signals_signal_idx
+    ON event_signals(signal_type, value, event_date);
+
+CREATE TABLE IF NOT EXISTS signal_edges_monthly (
+    type_a      text    NOT NULL,
+    value_a     text    NOT NULL,
+    type_b      text    NOT NULL,
+    value_b     text    NOT NULL,
+    month       date    NOT NULL,
+    event_count integer NOT NULL,
+    PRIMARY KEY (month, type_a, value_a, type_b, value_b)
+);
+
+CREATE TABLE IF NOT EXISTS signal_graph_dirty (
+    event_id  uuid        PRIMARY KEY,
+    queued_at timestamptz NOT NULL DEFAULT NOW()
+);
+
+
+CREATE OR REPLACE FUNCTION sni_queue_signal_events(p_ids uuid[])
+RETURNS void AS $$
+BEGIN
+    -- Sorted so concurrent writers take conflicting keys in the same order
+    INSERT INTO signal_graph_dirty (event_id)
+    SELECT DISTINCT id FROM unnest(p_ids) AS id
+     WHERE id IS NOT NULL
+     ORDER BY id
+    ON CONFLICT (event_id) DO NOTHING;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- event_v3_titles: a title joining or leaving an event changes its signals
+CREATE OR REPLACE FUNCTION sni_signal_dirty_event_titles()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM sni_queue_signal_events(ARRAY(SELECT event_id FROM new_rows));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM sni_queue_signal_events(ARRAY(SELECT event_id FROM old_rows));
+    ELSE
+        PERFORM sni_queue_signal_events(ARRAY(
+            SELECT n.event_id
+              FROM new_rows n JOIN old_rows o ON o.title_id = n.title_id
+             WHERE n.event_id IS DISTINCT FROM o.event_id
+            UNION
+            SELECT o.event_id
+              FROM new_rows n JOIN old_rows o ON o.title_id = n.title_id
+             WHERE n.event_id IS DISTINCT FROM o.event_id));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS event_v3_titles_signal_insert ON event_v3_titles;
+CREATE TRIGGER event_v3_titles_signal_insert
+    AFTER INSERT ON event_v3_titles
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sni_signal_dirty_event_titles();
+
+DROP TRIGGER IF EXISTS event_v3_titles_signal_update ON event_v3_titles;
+CREATE TRIGGER event_v3_titles_signal_update
+    AFTER UPDATE ON event_v3_titles
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sni_signal_dirty_event_titles();
+
+DROP TRIGGER IF EXISTS event_v3_titles_signal_delete ON event_v3_titles;
+CREATE TRIGGER event_v3_titles_signal_delete
+    AFTER DELETE ON event_v3_titles
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sni_signal_dirty_event_titles();
+
+
+-- title_labels: new / changed / removed signal arrays of a linked title
+CREATE OR REPLACE FUNCTION sni_signal_dirty_title_labels()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM sni_queue_signal_events(ARRAY(
+            SELECT evt.event_id
+              FROM new_rows n JOIN event_v3_titles evt ON evt.title_id = n.title_id));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM sni_queue_signal_events(ARRAY(
+            SELECT evt.event_id
+              FROM old_rows o JOIN event_v3_titles evt ON evt.title_id = o.title_id));
+    ELSE
+        PERFORM sni_queue_signal_events(ARRAY(
+            SELECT evt.event_id
+              FROM new_rows n
+              JOIN old_rows o ON o.title_id = n.title_id
+              JOIN event_v3_titles evt ON evt.title_id = n.title_id
+             WHERE (n.persons, n.orgs, n.places, n.commodities, n.policies,
+                    n.systems, n.named_events)
+                   IS DISTINCT FROM
+                   (o.persons, o.orgs, o.places, o.commodities, o.policies,
+                    o.systems, o.named_events)));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS title_labels_signal_insert ON title_labels;
+CREATE TRIGGER title_labels_signal_insert
+    AFTER INSERT ON title_labels
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sni_signal_dirty_title_labels();
+
+DROP TRIGGER IF EXISTS title_labels_signal_update ON title_labels;
+CREATE TRIGGER title_labels_signal_update
+    AFTER UPDATE ON title_labels
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sni_signal_dirty_title_labels();
+
+DROP TRIGGER IF EXISTS title_labels_signal_delete ON title_labels;
+CREATE TRIGGER title_labels_signal_delete
+    AFTER DELETE ON title_labels
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sni_signal_dirty_title_labels();
+
+
+-- events_v3: date (edge month / window), catchall and merged_into decide
+-- whether and where an event counts
+CREATE OR REPLACE FUNCTION sni_signal_dirty_events()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM sni_queue_signal_events(ARRAY(SELECT id FROM old_rows));
+    ELSE
+        PERFORM sni_queue_signal_events(ARRAY(
+            SELECT n.id
+              FROM new_rows n JOIN old_rows o ON o.id = n.id
+             WHERE (n.date, n.is_catchall, n.merged_into)
+                   IS DISTINCT FROM (o.date, o.is_catchall, o.merged_into)));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS events_v3_signal_update ON events_v3;
+CREATE TRIGGER events_v3_signal_update
+    AFTER UPDATE ON events_v3
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sni_signal_dirty_events();
+
+DROP TRIGGER IF EXISTS events_v3_signal_delete ON events_v3;
+CREATE TRIGGER events_v3_signal_delete
+    AFTER DELETE ON events_v3
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sni_signal_dirty_events();
+
+COMMIT;
@@ -0,0 +1,29 @@
+-- Work leases for running several daemon workers side by side (2026-10-16)
+-- One row per (task, key): per-CTM tasks ('cluster', 'promote', 'describe',
+-- 'daily_brief') keyed by ctm id, and whole phases (task 'node') keyed by
+-- the daemon's phase key. Workers claim rows with
+--   SELECT ... FOR UPDATE SKIP LOCKED
+-- and hold them until leased_until; a heartbeat extends open leases, so a
+-- crashed worker's work is reclaimed after WORK_LEASE_SECONDS.
+-- done_at records the last completion (claimers skip keys finished after
+-- they listed their candidates). See pipeline/runner/leases.py.
+-- Idempotent.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS work_leases (
+    task          text        NOT NULL,
+    key           text        NOT NULL,
+    worker_id     text,
+    leased_until  timestamptz NOT NULL DEFAULT '-infinity',
+    heartbeat_at  timestamptz,
+    claimed_at    timestamptz,
+    done_at       timestamptz,
+    PRIMARY KEY (task, key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_work_leases_worker
+    ON work_leases (worker_id)
+    WHERE done_at IS NULL;
+
+COMMIT;
@@ -21,6 +21,7 @@ import httpx
 import psycopg2
 
 from core.config import config
+from core.llm_client import get_llm_client
 from core.prompts import EPIC_ENRICH_RULES
 
 # First-class signal prefixes: specific entities that can anchor an epic.
@@ -176,6 +177,14 @@ def get_component_events(conn, month, anchor_tags):
 BATCH_SIZE = 50
 
 
+def _parse_decisions(content):
+    """[{"n": .., "keep": ..}] from a filter response (markdown fences ok)"""
+    if content.startswith("```"):
+        content = content.split("\n", 1)[1]
+        content = content.rsplit("```", 1)[0]
+    return json.loads(content)
+
+
 def _llm_filter_batch(tag_str, batch, start_num):
     """Filter a single batch of events. Returns set of global event numbers to exclude."""
     lines = []
@@ -202,42 +211,23 @@ def _llm_filter_batch(tag_str, batch, start_num):
         "Return ONLY the JSON array, no other text."
     ) % (tag_str, len(batch), event_list)
 
-    headers = {
-        "Authorization": "Bearer %s" % config.deepseek_api_key,
-        "Content-Type": "application/json",
-    }
-    payload = {
-        "model": config.llm_model,
-        "messages": [{"role": "user", "content": prompt}],
-        "temperature": 0.1,
-        "max_tokens": 2000,
-    }
-
-    resp = httpx.post(
-        "%s/chat/completions" % config.deepseek_api_url,
-        headers=headers,
-        json=payload,
-        timeout=90,
-    )
-
-    if resp.status_code != 200:
-        print(
-            "    batch %d-%d: ERROR %d"
-            % (start_num, start_num + len(batch) - 1, resp.status_code)
+    # Shared client: retries, rate limit, llm_stats and the result cache
+    # (re-running an unchanged batch reuses the decisions)
+    try:
+        content, usage = get_llm_client().chat_sync(
+            [{"role": "user", "content": prompt}],
+            phase="epic_filter",
+            temperature=0.1,
+            max_tokens=2000,
+            timeout=90,
+            validate=_parse_decisions,
         )
+    except Exception as e:
+        print("    batch %d-%d: ERROR %s" % (start_num, start_num + len(batch) - 1, e))
         return set(), 0, 0
 
-    data = resp.json()
-    content = data["choices"][0]["message"]["content"].strip()
-    usage = data.get("usage", {})
-
-    # Strip markdown fences if present
-    if content.startswith("```"):
-        content = content.split("\n", 1)[1]
-        content = content.rsplit("```", 1)[0]
-
     try:
-        decisions = json.loads(content)
+        decisions = _parse_decisions(content)
     except json.JSONDecodeError:
         print(
             "    batch %d-%d: parse error, retrying..."
@@ -0,0 +1,95 @@
+"""
+Shared connection pool for Phase 1 ingestion
+
+One ThreadedConnectionPool per run_ingestion call, shared by FeedsRepo and
+RSSFetcher so each feed reuses warm connections instead of paying a
+TCP+auth handshake per query. Also tracks server-side prepared statements
+per pooled connection (PREPARE once, EXECUTE for every feed after that).
+"""
+
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from core.config import config
+
+
+class IngestPool:
+    """Blocking wrapper around ThreadedConnectionPool.
+
+    ThreadedConnectionPool.getconn() raises PoolError when exhausted instead
+    of waiting; the concurrent fetcher can have more worker threads than
+    connections, so checkout is gated by a semaphore sized to maxconn.
+    """
+
+    def __init__(self, maxconn=None):
+        self.maxconn = maxconn or config.ingest_db_pool_size
+        self.pool = ThreadedConnectionPool(
+            minconn=1,
+            maxconn=self.maxconn,
+            **config.db_connect_kwargs(),
+        )
+        self._slots = threading.BoundedSemaphore(self.maxconn)
+        self._prepared = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        """Check out a pooled connection, blocking until one is free"""
+        self._slots.acquire()
+        conn = self.pool.getconn()
+        try:
+            yield conn
+        finally:
+            if conn.closed:
+                with self._lock:
+                    self._prepared.pop(id(conn), None)
+            self.pool.putconn(conn)
+            self._slots.release()
+
+    def prepare(self, conn, name: str, sql: str) -> None:
+        """PREPARE `sql` as `name` on this connection if not already done.
+
+        Prepared statements are session-scoped and survive transaction
+        rollbacks, so this only runs once per pooled connection.
+        """
+        with self._lock:
+            names = self._prepared.setdefault(id(conn), set())
+            if name in names:
+                return
+        with conn.cursor() as cur:
+            cur.execute("PREPARE %s AS %s" % (name, sql))
+        with self._lock:
+            names.add(name)
+
+    def closeall(self) -> None:
+        self.pool.closeall()
+        self._prepared = {}
+
+
+def prepare(conn, name: str, sql: str, pool=None) -> None:
+    """PREPARE via the pool's per-connection cache, or directly when unpooled"""
+    if pool is not None:
+        pool.prepare(conn, name, sql)
+        return
+    with conn.cursor() as cur:
+        cur.execute("PREPARE %s AS %s" % (name, sql))
+
+
+@contextmanager
+def connection(pool=None):
+    """Pooled connection when a pool is given, else a one-off connection"""
+    if pool is not None:
+        with pool.connection() as conn:
+            yield conn
+        return
+    conn = psycopg2.connect(**config.db_connect_kwargs())
+    try:
+        yield conn
+    finally:
+        conn.close()
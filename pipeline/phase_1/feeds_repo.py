@@ -2,34 +2,71 @@
 Feeds Repository for v3 Pipeline
 
 Manages feed metadata (ETag, Last-Modified, watermarks) using psycopg2.
+
+Batch mode (used by run_ingestion): prefetch() loads metadata for every
+active feed in one query, begin_batch() makes upsert() buffer in memory,
+and flush() writes all buffered updates in a single UPDATE ... FROM VALUES.
 """
 
 import sys
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Optional
 
-import psycopg2
+from psycopg2.extras import execute_values
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.config import config
 
+from .db_pool import connection
+
 
 class FeedsRepo:
     """Repository for managing RSS feed metadata"""
 
-    def __init__(self):
+    def __init__(self, pool=None):
         self.config = config
+        self.pool = pool
+        self._cache = {}
+        self._pending = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _row_to_meta(row) -> Dict:
+        return {
+            "feed_url": row[0],
+            "etag": row[1],
+            "last_modified": row[2],
+            "last_pubdate_utc": row[3],
+            "last_run_at": row[4],
+        }
+
+    def prefetch(self) -> int:
+        """
+        Load metadata for all active feeds in one query.
 
-    def get_connection(self):
-        """Get database connection"""
-        return psycopg2.connect(
-            host=self.config.db_host,
-            port=self.config.db_port,
-            database=self.config.db_name,
-            user=self.config.db_user,
-            password=self.config.db_password,
-        )
+        Subsequent get() calls for those URLs are served from memory.
+
+        Returns:
+            Number of feeds cached
+        """
+        with connection(self.pool) as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT url, etag, last_modified, last_pubdate_utc, last_run_at
+                    FROM feeds
+                    WHERE is_active = true
+                """
+                )
+                rows = cur.fetchall()
+            conn.commit()
+
+        with self._lock:
+            for row in rows:
+                self._cache[row[0]] = self._row_to_meta(row)
+        return len(rows)
 
     def get(self, feed_url: str) -> Dict:
         """
@@ -38,8 +75,11 @@ class FeedsRepo:
         Returns:
             Dict with feed_url, etag, last_modified, last_pubdate_utc, last_run_at
         """
-        conn = self.get_connection()
-        try:
+        cached = self._cache.get(feed_url)
+        if cached is not None:
+            return dict(cached)
+
+        with connection(self.pool) as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
@@ -50,25 +90,23 @@ class FeedsRepo:
                     (feed_url,),
                 )
                 row = cur.fetchone()
+            conn.commit()
+
+        if row:
+            return self._row_to_meta(row)
+        return {
+            "feed_url": feed_url,
+            "etag": None,
+            "last_modified": None,
+            "last_pubdate_utc": None,
+            "last_run_at": None,
+        }
 
-                if row:
-                    return {
-                        "feed_url": row[0],
-                        "etag": row[1],
-                        "last_modified": row[2],
-                        "last_pubdate_utc": row[3],
-                        "last_run_at": row[4],
-                    }
-                else:
-                    return {
-                        "feed_url": feed_url,
-                        "etag": None,
-                        "last_modified": None,
-                        "last_pubdate_utc": None,
-                        "last_run_at": None,
-                    }
-        finally:
-            conn.close()
+    def begin_batch(self) -> None:
+        """Buffer upsert() calls until flush()"""
+        with self._lock:
+            if self._pending is None:
+                self._pending = {}
 
     def upsert(
         self,
@@ -88,21 +126,74 @@ class FeedsRepo:
             last_pubdate_utc: Latest article publication date seen
         """
         now = datetime.now(timezone.utc)
-        conn = self.get_connection()
-        try:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    UPDATE feeds
-                    SET etag = COALESCE(%s, etag),
-                        last_modified = COALESCE(%s, last_modified),
-                        last_pubdate_utc = GREATEST(COALESCE(%s, last_pubdate_utc), last_pubdate_utc),
-                        last_run_at = %s,
-                        updated_at = %s
-                    WHERE url = %s
-                """,
-                    (etag, last_modified, last_pubdate_utc, now, now, feed_url),
+        with self._lock:
+            if self._pending is not None:
+                self._pending[feed_url] = (
+                    feed_url,
+                    etag,
+                    last_modified,
+                    last_pubdate_utc,
+                    now,
                 )
-            conn.commit()
-        finally:
-            conn.close()
+                return
+
+        with connection(self.pool) as conn:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        UPDATE feeds
+                        SET etag = COALESCE(%s, etag),
+                            last_modified = COALESCE(%s, last_modified),
+                            last_pubdate_utc = GREATEST(COALESCE(%s, last_pubdate_utc), last_pubdate_utc),
+                            last_run_at = %s,
+                            updated_at = %s
+                        WHERE url = %s
+                    """,
+                        (etag, last_modified, last_pubdate_utc, now, now, feed_url),
+                    )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def flush(self) -> int:
+        """
+        Write all buffered upserts in one statement and leave batch mode.
+
+        Same COALESCE/GREATEST semantics as the single-row upsert().
+
+        Returns:
+            Number of feeds updated
+        """
+        with self._lock:
+            pending = list((self._pending or {}).values())
+            self._pending = None
+        if not pending:
+            return 0
+
+        with connection(self.pool) as conn:
+            try:
+                with conn.cursor() as cur:
+                    execute_values(
+                        cur,
+                        """
+                        UPDATE feeds f
+                        SET etag = COALESCE(v.etag, f.etag),
+                            last_modified = COALESCE(v.last_modified, f.last_modified),
+                            last_pubdate_utc = GREATEST(COALESCE(v.last_pubdate_utc, f.last_pubdate_utc), f.last_pubdate_utc),
+                            last_run_at = v.run_at,
+                            updated_at = v.run_at
+                        FROM (VALUES %s) AS v(url, etag, last_modified, last_pubdate_utc, run_at)
+                        WHERE f.url = v.url
+                    """,
+                        pending,
+                        template="(%s, %s::text, %s::text, %s::timestamptz, %s::timestamptz)",
+                        page_size=len(pending),
+                    )
+                    updated = cur.rowcount
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return updated
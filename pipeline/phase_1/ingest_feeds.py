@@ -5,24 +5,21 @@ Fetches RSS feeds from Google News and inserts into titles_v3 table.
 """
 
 import argparse
+import asyncio
 import sys
 from datetime import datetime
 from pathlib import Path
 
-import psycopg2
-
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.config import config
+from pipeline.phase_1.async_fetcher import AsyncFeedFetcher
+from pipeline.phase_1.db_pool import IngestPool, connection
 from pipeline.phase_1.rss_fetcher import RSSFetcher
 
 
-def get_active_feeds(country_code=None):
+def get_active_feeds(country_code=None, pool=None):
     """Get all active feeds for ingestion, optionally filtered by country."""
-    conn = psycopg2.connect(
-        **config.db_connect_kwargs(),
-    )
-
-    try:
+    with connection(pool) as conn:
         with conn.cursor() as cur:
             if country_code:
                 cur.execute(
@@ -44,29 +41,98 @@ def get_active_feeds(country_code=None):
                     """
                 )
             feeds = cur.fetchall()
+        conn.commit()
+
+    return [
+        {
+            "id": row[0],
+            "url": row[1],
+            "name": row[2],
+            "source_domain": row[3],
+            "language_code": row[4],
+            # Spot-checked per fetch in RSSFetcher.normalize_batch
+            "language_hint": row[4] if config.ingest_language_hint else None,
+        }
+        for row in feeds
+    ]
+
+
+def _ingest_feeds(pool, stats, max_feeds, country_code, concurrent):
+    """Fetch + insert every active feed on a shared pool, updating stats in place"""
+    # Get active feeds
+    feeds = get_active_feeds(country_code=country_code, pool=pool)
+    print("Found {} active feeds".format(len(feeds)))
 
-            return [
-                {
-                    "id": row[0],
-                    "url": row[1],
-                    "name": row[2],
-                    "source_domain": row[3],
-                    "language_code": row[4],
-                }
-                for row in feeds
-            ]
+    if max_feeds:
+        feeds = feeds[:max_feeds]
+        print(
+            "Processing first {} feeds (--max-feeds={})\n".format(len(feeds), max_feeds)
+        )
+
+    # Initialize fetcher; prefetch all feed metadata and buffer the
+    # etag/watermark upserts so they are written in one statement at the end
+    fetcher = RSSFetcher(pool=pool)
+    fetcher.feeds_repo.prefetch()
+    fetcher.feeds_repo.begin_batch()
+
+    def record(feed_stats, duration):
+        stats["feeds_processed"] += 1
+        stats["feeds_success"] += 1
+        stats["total_fetched"] += feed_stats["fetched"]
+        stats["total_inserted"] += feed_stats["inserted"]
+        stats["total_skipped"] += feed_stats["skipped"]
+        stats["total_errors"] += feed_stats["errors"]
+
+        # Per-feed summary
+        print(
+            f"  Result: {feed_stats['inserted']} inserted, {feed_stats['skipped']} skipped, {feed_stats['errors']} errors ({duration:.1f}s)"
+        )
+
+    try:
+        if concurrent:
+            # Results arrive in completion order; fetch_feed already logs per feed
+            def on_result(feed, feed_stats):
+                print(f"\n[{stats['feeds_processed'] + 1}/{len(feeds)}] {feed['name']}")
+                record(feed_stats, feed_stats["duration_sec"])
+
+            asyncio.run(AsyncFeedFetcher(fetcher).fetch_all(feeds, on_result=on_result))
+        else:
+            # Process each feed
+            for feed in feeds:
+                feed_start = datetime.now()
+                print(f"\n[{stats['feeds_processed'] + 1}/{len(feeds)}] {feed['name']}")
+                print(f"  URL: {feed['url']}")
+
+                try:
+                    # Fetch and insert
+                    articles, feed_stats = fetcher.fetch_feed(
+                        feed["id"], feed["url"], feed["name"], feed["language_hint"]
+                    )
+                    record(feed_stats, (datetime.now() - feed_start).total_seconds())
+
+                except Exception as e:
+                    stats["feeds_processed"] += 1
+                    stats["feeds_errors"] += 1
+                    print(f"  ERROR: {e}")
     finally:
-        conn.close()
+        fetcher.close()
+        updated = fetcher.feeds_repo.flush()
+        print(f"\nFeed metadata updated: {updated} feeds")
 
 
-def run_ingestion(max_feeds=None, country_code=None):
+def run_ingestion(max_feeds=None, country_code=None, concurrent=None):
     """
     Run RSS ingestion for all active feeds.
 
     Args:
         max_feeds: Maximum number of feeds to process (optional)
         country_code: Filter feeds by country code (optional, e.g., 'RU', 'US')
+        concurrent: Fetch feeds concurrently via asyncio/httpx
+            (default: config.ingest_concurrent)
     """
+    if concurrent is None:
+        concurrent = config.ingest_concurrent
+
     start_time = datetime.now()
 
     # Overall statistics
@@ -86,51 +152,20 @@ def run_ingestion(max_feeds=None, country_code=None):
     print("Start time: {}".format(start_time.strftime("%Y-%m-%d %H:%M:%S")))
     if country_code:
         print("Country filter: {}".format(country_code.upper()))
-    print()
-
-    # Get active feeds
-    feeds = get_active_feeds(country_code=country_code)
-    print("Found {} active feeds".format(len(feeds)))
-
-    if max_feeds:
-        feeds = feeds[:max_feeds]
+    if concurrent:
         print(
-            "Processing first {} feeds (--max-feeds={})\n".format(len(feeds), max_feeds)
-        )
-
-    # Initialize fetcher
-    fetcher = RSSFetcher()
-
-    # Process each feed
-    for feed in feeds:
-        feed_start = datetime.now()
-        print(f"\n[{stats['feeds_processed'] + 1}/{len(feeds)}] {feed['name']}")
-        print(f"  URL: {feed['url']}")
-
-        try:
-            # Fetch and insert
-            articles, feed_stats = fetcher.fetch_feed(
-                feed["id"], feed["url"], feed["name"]
-            )
-
-            # Update overall stats
-            stats["feeds_processed"] += 1
-            stats["feeds_success"] += 1
-            stats["total_fetched"] += feed_stats["fetched"]
-            stats["total_inserted"] += feed_stats["inserted"]
-            stats["total_skipped"] += feed_stats["skipped"]
-            stats["total_errors"] += feed_stats["errors"]
-
-            # Per-feed summary
-            duration = (datetime.now() - feed_start).total_seconds()
-            print(
-                f"  Result: {feed_stats['inserted']} inserted, {feed_stats['skipped']} skipped, {feed_stats['errors']} errors ({duration:.1f}s)"
+            "Mode: concurrent ({} global, {} per host)".format(
+                config.http_max_concurrency, config.http_max_per_host
             )
+        )
+    print()
 
-        except Exception as e:
-            stats["feeds_processed"] += 1
-            stats["feeds_errors"] += 1
-            print(f"  ERROR: {e}")
+    # One connection pool for the whole run (feeds, metadata, inserts)
+    pool = IngestPool()
+    try:
+        _ingest_feeds(pool, stats, max_feeds, country_code, concurrent)
+    finally:
+        pool.closeall()
 
     # Final summary
     total_duration = (datetime.now() - start_time).total_seconds()
@@ -161,7 +196,16 @@ if __name__ == "__main__":
     parser.add_argument(
         "--country", type=str, help="Filter feeds by country code (e.g., RU, US, CN)"
     )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Fetch feeds one at a time instead of concurrently",
+    )
 
     args = parser.parse_args()
 
-    run_ingestion(max_feeds=args.max_feeds, country_code=args.country)
+    run_ingestion(
+        max_feeds=args.max_feeds,
+        country_code=args.country,
+        concurrent=False if args.sequential else None,
+    )
@@ -0,0 +1,99 @@
+"""
+Aho-Corasick multi-pattern automaton for Phase 2 matching
+
+Pure Python, no external dependency. All patterns are compiled into one
+trie with failure links, so scanning a title is a single left-to-right pass
+whose cost depends on the title length and the number of hits, not on how
+many patterns the taxonomy holds.
+
+The automaton only reports raw substring occurrences; callers apply their
+own post-filters (e.g. word boundaries) per hit.
+"""
+
+from collections import deque
+from typing import Any, Iterator, List, Tuple
+
+
+class AhoCorasick:
+    """Substring automaton mapping each pattern to a list of payloads"""
+
+    def __init__(self):
+        self._goto = [{}]  # node -> {char: node}
+        self._fail = [0]  # node -> failure node
+        self._out = [()]  # node -> pattern ids ending here (incl. via fail links)
+        self._lengths = []  # pattern id -> len(pattern)
+        self._payloads = []  # pattern id -> [payload, ...]
+        self._ids = {}  # pattern -> pattern id
+        self._built = False
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, pattern: str, payload: Any) -> None:
+        """Add a pattern (repeated patterns accumulate payloads)"""
+        if not pattern:
+            raise ValueError("Empty pattern")
+        if self._built:
+            raise RuntimeError("Cannot add patterns after build()")
+
+        pattern_id = self._ids.get(pattern)
+        if pattern_id is None:
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = nxt
+
+            pattern_id = len(self._payloads)
+            self._ids[pattern] = pattern_id
+            self._lengths.append(len(pattern))
+            self._payloads.append([])
+            self._out[node] = self._out[node] + (pattern_id,)
+
+        self._payloads[pattern_id].append(payload)
+
+    def build(self) -> "AhoCorasick":
+        """Compute failure links (breadth-first) and merge output sets"""
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                fail[nxt] = goto[state].get(ch, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+        self._built = True
+        return self
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, List[Any]]]:
+        """
+        Yield every (start, end, payloads) occurrence in text, overlapping
+        matches included. text[start:end] is the matched pattern.
+        """
+        if not self._built:
+            raise RuntimeError("build() must be called before matching")
+
+        goto, fail, out, lengths, payloads = (
+            self._goto,
+            self._fail,
+            self._out,
+            self._lengths,
+            self._payloads,
+        )
+        node = 0
+        for end, ch in enumerate(text, 1):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for pattern_id in out[node]:
+                yield end - lengths[pattern_id], end, payloads[pattern_id]
@@ -8,25 +8,35 @@ Mechanical matching without LLM gate_keep:
 
 Performance optimizations:
 - Pre-tokenization + hash-based matching (O(n) instead of O(n*m))
-- Precompiled regex patterns (compile once, not per title)
+- Aho-Corasick automaton for phrase/non-ASCII/CJK aliases and stop phrases
+  (one pass per title, independent of taxonomy size)
 - Script-aware matching (word boundaries for ASCII, substring for others)
 - Stop word fast-fail
 - Batched database updates
+- Streaming multiprocess rematch of the whole corpus (--rematch)
 
 Uses proven v2 matching logic from taxonomy_extractor.py
 """
 
+import io
+import json
+import multiprocessing
+import os
+import pickle
 import re
 import sys
 import unicodedata
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 import psycopg2
 from psycopg2.extras import Json
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from core.config import config
+from core.config import config, default_workers
+from pipeline.phase_2.aho_corasick import AhoCorasick
 
 # =============================================================================
 # CANONICAL ALIAS MAPPING
@@ -194,6 +204,35 @@ def is_common_word_false_positive(alias_lower: str) -> bool:
     return alias_lower in common_words
 
 
+# Bump when compile_taxonomy() output changes shape or semantics, so stale
+# pickles on disk are ignored even if taxonomy_v3 itself did not change.
+TAXONOMY_CACHE_VERSION = 1
+
+# Compiled artifact for this process (see load_taxonomy_artifact)
+_ARTIFACT = None
+
+# Automaton payloads: (kind, needs_word_boundary, centroid_id, alias)
+STOP_PHRASE = "stop"
+ALIAS_PHRASE = "alias"
+
+# Non-ASCII characters that re.IGNORECASE treats as equal to an ASCII letter
+# and that survive normalize_text (dotless i). Only boundary (regex-derived)
+# patterns were case-insensitive, so only those are re-checked on folded text.
+_IGNORECASE_EQUIVALENTS = str.maketrans({"\u0131": "i", "\u017f": "s"})
+
+
+def is_word_char(ch: str) -> bool:
+    """Same definition of a word character as the re module's \\w"""
+    return ch.isalnum() or ch == "_"
+
+
+def at_word_boundary(text: str, start: int, end: int) -> bool:
+    """True if text[start:end] is delimited like r"\\b...\\b" would require"""
+    return (start == 0 or not is_word_char(text[start - 1])) and (
+        end == len(text) or not is_word_char(text[end])
+    )
+
+
 def has_substring_script_chars(text: str) -> bool:
     """Check if text contains CJK scripts that need substring matching"""
     return any(
@@ -205,54 +244,167 @@ def has_substring_script_chars(text: str) -> bool:
     )
 
 
-def load_taxonomy():
+def taxonomy_checksum(cur):
     """
-    Load all active taxonomy items and build hash-based lookup structures.
+    Cheap change detector for the matching vocabulary.
 
-    Returns:
-        taxonomy dict with:
-        - stop_words_set: set of stop word tokens (hash lookup)
-        - stop_phrase_patterns: list of (pattern_type, pattern/substring) for stop phrases
-        - single_word_aliases: dict mapping word -> set of centroid_ids (multiple aliases per centroid)
-        - phrase_patterns: list of (compiled_pattern, centroid_id) for multi-word phrases (ASCII)
-        - phrase_substrings: list of (substring, centroid_id) for multi-word phrases (non-ASCII)
-        - substring_patterns: list of (substring, centroid_id) for CJK matching
+    Count of the rows load_taxonomy uses plus MAX(updated_at) over the whole
+    table (the updated_at trigger fires on every edit, and taking the max
+    over inactive rows too catches deactivations).
+    """
+    cur.execute(
+        """
+        SELECT COUNT(*) FILTER (
+                   WHERE is_active = true
+                     AND taxonomy_function IN ('centroid_anchor', 'stop_word')
+               ),
+               MAX(updated_at)
+        FROM taxonomy_v3
+    """
+    )
+    count, max_updated_at = cur.fetchone()
+    return f"{count}:{max_updated_at.isoformat() if max_updated_at else ''}"
+
+
+def fetch_taxonomy_rows(cur):
+    """
+    Returns: list of (id, is_stop_word, linked_id, aliases, taxonomy_function)
+    for all active centroid anchors and stop words.
+    """
+    # Load all taxonomy items (label is display-only, not used for matching).
+    # taxonomy_function filter keeps fn_anchor / narrative_anchor rows out
+    # of centroid attribution. stop_word rows must still be loaded so the
+    # in-Python logic below can populate stop_words_set / stop_phrase_patterns.
+    # linked_id replaces the legacy centroid_id column (Phase 2 cleanup).
+    cur.execute(
+        """
+        SELECT id, is_stop_word, linked_id, aliases, taxonomy_function
+        FROM taxonomy_v3
+        WHERE is_active = true
+          AND taxonomy_function IN ('centroid_anchor', 'stop_word')
     """
+    )
+    return cur.fetchall()
+
+
+def taxonomy_cache_path():
+    """On-disk location of the compiled taxonomy pickle"""
+    return config.cache_dir / f"taxonomy_v3.compiled.v{TAXONOMY_CACHE_VERSION}.pkl"
+
+
+def load_taxonomy_artifact(force_rebuild=False):
+    """
+    Return the compiled taxonomy artifact, rebuilding it only when
+    taxonomy_checksum() changed.
+
+    Lookup order: in-process copy, pickle on disk (config.cache_dir), then a
+    full rebuild from taxonomy_v3 which rewrites the pickle atomically.
+
+    Returns: dict with version, checksum, rows (fetch_taxonomy_rows output)
+    and taxonomy (compile_taxonomy output)
+    """
+    global _ARTIFACT
+
     conn = psycopg2.connect(
         **config.db_connect_kwargs(),
     )
+    try:
+        with conn.cursor() as cur:
+            checksum = taxonomy_checksum(cur)
+
+            use_cache = config.v3_p2_taxonomy_cache and not force_rebuild
+            if use_cache and _ARTIFACT and _ARTIFACT["checksum"] == checksum:
+                return _ARTIFACT
+
+            path = taxonomy_cache_path()
+            if use_cache and path.exists():
+                try:
+                    with open(path, "rb") as f:
+                        artifact = pickle.load(f)
+                    if (
+                        artifact.get("version") == TAXONOMY_CACHE_VERSION
+                        and artifact.get("checksum") == checksum
+                    ):
+                        _ARTIFACT = artifact
+                        return artifact
+                except Exception as e:
+                    print(f"  Taxonomy cache unreadable, rebuilding: {e}")
+
+            rows = fetch_taxonomy_rows(cur)
+    finally:
+        conn.close()
+
+    artifact = {
+        "version": TAXONOMY_CACHE_VERSION,
+        "checksum": checksum,
+        "rows": rows,
+        "taxonomy": compile_taxonomy(rows),
+    }
 
-    with conn.cursor() as cur:
-        # Load all taxonomy items (label is display-only, not used for matching).
-        # taxonomy_function filter keeps fn_anchor / narrative_anchor rows out
-        # of centroid attribution. stop_word rows must still be loaded so the
-        # in-Python logic below can populate stop_words_set / stop_phrase_patterns.
-        # linked_id replaces the legacy centroid_id column (Phase 2 cleanup).
-        cur.execute(
-            """
-            SELECT id, is_stop_word, linked_id, aliases
-            FROM taxonomy_v3
-            WHERE is_active = true
-              AND taxonomy_function IN ('centroid_anchor', 'stop_word')
-        """
-        )
-        taxonomy_results = cur.fetchall()
+    if config.v3_p2_taxonomy_cache:
+        try:
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"  Could not write taxonomy cache {path}: {e}")
 
-    conn.close()
+    _ARTIFACT = artifact
+    return artifact
+
+
+def load_taxonomy(force_rebuild=False):
+    """
+    Load the compiled taxonomy (cached, see load_taxonomy_artifact).
+
+    Returns: compile_taxonomy() dict
+    """
+    return load_taxonomy_artifact(force_rebuild)["taxonomy"]
+
+
+def load_taxonomy_rows(force_rebuild=False):
+    """
+    Raw active taxonomy rows from the same cached artifact, for tools that
+    need aliases per language rather than the compiled matcher.
+
+    Returns: list of (id, is_stop_word, linked_id, aliases, taxonomy_function)
+    """
+    return load_taxonomy_artifact(force_rebuild)["rows"]
+
+
+def compile_taxonomy(taxonomy_results):
+    """
+    Build hash-based lookup structures from fetch_taxonomy_rows() output.
 
+    Returns:
+        taxonomy dict with:
+        - stop_words_set: set of stop word tokens (hash lookup)
+        - stop_phrase_patterns: list of (pattern_type, term) for stop phrases
+        - single_word_aliases: dict mapping word -> set of centroid_ids (multiple aliases per centroid)
+        - phrase_patterns: list of (term, centroid_id) for multi-word phrases (ASCII, word boundary)
+        - phrase_substrings: list of (substring, centroid_id) for multi-word phrases (non-ASCII)
+        - substring_patterns: list of (substring, centroid_id) for CJK matching
+        - automaton: AhoCorasick over all stop phrases, phrases and CJK terms
+
+        The pattern lists are kept for reporting and for match_title_linear,
+        the reference matcher used by verify_matcher(). Everything is plain
+        data (no compiled regexes) so the artifact unpickles quickly.
+    """
     # Hash-based structures for O(1) lookup
     stop_words_set = set()  # Single-word stop terms
-    stop_phrase_patterns = []  # Precompiled patterns/substrings for stop phrases
+    stop_phrase_patterns = []  # ("regex" | "substring", term) for stop phrases
     single_word_aliases = defaultdict(
         set
     )  # Word -> set of centroid_ids (multiple aliases can map to same centroid)
-    phrase_patterns = []  # (compiled_pattern, centroid_id) for ASCII multi-word
+    phrase_patterns = []  # (term, centroid_id) for ASCII multi-word
     phrase_substrings = []  # (substring, centroid_id) for non-ASCII multi-word
     substring_patterns = []  # (substring, centroid_id) for CJK
+    automaton = AhoCorasick()  # Everything above except the hash lookups
 
     # NB: linked_id column from DB; local variable kept as centroid_id since
     # the value semantically IS a centroid id (taxonomy_function='centroid_anchor').
-    for id, is_stop_word, centroid_id, aliases in taxonomy_results:
+    for id, is_stop_word, centroid_id, aliases, _ in taxonomy_results:
         # Build searchable terms from aliases only (item_raw/label is display-only)
         terms = set()
         if aliases:
@@ -277,15 +429,15 @@ def load_taxonomy():
                 else:
                     if has_substring_script_chars(term):
                         stop_phrase_patterns.append(("substring", term))
+                        automaton.add(term, (STOP_PHRASE, False, None, None))
                     elif is_ascii_only(term):
-                        # ASCII phrase - use word boundary regex
-                        pattern = re.compile(
-                            r"\b" + re.escape(term) + r"\b", re.IGNORECASE
-                        )
-                        stop_phrase_patterns.append(("regex", pattern))
+                        # ASCII phrase - word boundary match
+                        stop_phrase_patterns.append(("regex", term))
+                        automaton.add(term, (STOP_PHRASE, True, None, None))
                     else:
                         # Non-ASCII (Arabic, Devanagari, etc.) - use substring
                         stop_phrase_patterns.append(("substring", term))
+                        automaton.add(term, (STOP_PHRASE, False, None, None))
             continue
 
         # Add matching patterns for non-stop-word items
@@ -300,20 +452,20 @@ def load_taxonomy():
             # CJK scripts need substring matching (can't tokenize)
             if has_substring_script_chars(term):
                 substring_patterns.append((term, centroid_id))
+                automaton.add(term, (ALIAS_PHRASE, False, centroid_id, term))
             # Single-word aliases go into hash map
             elif " " not in term:
                 single_word_aliases[term].add(centroid_id)
             # Multi-word phrases: precompile patterns based on script
             else:
                 if is_ascii_only(term):
-                    # ASCII phrase - use word boundary regex (precompile)
-                    pattern = re.compile(r"\b" + re.escape(term) + r"\b", re.IGNORECASE)
-                    phrase_patterns.append(
-                        (pattern, centroid_id, term)
-                    )  # Include alias
+                    # ASCII phrase - word boundary match
+                    phrase_patterns.append((term, centroid_id))
+                    automaton.add(term, (ALIAS_PHRASE, True, centroid_id, term))
                 else:
                     # Non-ASCII phrase - use substring matching
                     phrase_substrings.append((term, centroid_id))
+                    automaton.add(term, (ALIAS_PHRASE, False, centroid_id, term))
 
     return {
         "stop_words_set": stop_words_set,
@@ -322,12 +474,101 @@ def load_taxonomy():
         "phrase_patterns": phrase_patterns,
         "phrase_substrings": phrase_substrings,
         "substring_patterns": substring_patterns,
+        "automaton": automaton.build(),
     }
 
 
+def scan_phrases(normalized_title, automaton):
+    """
+    Single automaton pass over a normalized title.
+
+    Returns: (blocked, matched_centroids, matched_aliases) for the phrase,
+    non-ASCII and CJK patterns. Boundary patterns only count when the hit is
+    delimited like the equivalent r"\b...\b" regex.
+    """
+    blocked = False
+    matched_centroids = set()
+    matched_aliases = set()
+
+    def collect(text, boundary_only):
+        nonlocal blocked
+        for start, end, payloads in automaton.iter_matches(text):
+            bounded = None
+            for kind, needs_boundary, centroid_id, alias in payloads:
+                if needs_boundary:
+                    if bounded is None:
+                        bounded = at_word_boundary(text, start, end)
+                    if not bounded:
+                        continue
+                elif boundary_only:
+                    continue
+                if kind == STOP_PHRASE:
+                    blocked = True
+                else:
+                    matched_centroids.add(centroid_id)
+                    matched_aliases.add(alias)
+
+    collect(normalized_title, False)
+
+    # Regex patterns were IGNORECASE: re-check them with "ı" read as "i"
+    folded = normalized_title.translate(_IGNORECASE_EQUIVALENTS)
+    if folded != normalized_title:
+        collect(folded, True)
+
+    return blocked, matched_centroids, matched_aliases
+
+
 def match_title(title_text, taxonomy):
     """
-    Match title against taxonomy using hash-based lookup.
+    Match title against taxonomy using hash-based lookup plus one
+    Aho-Corasick pass for phrases, non-ASCII and CJK terms.
+
+    Returns: (matched_centroids, matched_aliases, match_status)
+    - matched_centroids: set of centroid IDs
+    - matched_aliases: set of normalized alias strings that triggered matches
+    - match_status: "blocked_stopword", "no_match", "matched"
+    """
+    normalized_title = normalize_text(title_text)
+
+    # Step 1: Fast-fail on stop words (hash lookup O(n) where n = words in title)
+    tokens = tokenize_text(normalized_title)
+
+    # Check single-word stop terms (O(1) hash lookup per token)
+    if tokens & taxonomy["stop_words_set"]:
+        return set(), set(), "blocked_stopword"
+
+    # Stop phrases + multi-word/non-ASCII/CJK aliases in a single scan
+    blocked, matched_centroids, matched_aliases = scan_phrases(
+        normalized_title, taxonomy["automaton"]
+    )
+    if blocked:
+        return set(), set(), "blocked_stopword"
+
+    # Step 2: Single-word aliases (O(1) hash lookup per token)
+    for token in tokens:
+        if token in taxonomy["single_word_aliases"]:
+            matched_centroids.update(taxonomy["single_word_aliases"][token])
+            matched_aliases.add(token)
+
+    # Step 3: Canonicalize aliases and return
+    if matched_centroids:
+        canonical_aliases = {canonicalize_alias(a) for a in matched_aliases}
+        return matched_centroids, canonical_aliases, "matched"
+    else:
+        return set(), set(), "no_match"
+
+
+@lru_cache(maxsize=None)
+def phrase_regex(term):
+    """Word-boundary regex for an ASCII phrase (reference matcher only)"""
+    return re.compile(r"\b" + re.escape(term) + r"\b", re.IGNORECASE)
+
+
+def match_title_linear(title_text, taxonomy):
+    """
+    Reference matcher: linear scan over every phrase pattern and substring.
+
+    Superseded by match_title (automaton); kept for verify_matcher().
 
     Returns: (matched_centroids, matched_aliases, match_status)
     - matched_centroids: set of centroid IDs
@@ -348,8 +589,8 @@ def match_title(title_text, taxonomy):
         if phrase_type == "substring":
             if pattern_or_substring in normalized_title:
                 return set(), set(), "blocked_stopword"
-        else:  # regex (precompiled)
-            if pattern_or_substring.search(normalized_title):
+        else:  # regex
+            if phrase_regex(pattern_or_substring).search(normalized_title):
                 return set(), set(), "blocked_stopword"
 
     # Step 2: Match against all patterns (hash lookup O(n))
@@ -362,11 +603,11 @@ def match_title(title_text, taxonomy):
             matched_centroids.update(taxonomy["single_word_aliases"][token])
             matched_aliases.add(token)
 
-    # Check ASCII multi-word phrases (precompiled regex patterns)
-    for pattern, centroid_id, alias_norm in taxonomy["phrase_patterns"]:
-        if pattern.search(normalized_title):
+    # Check ASCII multi-word phrases (word boundary regex)
+    for term, centroid_id in taxonomy["phrase_patterns"]:
+        if phrase_regex(term).search(normalized_title):
             matched_centroids.add(centroid_id)
-            matched_aliases.add(alias_norm)
+            matched_aliases.add(term)
 
     # Check non-ASCII multi-word phrases (substring matching)
     for substring, centroid_id in taxonomy["phrase_substrings"]:
@@ -388,26 +629,25 @@ def match_title(title_text, taxonomy):
         return set(), set(), "no_match"
 
 
-def process_batch(batch_size=100, max_titles=None):
+def process_batch(batch_size=100, max_titles=None, rebuild_taxonomy=False):
     """Process titles with batched database updates"""
     conn = psycopg2.connect(
         **config.db_connect_kwargs(),
     )
 
     print("Loading taxonomy...")
-    taxonomy = load_taxonomy()
+    taxonomy = load_taxonomy(force_rebuild=rebuild_taxonomy)
     print(f"  Stop words (hash): {len(taxonomy['stop_words_set'])} words")
     print(f"  Stop phrases: {len(taxonomy['stop_phrase_patterns'])} patterns")
     print(
         f"  Single-word aliases (hash): {len(taxonomy['single_word_aliases'])} entries"
     )
-    print(
-        f"  ASCII phrase patterns (precompiled): {len(taxonomy['phrase_patterns'])} patterns"
-    )
+    print(f"  ASCII phrase patterns: {len(taxonomy['phrase_patterns'])} patterns")
     print(
         f"  Non-ASCII phrase substrings: {len(taxonomy['phrase_substrings'])} patterns"
     )
     print(f"  CJK substring patterns: {len(taxonomy['substring_patterns'])} patterns")
+    print(f"  Automaton patterns: {len(taxonomy['automaton'])} (single pass)")
 
     with conn.cursor() as cur:
         # Get pending titles
@@ -517,6 +757,286 @@ def process_batch(batch_size=100, max_titles=None):
     print(f"No match (out of scope):{len(out_of_scope_ids)}")
 
 
+# =============================================================================
+# STREAMING REMATCH
+# =============================================================================
+# Full-corpus rematch after a vocabulary change: keyset-paginated reads
+# through a server-side cursor, matching fanned out over a process pool,
+# and one COPY + UPDATE ... FROM per chunk. Memory stays at one chunk.
+# =============================================================================
+
+# Statuses Phase 2 owns; anything later in the pipeline is left alone
+REMATCH_STATUSES = ("pending", "assigned", "out_of_scope", "blocked_stopword")
+
+# Taxonomy for rematch worker processes (set by _init_rematch_worker)
+_WORKER_TAXONOMY = None
+
+
+def _init_rematch_worker(taxonomy):
+    """Process-pool initializer: receive the compiled taxonomy once"""
+    global _WORKER_TAXONOMY
+    _WORKER_TAXONOMY = taxonomy
+
+
+def _rematch_slice(rows):
+    """
+    Match a slice of (id, title_display) rows in a worker process.
+
+    Returns: list of (id, centroid_ids, aliases_json, status); centroid ids
+    are sorted so unchanged titles compare equal to what is stored.
+    """
+    results = []
+    for title_id, title_text in rows:
+        matched_centroids, matched_aliases, match_status = match_title(
+            title_text, _WORKER_TAXONOMY
+        )
+        if match_status == "matched":
+            status = "assigned"
+            aliases_json = (
+                json.dumps(sorted(matched_aliases), ensure_ascii=False)
+                if matched_aliases
+                else None
+            )
+        else:  # blocked_stopword / no_match (tags cleared, as in process_batch)
+            status = (
+                "blocked_stopword"
+                if match_status == "blocked_stopword"
+                else "out_of_scope"
+            )
+            aliases_json = None
+        results.append((title_id, sorted(matched_centroids), aliases_json, status))
+    return results
+
+
+def _copy_text(value):
+    """Escape one field for COPY ... FROM STDIN (text format)"""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def _array_literal(values):
+    """Postgres text[] literal for a list of strings"""
+    quoted = ('"' + v.replace("\\", "\\\\").replace('"', '\\"') + '"' for v in values)
+    return "{" + ",".join(quoted) + "}"
+
+
+def rematch_all(chunk_size=None, workers=None, days=None, start_after=None):
+    """
+    Rematch every Phase 2 title (REMATCH_STATUSES) against the current
+    taxonomy in streaming chunks.
+
+    Same outcomes as process_batch, but only rows whose status, centroids or
+    aliases actually change are written. Each chunk is committed on its own,
+    so an interrupted run can resume with start_after=<last id printed>.
+
+    Returns: dict of counts (scanned, assigned, out_of_scope,
+    blocked_stopword, changed)
+    """
+    chunk_size = chunk_size or config.v3_p2_rematch_chunk_size
+    workers = workers or config.v3_p2_rematch_workers or default_workers()
+
+    print("Loading taxonomy...")
+    taxonomy = load_taxonomy()
+    print(f"  Automaton patterns: {len(taxonomy['automaton'])}")
+    print(f"  Single-word aliases: {len(taxonomy['single_word_aliases'])}")
+
+    conn = psycopg2.connect(
+        **config.db_connect_kwargs(),
+    )
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            CREATE TEMP TABLE p2_rematch_stage (
+                id UUID PRIMARY KEY,
+                centroid_ids TEXT[] NOT NULL,
+                matched_aliases JSONB,
+                processing_status TEXT NOT NULL
+            ) ON COMMIT DELETE ROWS
+        """
+        )
+    conn.commit()
+
+    filters = ["processing_status = ANY(%s)", "id > %s"]
+    if days:
+        filters.append("pubdate_utc > NOW() - make_interval(days => %s)")
+    select_sql = f"""
+        SELECT id, title_display
+        FROM titles_v3
+        WHERE {" AND ".join(filters)}
+        ORDER BY id
+        LIMIT %s
+    """
+
+    stats = defaultdict(int)
+    last_id = start_after or "00000000-0000-0000-0000-000000000000"
+    chunk_no = 0
+
+    print(f"\nRematching in chunks of {chunk_size} with {workers} workers...")
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_rematch_worker,
+        initargs=(taxonomy,),
+    )
+    try:
+        while True:
+            params = [list(REMATCH_STATUSES), last_id]
+            if days:
+                params.append(days)
+            params.append(chunk_size)
+
+            # Server-side cursor: the chunk streams from Postgres in pieces
+            with conn.cursor(name="p2_rematch") as cur:
+                cur.itersize = min(chunk_size, 2000)
+                cur.execute(select_sql, params)
+                rows = [(str(title_id), text) for title_id, text in cur]
+            if not rows:
+                conn.commit()
+                break
+
+            last_id = rows[-1][0]
+            chunk_no += 1
+
+            step = -(-len(rows) // workers)
+            slices = [rows[i : i + step] for i in range(0, len(rows), step)]
+            buf = io.StringIO()
+            for results in executor.map(_rematch_slice, slices):
+                for title_id, centroid_ids, aliases_json, status in results:
+                    stats[status] += 1
+                    buf.write(
+                        "\t".join(
+                            (
+                                title_id,
+                                _copy_text(_array_literal(centroid_ids)),
+                                _copy_text(aliases_json),
+                                status,
+                            )
+                        )
+                        + "\n"
+                    )
+            buf.seek(0)
+
+            with conn.cursor() as cur:
+                cur.copy_expert(
+                    "COPY p2_rematch_stage "
+                    "(id, centroid_ids, matched_aliases, processing_status) "
+                    "FROM STDIN",
+                    buf,
+                )
+                # Same fields as process_batch writes; unchanged rows skipped
+                # (centroid_ids compared as sets, order was never meaningful)
+                cur.execute(
+                    """
+                    UPDATE titles_v3 t
+                    SET centroid_ids = s.centroid_ids,
+                        matched_aliases = s.matched_aliases,
+                        processing_status = s.processing_status,
+                        updated_at = NOW()
+                    FROM p2_rematch_stage s
+                    WHERE t.id = s.id
+                      AND (t.processing_status IS DISTINCT FROM s.processing_status
+                           OR t.matched_aliases IS DISTINCT FROM s.matched_aliases
+                           OR NOT (COALESCE(t.centroid_ids::text[], '{}') @> s.centroid_ids
+                                   AND COALESCE(t.centroid_ids::text[], '{}') <@ s.centroid_ids))
+                """
+                )
+                changed = cur.rowcount
+            conn.commit()
+
+            stats["scanned"] += len(rows)
+            stats["changed"] += changed
+            print(
+                f"  Chunk {chunk_no}: {len(rows)} titles, {changed} changed "
+                f"(total {stats['scanned']}, last id {last_id})"
+            )
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        executor.shutdown()
+        conn.close()
+
+    print(f"\n{'='*60}")
+    print("REMATCH RESULTS")
+    print(f"{'='*60}")
+    print(f"Total scanned:          {stats['scanned']}")
+    print(f"Changed:                {stats['changed']}")
+    print(f"Matched:                {stats['assigned']}")
+    print(f"Blocked (stop words):   {stats['blocked_stopword']}")
+    print(f"No match (out of scope):{stats['out_of_scope']}")
+    return dict(stats)
+
+
+def verify_matcher(sample_size=50000):
+    """
+    Correctness harness for the automaton matcher.
+
+    Runs match_title and match_title_linear over the most recent titles
+    (any status) and reports every title whose (centroids, aliases, status)
+    differ. Also prints the throughput of both matchers.
+
+    Returns: number of mismatching titles (0 = identical output)
+    """
+    import time
+
+    print("Loading taxonomy...")
+    taxonomy = load_taxonomy()
+    print(f"  Automaton patterns: {len(taxonomy['automaton'])}")
+
+    conn = psycopg2.connect(
+        **config.db_connect_kwargs(),
+    )
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT id, title_display
+            FROM titles_v3
+            ORDER BY created_at DESC
+            LIMIT %s
+        """,
+            (sample_size,),
+        )
+        titles = cur.fetchall()
+    conn.close()
+
+    print(f"\nComparing matchers on {len(titles)} titles...")
+
+    start = time.time()
+    linear = [match_title_linear(text, taxonomy) for _, text in titles]
+    linear_sec = time.time() - start
+
+    start = time.time()
+    automaton = [match_title(text, taxonomy) for _, text in titles]
+    automaton_sec = time.time() - start
+
+    mismatches = 0
+    for (title_id, text), expected, actual in zip(titles, linear, automaton):
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 20:
+                print(f"\nMISMATCH {title_id}: {text}")
+                print(f"  linear:    {expected}")
+                print(f"  automaton: {actual}")
+
+    print(f"\n{'='*60}")
+    print("VERIFY")
+    print(f"{'='*60}")
+    print(f"Titles compared:        {len(titles)}")
+    print(f"Mismatches:             {mismatches}")
+    print(f"Linear matcher:         {linear_sec:.2f}s")
+    print(
+        f"Automaton matcher:      {automaton_sec:.2f}s ({linear_sec / automaton_sec if automaton_sec else 0:.1f}x)"
+    )
+    return mismatches
+
+
 if __name__ == "__main__":
     import argparse
 
@@ -527,7 +1047,61 @@ if __name__ == "__main__":
     parser.add_argument(
         "--batch-size", type=int, default=100, help="Batch size for database updates"
     )
+    parser.add_argument(
+        "--rebuild-taxonomy",
+        action="store_true",
+        help="Ignore the compiled taxonomy cache and rebuild it",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Compare automaton matcher against the linear reference (no writes)",
+    )
+    parser.add_argument(
+        "--verify-sample",
+        type=int,
+        default=50000,
+        help="Number of recent titles to compare with --verify",
+    )
+
+    parser.add_argument(
+        "--rematch",
+        action="store_true",
+        help="Rematch all Phase 2 titles (not just pending) in streaming chunks",
+    )
+    parser.add_argument(
+        "--rematch-days",
+        type=int,
+        help="With --rematch: only titles published in the last N days",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, help="With --rematch: titles per chunk/commit"
+    )
+    parser.add_argument("--workers", type=int, help="With --rematch: matcher processes")
+    parser.add_argument(
+        "--start-after",
+        help="With --rematch: resume after this title id (keyset position)",
+    )
 
     args = parser.parse_args()
 
-    process_batch(batch_size=args.batch_size, max_titles=args.max_titles)
+    if args.rebuild_taxonomy:
+        load_taxonomy(force_rebuild=True)
+
+    if args.rematch:
+        rematch_all(
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            days=args.rematch_days,
+            start_after=args.start_after,
+        )
+        sys.exit(0)
+
+    if args.verify:
+        sys.exit(1 if verify_matcher(sample_size=args.verify_sample) else 0)
+
+    process_batch(
+        batch_size=args.batch_size,
+        max_titles=args.max_titles,
+        rebuild_taxonomy=args.rebuild_taxonomy,
+    )
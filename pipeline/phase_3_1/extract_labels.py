@@ -13,20 +13,25 @@ Usage:
 """
 
 import argparse
+import copy
+import hashlib
 import json
 import sys
-import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import Counter
+from concurrent.futures import as_completed
+from functools import lru_cache
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-import httpx
 import psycopg2
 from loguru import logger
+from psycopg2 import errors as pg_errors
+from psycopg2.extras import execute_values
 
 from core.config import MAX_API_ERRORS, config
-from core.llm_logger import log_llm_call
+from core.llm_client import get_llm_client
+from core.llm_logger import log_cache_stats
 from core.ontology import (
     INDUSTRIES,
     ONTOLOGY_VERSION,
@@ -41,14 +46,20 @@ from core.ontology import (
 )
 from core.prompts import LABEL_SIGNAL_EXTRACTION_PROMPT
 from core.signal_normalization import normalize_batch_signals
+from pipeline.phase_1.normalize import normalize_title
 
 # =============================================================================
 # PROMPT BUILDING
 # =============================================================================
 
 
+@lru_cache(maxsize=1)
 def build_system_prompt() -> str:
-    """Build the complete system prompt with ontology."""
+    """Build the complete system prompt with ontology.
+
+    Rendered once per process and reused byte-for-byte: the provider's
+    prefix cache only discounts prompt tokens that repeat exactly.
+    """
     return LABEL_SIGNAL_EXTRACTION_PROMPT.format(
         action_classes=get_action_classes_for_prompt(),
         domains=get_domains_for_prompt(),
@@ -60,7 +71,10 @@ def build_system_prompt() -> str:
 
 
 def build_user_prompt(titles_batch: list[dict]) -> str:
-    """Build user prompt with numbered list of titles."""
+    """Build user prompt with numbered list of titles.
+
+    The fixed header comes first so it extends the cached system prefix.
+    """
     lines = ["Extract event labels and signals for these titles:", ""]
 
     for i, title in enumerate(titles_batch, 1):
@@ -73,88 +87,90 @@ def build_user_prompt(titles_batch: list[dict]) -> str:
     return "\n".join(lines)
 
 
-# =============================================================================
-# LLM INTERACTION
-# =============================================================================
+# Share of max_tokens a packed batch may plan to use for its JSON answer
+OUTPUT_HEADROOM = 0.85
 
 
-def call_llm(system_prompt: str, user_prompt: str) -> str:
-    """Call LLM API with retry logic."""
-    headers = {
-        "Authorization": "Bearer {}".format(config.deepseek_api_key),
-        "Content-Type": "application/json",
-    }
+def estimate_tokens(text: str) -> int:
+    """Rough DeepSeek token count: ~0.3/char Latin script, ~0.6/char CJK etc."""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return int(0.3 * ascii_chars + 0.6 * (len(text) - ascii_chars)) + 3  # "N. "
 
-    payload = {
-        "model": config.llm_model,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        "temperature": config.v3_p31_temperature,
-        "max_tokens": config.v3_p31_max_tokens,
-    }
 
-    for attempt in range(config.llm_retry_attempts):
-        try:
-            t0 = time.time()
-            with httpx.Client(timeout=config.v3_p31_timeout_seconds) as client:
-                response = client.post(
-                    "{}/chat/completions".format(config.deepseek_api_url),
-                    headers=headers,
-                    json=payload,
-                )
+def pack_batches(titles: list[dict], max_titles: int) -> list[list[dict]]:
+    """Split titles into consecutive batches filled to the token budgets.
 
-                from core.llm_utils import check_rate_limit
+    A batch closes when the next title would exceed the input budget
+    (v3_p31_batch_token_budget), the planned answer size (titles x
+    v3_p31_output_tokens_per_title vs. max_tokens), or max_titles.
+    """
+    input_budget = config.v3_p31_batch_token_budget
+    output_cap = int(config.v3_p31_max_tokens * OUTPUT_HEADROOM)
+    output_cap //= config.v3_p31_output_tokens_per_title
+    max_titles = max(1, min(max_titles, output_cap))
 
-                if check_rate_limit(response, attempt):
-                    continue
+    batches = []
+    batch = []
+    used = 0
+    for title in titles:
+        cost = estimate_tokens(title.get("title_display") or "")
+        if batch and (len(batch) >= max_titles or used + cost > input_budget):
+            batches.append(batch)
+            batch = []
+            used = 0
+        batch.append(title)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
 
-                if response.status_code != 200:
-                    raise Exception(
-                        "API error: {} - {}".format(
-                            response.status_code, response.text[:200]
-                        )
-                    )
 
-                data = response.json()
-                log_llm_call(
-                    "labels",
-                    data.get("usage"),
-                    int((time.time() - t0) * 1000),
-                )
-                return data["choices"][0]["message"]["content"].strip()
+# =============================================================================
+# LLM INTERACTION
+# =============================================================================
 
-        except Exception as e:
-            if attempt == config.llm_retry_attempts - 1:
-                logger.error(
-                    "LLM call failed after {} attempts: {}".format(
-                        config.llm_retry_attempts, e
-                    )
-                )
-                raise
 
-            delay = (config.llm_retry_backoff**attempt) + (0.1 * attempt)
-            logger.warning(
-                "LLM attempt {} failed: {}. Retrying in {:.1f}s".format(
-                    attempt + 1, e, delay
-                )
-            )
-            time.sleep(delay)
+def _messages(system_prompt: str, user_prompt: str) -> list[dict]:
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
 
 
-def extract_batch(titles_batch: list[dict]) -> list[dict]:
+async def call_llm_async(system_prompt: str, user_prompt: str) -> str:
+    """Call LLM API through the shared client (retries, rate limit, pooling)."""
+    content, _ = await get_llm_client().chat(
+        _messages(system_prompt, user_prompt),
+        phase="labels",
+        temperature=config.v3_p31_temperature,
+        max_tokens=config.v3_p31_max_tokens,
+        timeout=config.v3_p31_timeout_seconds,
+    )
+    return content
+
+
+def call_llm(system_prompt: str, user_prompt: str) -> str:
+    """Blocking call_llm_async for sync callers."""
+    return get_llm_client().submit(call_llm_async(system_prompt, user_prompt)).result()
+
+
+async def extract_batch_async(titles_batch: list[dict]) -> list[dict]:
     """Extract labels and signals for a batch of titles via LLM."""
     system_prompt = build_system_prompt()
     user_prompt = build_user_prompt(titles_batch)
 
-    response = call_llm(system_prompt, user_prompt)
+    response = await call_llm_async(system_prompt, user_prompt)
     logger.debug("LLM response length: {} chars".format(len(response)))
     if len(response) < 100:
         logger.warning("Short LLM response: {}".format(response[:500]))
     return parse_llm_response(response, titles_batch)
 
 
+def extract_batch(titles_batch: list[dict]) -> list[dict]:
+    """Blocking extract_batch_async for sync callers."""
+    return get_llm_client().submit(extract_batch_async(titles_batch)).result()
+
+
 # =============================================================================
 # RESPONSE PARSING
 # =============================================================================
@@ -632,6 +648,118 @@ def write_to_db(conn, results: list[dict]) -> int:
     return inserted
 
 
+# =============================================================================
+# RESULT CACHE
+# =============================================================================
+# Syndicated headlines recur across feeds with trivial differences. Parsed
+# per-title results are cached under sha256(ONTOLOGY_VERSION, prompt
+# fingerprint, Phase 1 dedup form of the title), so an ontology bump or any
+# prompt/model/temperature change simply starts a fresh key space.
+
+
+def prompt_fingerprint() -> str:
+    """Hash of everything besides the title that shapes the LLM output."""
+    h = hashlib.sha256()
+    for part in (
+        config.llm_model,
+        str(config.v3_p31_temperature),
+        build_system_prompt(),
+    ):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+def title_cache_key(title_display: str, prompt_hash: str) -> str:
+    """Content address of a title's extraction result."""
+    _, hash_base = normalize_title(title_display or "")
+    raw = "{}|{}|{}".format(ONTOLOGY_VERSION, prompt_hash, hash_base)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _missing_cache_table(conn, e) -> None:
+    conn.rollback()
+    logger.warning("llm_label_cache missing ({}); running without the cache".format(e))
+
+
+def load_cached_results(conn, keys: list) -> dict | None:
+    """Return {cache_key: result} for cached keys (hit stats are written
+    once per run by record_cache_hits).
+
+    None when llm_label_cache does not exist (migration not applied).
+    """
+    if not keys:
+        return {}
+    max_age = config.v3_p31_cache_max_age_days
+    cur = conn.cursor()
+    try:
+        cur.execute(
+            """
+            SELECT cache_key, result FROM llm_label_cache
+            WHERE cache_key = ANY(%s)
+              AND (%s = 0 OR created_at > NOW() - make_interval(days => %s))
+            """,
+            (list(keys), max_age, max_age),
+        )
+    except pg_errors.UndefinedTable as e:
+        _missing_cache_table(conn, e)
+        return None
+    cached = {row[0]: row[1] for row in cur.fetchall()}
+    conn.commit()
+    return cached
+
+
+def record_cache_hits(conn, hits: Counter) -> None:
+    """Add this run's per-key hit counts and stamp last_hit_at, one statement."""
+    if not hits:
+        return
+    cur = conn.cursor()
+    try:
+        execute_values(
+            cur,
+            """
+            UPDATE llm_label_cache c
+            SET hit_count = c.hit_count + v.n, last_hit_at = NOW()
+            FROM (VALUES %s) AS v(cache_key, n)
+            WHERE c.cache_key = v.cache_key
+            """,
+            sorted(hits.items()),
+        )
+    except pg_errors.UndefinedTable as e:
+        _missing_cache_table(conn, e)
+        return
+    conn.commit()
+
+
+def store_cached_results(conn, results: list[dict], keys: dict) -> None:
+    """Cache freshly parsed results (before batch-level signal normalization)."""
+    rows = {}
+    for r in results:
+        key = keys.get(r["title_id"])
+        if key:
+            item = {k: v for k, v in r.items() if k != "title_id"}
+            rows[key] = (key, ONTOLOGY_VERSION, json.dumps(item))
+    if not rows:
+        return
+    cur = conn.cursor()
+    try:
+        execute_values(
+            cur,
+            """
+            INSERT INTO llm_label_cache (cache_key, ontology_version, result)
+            VALUES %s
+            ON CONFLICT (cache_key) DO UPDATE SET
+                result = EXCLUDED.result,
+                created_at = NOW()
+            """,
+            list(rows.values()),
+        )
+    except pg_errors.UndefinedTable as e:
+        _missing_cache_table(conn, e)
+        return
+    conn.commit()
+
+
 # =============================================================================
 # MAIN
 # =============================================================================
@@ -660,12 +788,12 @@ def increment_api_error_count(conn, title_ids: list):
         conn.rollback()
 
 
-def process_batch_worker(batch_info: tuple) -> dict:
-    """Worker function for concurrent batch processing."""
+async def process_batch_worker(batch_info: tuple) -> dict:
+    """Coroutine for one batch; runs on the shared LLM client loop."""
     batch, batch_num, total_batches = batch_info
     title_ids = [t["id"] for t in batch]
     try:
-        results = extract_batch(batch)
+        results = await extract_batch_async(batch)
         return {
             "batch_num": batch_num,
             "results": results,
@@ -682,16 +810,47 @@ def process_batch_worker(batch_info: tuple) -> dict:
         }
 
 
+def write_batch_result(conn, result: dict, keys: dict, duplicates: dict) -> int:
+    """Cache, fan out to in-run duplicates, normalize and write one batch."""
+    results = result["results"]
+    if keys:
+        store_cached_results(conn, results, keys)
+        for r in list(results):
+            for dup_id in duplicates.get(keys.get(r["title_id"]), ()):
+                results.append(dict(copy.deepcopy(r), title_id=dup_id))
+    if not results:
+        return 0
+    normalize_batch_signals(results, conn)
+    return write_to_db(conn, results)
+
+
 def process_titles(
     max_titles: int = 200,
-    batch_size: int = 25,
+    batch_size: int = None,
     centroid_filter: str = None,
     track_filter: str = None,
     concurrency: int = 1,
     backfill_entity_countries: bool = False,
     title_ids_filter: list = None,
+    use_cache: bool = None,
 ) -> dict:
-    """Process titles in batches with optional concurrency."""
+    """Process titles in batches with optional concurrency.
+
+    Titles whose normalized text is already in llm_label_cache (same
+    ontology + prompt) are written straight from the cache; repeats within
+    the run are sent to the LLM once. Only the remaining misses are batched.
+
+    concurrency=1 runs batches one at a time. Otherwise all batches are
+    submitted to the shared LLM client, whose adaptive limit (seeded with
+    `concurrency`) decides how many are in flight; results are written here
+    as they complete.
+    """
+    if batch_size is None:
+        batch_size = config.v3_p31_batch_size
+    if use_cache is None:
+        # Backfill re-asks the LLM on purpose; a cached answer would repeat the gap
+        use_cache = config.v3_p31_cache and not backfill_entity_countries
+
     conn = get_connection()
 
     titles = load_titles_needing_extraction(
@@ -708,13 +867,65 @@ def process_titles(
         conn.close()
         return {"processed": 0, "written": 0}
 
-    # Prepare batches
-    batches = []
-    total_batches = (len(titles) + batch_size - 1) // batch_size
-    for i in range(0, len(titles), batch_size):
-        batch = titles[i : i + batch_size]
-        batch_num = (i // batch_size) + 1
-        batches.append((batch, batch_num, total_batches))
+    total_titles = len(titles)
+    total_written = 0
+    failed_batches = 0
+    cache_hits = 0
+    keys = {}  # title_id -> cache key
+    duplicates = {}  # cache key -> title_ids riding on another title's LLM result
+
+    if use_cache:
+        prompt_hash = prompt_fingerprint()
+        keys = {
+            t["id"]: title_cache_key(t["title_display"], prompt_hash) for t in titles
+        }
+        cached = load_cached_results(conn, set(keys.values()))
+        if cached is None:
+            use_cache = False
+            keys = {}
+
+    if use_cache:
+        hits = [
+            dict(copy.deepcopy(cached[keys[t["id"]]]), title_id=t["id"])
+            for t in titles
+            if keys[t["id"]] in cached
+        ]
+        cache_hits = len(hits)
+        for i in range(0, len(hits), batch_size):
+            chunk = hits[i : i + batch_size]
+            normalize_batch_signals(chunk, conn)
+            total_written += write_to_db(conn, chunk)
+        record_cache_hits(
+            conn, Counter(keys[t["id"]] for t in titles if keys[t["id"]] in cached)
+        )
+
+        misses = []
+        representative = set()
+        for t in titles:
+            key = keys[t["id"]]
+            if key in cached:
+                continue
+            if key in representative:
+                duplicates.setdefault(key, []).append(t["id"])
+            else:
+                representative.add(key)
+                misses.append(t)
+        titles = misses
+
+        logger.info(
+            "Label cache: {} hits, {} in-run repeats, {} titles to extract".format(
+                cache_hits,
+                sum(len(ids) for ids in duplicates.values()),
+                len(titles),
+            )
+        )
+
+    # Prepare batches (packed to the token budget, batch_size is a cap)
+    packed = pack_batches(titles, batch_size)
+    total_batches = len(packed)
+    batches = [
+        (batch, batch_num, total_batches) for batch_num, batch in enumerate(packed, 1)
+    ]
 
     logger.info(
         "Processing {} titles in {} batches (concurrency={})".format(
@@ -722,65 +933,83 @@ def process_titles(
         )
     )
 
-    total_written = 0
-    failed_batches = 0
+    def failed_title_ids(result):
+        ids = list(result["title_ids"])
+        for tid in result["title_ids"]:
+            ids.extend(duplicates.get(keys.get(tid), ()))
+        return ids
+
+    client = get_llm_client()
 
     if concurrency == 1:
         # Sequential processing
         for batch_info in batches:
             batch, batch_num, total = batch_info
             logger.info("Batch {}/{}: {} titles".format(batch_num, total, len(batch)))
-            result = process_batch_worker(batch_info)
+            result = client.submit(process_batch_worker(batch_info)).result()
             if result["results"]:
-                normalize_batch_signals(result["results"], conn)
-                written = write_to_db(conn, result["results"])
+                written = write_batch_result(conn, result, keys, duplicates)
                 total_written += written
                 logger.info("  Wrote {} labels+signals".format(written))
             if result["error"]:
                 failed_batches += 1
-                increment_api_error_count(conn, result["title_ids"])
-    else:
-        # Concurrent processing
-        with ThreadPoolExecutor(max_workers=concurrency) as executor:
-            futures = {
-                executor.submit(process_batch_worker, batch_info): batch_info[1]
-                for batch_info in batches
-            }
+                increment_api_error_count(conn, failed_title_ids(result))
+    elif batches:
+        # Concurrent processing: in-flight count is up to the shared client
+        client.limiter.seed(concurrency)
+        futures = {
+            client.submit(process_batch_worker(batch_info)): batch_info[1]
+            for batch_info in batches
+        }
 
-            for future in as_completed(futures):
-                batch_num = futures[future]
-                result = future.result()
-                if result["results"]:
-                    normalize_batch_signals(result["results"], conn)
-                    written = write_to_db(conn, result["results"])
-                    total_written += written
-                    logger.info(
-                        "Batch {}/{}: wrote {} labels+signals".format(
-                            batch_num, total_batches, written
-                        )
+        for future in as_completed(futures):
+            batch_num = futures[future]
+            result = future.result()
+            if result["results"]:
+                written = write_batch_result(conn, result, keys, duplicates)
+                total_written += written
+                logger.info(
+                    "Batch {}/{}: wrote {} labels+signals".format(
+                        batch_num, total_batches, written
                     )
-                if result["error"]:
-                    failed_batches += 1
-                    increment_api_error_count(conn, result["title_ids"])
+                )
+            if result["error"]:
+                failed_batches += 1
+                increment_api_error_count(conn, failed_title_ids(result))
 
     conn.close()
 
+    if use_cache:
+        log_cache_stats("labels", cache_hits, total_titles - cache_hits)
+
     logger.info(
-        "Completed: {} written, {} failed batches".format(total_written, failed_batches)
+        "Completed: {} written ({} from cache), {} failed batches "
+        "(LLM concurrency now {})".format(
+            total_written, cache_hits, failed_batches, client.limiter.limit
+        )
     )
     return {
-        "processed": len(titles),
+        "processed": total_titles,
         "written": total_written,
         "failed": failed_batches,
+        "cache_hits": cache_hits,
     }
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Extract labels and signals (v2)")
     parser.add_argument("--max-titles", type=int, default=200, help="Max titles")
-    parser.add_argument("--batch-size", type=int, default=25, help="Batch size")
     parser.add_argument(
-        "--concurrency", type=int, default=1, help="Concurrent batches (1-10)"
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Max titles per call (batches are packed to a token budget)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="1 = sequential; otherwise the starting concurrency (adapts)",
     )
     parser.add_argument("--centroid", type=str, help="Filter by centroid")
     parser.add_argument("--track", type=str, help="Filter by track")
@@ -789,6 +1018,11 @@ if __name__ == "__main__":
         action="store_true",
         help="Re-extract titles missing entity_countries",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Skip the label result cache (always call the LLM)",
+    )
 
     args = parser.parse_args()
 
@@ -799,6 +1033,7 @@ if __name__ == "__main__":
         track_filter=args.track,
         concurrency=args.concurrency,
         backfill_entity_countries=args.backfill_entity_countries,
+        use_cache=False if args.no_cache else None,
     )
 
     print(
@@ -18,7 +18,7 @@ import argparse
 import math
 import sys
 import uuid
-from collections import Counter
+from collections import Counter, defaultdict
 from pathlib import Path
 
 import psycopg2
@@ -30,6 +30,11 @@ if sys.platform == "win32":
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.config import config  # noqa: E402
+from core.near_duplicates import (  # noqa: E402
+    candidate_pairs,
+    dice_to_jaccard,
+    weighted_dice_pairs,
+)
 
 SAME_TRACK_THRESHOLD = 0.35
 CROSS_TRACK_THRESHOLD = 0.38
@@ -123,6 +128,28 @@ def dice(set_a, set_b):
     return 2 * len(set_a & set_b) / (len(set_a) + len(set_b))
 
 
+def score_candidates(events, score_threshold, tag_idf=None):
+    """Candidate pairs (i, j), i < j, for a tag/title score.
+
+    Both scores weight tag Dice and title Dice with weights summing to 1,
+    so a pair reaching score_threshold has tag Dice or title Dice at least
+    that high. Tags: exact inverted index on the IDF-weighted Dice that
+    compute_score uses. Title words: MinHash/LSH at the same threshold.
+    """
+    jaccard = dice_to_jaccard(score_threshold)
+    pairs = set(candidate_pairs([title_words(ev["title"]) for ev in events], jaccard))
+
+    def tag_weight(tag):
+        return tag_idf.get(tag, 1.0) if tag_idf else 1.0
+
+    pairs.update(
+        weighted_dice_pairs(
+            [set(ev["tags"] or ()) for ev in events], score_threshold, tag_weight
+        )
+    )
+    return sorted(pairs)
+
+
 def compute_score(ev_a, ev_b, tag_idf=None):
     """Return (score, tag_overlap) between two events."""
     tags_a = set(ev_a["tags"])
@@ -224,13 +251,19 @@ def chain_centroid_events(
     Events must be sorted by source_batch_count DESC (largest = best anchor).
     Same-track pairs use same_threshold, cross-track pairs use cross_threshold.
     If track_filter is set, only same-track comparisons are made.
+    Anchors come from MinHash/LSH candidate pairs (core.near_duplicates).
     """
     updates = []
     matches = []
 
+    lowest = same_threshold if track_filter else min(same_threshold, cross_threshold)
+    anchors_of = defaultdict(list)  # event index -> earlier candidate indexes
+    for a, b in score_candidates(events, lowest, tag_idf):
+        anchors_of[b].append(a)
+
     for i, ev in enumerate(events):
         best_score, best_overlap, best_match = 0, 0, None
-        for j in range(i):
+        for j in anchors_of.get(i, ()):
             anchor = events[j]
             same_track = anchor["track"] == ev["track"]
             if track_filter and not same_track:
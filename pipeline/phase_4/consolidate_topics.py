@@ -15,12 +15,10 @@ Usage:
 import argparse
 import os
 import sys
-import time
 import uuid
 from collections import defaultdict
 from pathlib import Path
 
-import httpx
 import psycopg2
 
 # Fix Windows console encoding (prevents charmap errors on non-ASCII data)
@@ -30,7 +28,9 @@ if sys.platform == "win32":
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.config import config
+from core.llm_client import get_llm_client
 from core.llm_utils import extract_json
+from core.near_duplicates import similar_pairs
 from core.prompts import (
     CATCHALL_RESCUE_SYSTEM_PROMPT,
     CATCHALL_RESCUE_USER_PROMPT,
@@ -168,56 +168,26 @@ def load_bucket_data(conn, ctm_id):
 
 def call_llm(system_prompt, user_prompt):
     """Call DeepSeek LLM with retry and return parsed JSON response."""
-    headers = {
-        "Authorization": "Bearer {}".format(config.deepseek_api_key),
-        "Content-Type": "application/json",
-    }
-    payload = {
-        "model": config.llm_model,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        "temperature": config.llm_temperature,
-        "max_tokens": 4000,
-    }
-
-    last_error = None
+    # Shared client: HTTP retries, rate limit, llm_stats and the result
+    # cache; unparseable answers are asked again here
+    client = get_llm_client()
     for attempt in range(config.llm_retry_attempts):
+        content, _ = client.chat_sync(
+            [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            phase="topic_consolidation",
+            temperature=config.llm_temperature,
+            max_tokens=4000,
+            validate=extract_json,
+        )
         try:
-            with httpx.Client(timeout=config.llm_timeout_seconds) as client:
-                response = client.post(
-                    "{}/chat/completions".format(config.deepseek_api_url),
-                    headers=headers,
-                    json=payload,
-                )
-
-                from core.llm_utils import check_rate_limit
-
-                if check_rate_limit(response):
-                    continue
-
-                if response.status_code != 200:
-                    raise RuntimeError(
-                        "LLM API error: {} {}".format(
-                            response.status_code, response.text[:200]
-                        )
-                    )
-
-                data = response.json()
-                content = data["choices"][0]["message"]["content"].strip()
-
             return extract_json(content)
-        except Exception as e:
-            last_error = e
-            if attempt < config.llm_retry_attempts - 1:
-                wait = config.llm_retry_backoff**attempt
-                print(
-                    "  LLM retry %d/%d after %.1fs: %s"
-                    % (attempt + 1, config.llm_retry_attempts, wait, e)
-                )
-                time.sleep(wait)
-    raise last_error
+        except ValueError as e:
+            if attempt == config.llm_retry_attempts - 1:
+                raise
+            print("  LLM retry %d/%d: %s" % (attempt + 1, config.llm_retry_attempts, e))
 
 
 def repair_event_ids(response, valid_ids):
@@ -339,33 +309,32 @@ def _find_merge_candidates(events, dice_threshold=0.35):
         text = ev.get("title") or ev.get("topic_core") or ""
         word_sets.append(_title_words(text))
 
+    def dice(i, j):
+        a, b = word_sets[i], word_sets[j]
+        return 2 * len(a & b) / (len(a) + len(b))
+
     is_candidate = set()
     is_anchor = set()
 
-    for i in range(n):
-        for j in range(i + 1, n):
-            a, b = word_sets[i], word_sets[j]
-            if not a or not b:
-                continue
-            dice = 2 * len(a & b) / (len(a) + len(b))
-            if dice >= dice_threshold:
-                ci = events[i]["count"] or 0
-                cj = events[j]["count"] or 0
-                imp_i = events[i].get("importance_score", 0) or 0
-                imp_j = events[j].get("importance_score", 0) or 0
-                # High-importance events strongly prefer anchor role
-                if imp_i - imp_j > 0.3:
-                    is_anchor.add(i)
-                    is_candidate.add(j)
-                elif imp_j - imp_i > 0.3:
-                    is_anchor.add(j)
-                    is_candidate.add(i)
-                elif ci >= cj:
-                    is_anchor.add(i)
-                    is_candidate.add(j)
-                else:
-                    is_anchor.add(j)
-                    is_candidate.add(i)
+    # MinHash/LSH candidates on large inputs, exact Dice check on each
+    for i, j, _ in similar_pairs(word_sets, dice_threshold, dice):
+        ci = events[i]["count"] or 0
+        cj = events[j]["count"] or 0
+        imp_i = events[i].get("importance_score", 0) or 0
+        imp_j = events[j].get("importance_score", 0) or 0
+        # High-importance events strongly prefer anchor role
+        if imp_i - imp_j > 0.3:
+            is_anchor.add(i)
+            is_candidate.add(j)
+        elif imp_j - imp_i > 0.3:
+            is_anchor.add(j)
+            is_candidate.add(i)
+        elif ci >= cj:
+            is_anchor.add(i)
+            is_candidate.add(j)
+        else:
+            is_anchor.add(j)
+            is_candidate.add(i)
 
     # An event that is similar to something larger is always a candidate,
     # even if it was also an anchor for something smaller.
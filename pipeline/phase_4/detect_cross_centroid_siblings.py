@@ -32,6 +32,7 @@ from core.config import config  # noqa: E402
 from pipeline.phase_4.chain_event_sagas import (  # noqa: E402
     build_tag_idf,
     dice,
+    score_candidates,
     title_words,
 )
 
@@ -126,15 +127,22 @@ def find_siblings(events_in_month, threshold=SIBLING_THRESHOLD):
     if len(centroid_ids) < 2:
         return []
 
-    # Compare events across different centroids
-    matches = []
-    for i, cid_a in enumerate(centroid_ids):
-        for cid_b in centroid_ids[i + 1 :]:
-            for ev_a in by_centroid[cid_a]:
-                for ev_b in by_centroid[cid_b]:
-                    score, tag_overlap = cross_centroid_score(ev_a, ev_b, tag_idf)
-                    if score >= threshold and tag_overlap >= MIN_TAG_OVERLAP:
-                        matches.append((ev_a, ev_b, score, tag_overlap))
+    # Compare events across different centroids: MinHash/LSH candidates over
+    # title words, exact inverted index over IDF-weighted tags; each pair is
+    # verified with the exact score
+    order = {cid: k for k, cid in enumerate(centroid_ids)}
+    events = [ev for cid in centroid_ids for ev in by_centroid[cid]]
+    scored = []
+    for i, j in score_candidates(events, threshold, tag_idf):
+        ev_a, ev_b = events[i], events[j]
+        if ev_a["centroid_id"] == ev_b["centroid_id"]:
+            continue
+        score, tag_overlap = cross_centroid_score(ev_a, ev_b, tag_idf)
+        if score >= threshold and tag_overlap >= MIN_TAG_OVERLAP:
+            key = (order[ev_a["centroid_id"]], order[ev_b["centroid_id"]], i, j)
+            scored.append((key, (ev_a, ev_b, score, tag_overlap)))
+    # Centroid-pair order, as the nested loops produced them
+    matches = [m for _, m in sorted(scored, key=lambda s: s[0])]
 
     # Group by best match per centroid (no transitive chaining).
     # For each event, find its best cross-centroid match. Then build groups
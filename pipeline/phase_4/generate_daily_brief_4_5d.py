@@ -21,7 +21,6 @@ from collections import defaultdict
 from datetime import timedelta
 from pathlib import Path
 
-import httpx
 import psycopg2
 
 if sys.platform == "win32":
@@ -31,8 +30,8 @@ if sys.platform == "win32":
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from core.config import DAILY_BRIEF_MIN_CLUSTERS, DAY_CLOSURE_UTC_HOUR, config
-from core.llm_logger import log_llm_call
-from core.llm_utils import async_check_rate_limit, extract_json, fix_role_hallucinations
+from core.llm_client import get_llm_client
+from core.llm_utils import extract_json, fix_role_hallucinations
 from core.prompts import DAILY_BRIEF_SYSTEM_PROMPT, DAILY_BRIEF_USER_PROMPT
 
 LLM_CONCURRENCY = 4
@@ -120,32 +119,18 @@ def format_yesterday_block(yday: list) -> str:
 
 
 async def call_llm(payload: dict) -> dict:
-    import time as _time
-
-    headers = {
-        "Authorization": "Bearer %s" % config.deepseek_api_key,
-        "Content-Type": "application/json",
-    }
-    async with httpx.AsyncClient(timeout=120) as client:
-        for attempt in range(3):
-            t0 = _time.time()
-            response = await client.post(
-                "%s/chat/completions" % config.deepseek_api_url,
-                headers=headers,
-                json=payload,
-            )
-            if await async_check_rate_limit(response, attempt):
-                continue
-            if response.status_code != 200:
-                raise RuntimeError(
-                    "LLM error %d: %s" % (response.status_code, response.text[:200])
-                )
-            data = response.json()
-            log_llm_call(
-                "daily_brief", data.get("usage"), int((_time.time() - t0) * 1000)
-            )
-            return extract_json(data["choices"][0]["message"]["content"])
-        raise RuntimeError("LLM retries exhausted")
+    # Shared client: retries, rate limit, llm_stats and the result cache
+    # (an unchanged day of stories gets the stored brief)
+    content, _ = await get_llm_client().chat_from(
+        payload["messages"],
+        phase="daily_brief",
+        model=payload["model"],
+        temperature=payload.get("temperature"),
+        max_tokens=payload.get("max_tokens"),
+        timeout=120,
+        validate=extract_json,
+    )
+    return extract_json(content)
 
 
 async def generate_brief(
@@ -12,12 +12,16 @@ Output: {title, summary, tags} stored in events_v3
 
 import argparse
 import asyncio
+import queue
 import sys
+import threading
+import time
 from collections import Counter
 from pathlib import Path
 
 import httpx
 import psycopg2
+from psycopg2.extras import execute_values
 
 # Fix Windows console encoding (prevents charmap errors on non-ASCII data)
 if sys.platform == "win32":
@@ -26,8 +30,12 @@ if sys.platform == "win32":
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.config import config
+from core.llm_cache import get_llm_cache
+from core.llm_client import LatencyHistogram, get_llm_client
 from core.llm_utils import extract_json, fix_role_hallucinations
 from core.prompts import (
+    EVENT_SUMMARY_DELTA_USER_PROMPT,
+    EVENT_SUMMARY_PROMPT_DELTA,
     EVENT_SUMMARY_PROMPT_MAXI,
     EVENT_SUMMARY_PROMPT_MEDIUM,
     EVENT_SUMMARY_PROMPT_MINI,
@@ -38,6 +46,16 @@ from core.prompts import (
 
 MIN_SUMMARY_SOURCES = 5  # Below this: title only, no summary
 CORE_TITLE_COUNT = 10  # Max titles to send to LLM (centrality-selected)
+MAX_HEADLINES = 200  # Newest headlines per event loaded as the title sample
+PAYLOAD_BATCH = 50  # Events assembled per set-based payload fetch
+LLM_PHASE = "event_summary"  # llm_stats phase name
+
+# Delta summaries (grown events): previous summary + only the new headlines.
+# Full rewrite instead when the event has grown past this multiple of its
+# last full rewrite (see summary_mode)
+DELTA_MAX_GROWTH = 3.0
+# Placeholder labels from clustering, never a real summary
+MECHANICAL_MARKERS = ("->", "titles)", "SPIKE]")
 
 
 def select_core_titles(titles, max_core=CORE_TITLE_COUNT):
@@ -218,91 +236,205 @@ async def translate_title_de(title: str) -> str | None:
         return None
 
 
-def get_backbone_signals(conn, event_id: str) -> dict:
-    """Compute backbone signals (what grouped these headlines) from title_labels.
+# Backbone signal kinds -> how many top values each keeps
+BACKBONE_TOP = {
+    "persons": 3,
+    "orgs": 3,
+    "commodities": 2,
+    "policies": 2,
+    "places": 2,
+}
+
+_BACKBONE_UNNEST = " UNION ALL ".join(
+    "SELECT '%s'::text, unnest(tl.%s)" % (kind, kind) for kind in BACKBONE_TOP
+)
+
+
+def get_backbone_signals_batch(cur, event_ids: list) -> dict:
+    """Backbone signals (what grouped these headlines) for many events.
+
+    Counted over ALL titles of each event (not just the headline sample),
+    top values per kind by frequency.
 
-    Returns signals with their frequency counts, sorted by importance.
+    Returns: {event_id: {kind: [(value, count), ...]}}
     """
-    with conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT tl.persons, tl.orgs, tl.commodities, tl.policies, tl.places
+    cur.execute(
+        """
+        WITH sig AS (
+            SELECT evt.event_id, x.kind, x.value, COUNT(*) AS cnt
             FROM event_v3_titles evt
             JOIN title_labels tl ON tl.title_id = evt.title_id
-            WHERE evt.event_id = %s
-            """,
-            (event_id,),
+            CROSS JOIN LATERAL (%s) x(kind, value)
+            WHERE evt.event_id = ANY(%%s::uuid[]) AND x.value IS NOT NULL
+            GROUP BY evt.event_id, x.kind, x.value
+        ), ranked AS (
+            SELECT event_id, kind, value, cnt,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY event_id, kind ORDER BY cnt DESC, value
+                   ) AS rnk
+            FROM sig
         )
-
-        persons = Counter()
-        orgs = Counter()
-        commodities = Counter()
-        policies = Counter()
-        places = Counter()
-
-        for row in cur.fetchall():
-            if row[0]:
-                for p in row[0]:
-                    persons[p] += 1
-            if row[1]:
-                for o in row[1]:
-                    orgs[o] += 1
-            if row[2]:
-                for c in row[2]:
-                    commodities[c] += 1
-            if row[3]:
-                for p in row[3]:
-                    policies[p] += 1
-            if row[4]:
-                for p in row[4]:
-                    places[p] += 1
-
-        return {
-            "persons": persons.most_common(3),
-            "orgs": orgs.most_common(3),
-            "commodities": commodities.most_common(2),
-            "policies": policies.most_common(2),
-            "places": places.most_common(2),
-        }
+        SELECT event_id::text, kind, value, cnt::int
+        FROM ranked
+        WHERE rnk <= %%s
+        ORDER BY event_id, kind, rnk
+        """
+        % _BACKBONE_UNNEST,
+        (event_ids, max(BACKBONE_TOP.values())),
+    )
+    out = {eid: {kind: [] for kind in BACKBONE_TOP} for eid in event_ids}
+    for event_id, kind, value, count in cur.fetchall():
+        if len(out[event_id][kind]) < BACKBONE_TOP[kind]:
+            out[event_id][kind].append((value, count))
+    return out
 
 
-def get_title_signals(conn, event_id: str) -> dict:
-    """Get signals for each title in an event.
+def get_title_samples_batch(cur, event_ids: list, max_titles: int) -> dict:
+    """Newest `max_titles` headlines per event with feed country and
+    per-title signals, plus date range / size over ALL titles.
 
-    Returns: {title_id: set of all signals for that title}
+    Returns: {event_id: {"titles", "title_countries", "title_signals",
+                         "first_date", "last_date", "title_count"}}
     """
-    with conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT evt.title_id, t.title_display,
-                   tl.persons, tl.orgs, tl.commodities, tl.policies, tl.places
+    cur.execute(
+        """
+        WITH sample AS (
+            SELECT evt.event_id, evt.title_id, t.title_display, t.feed_id,
+                   ROW_NUMBER() OVER w AS rnk,
+                   COUNT(*) OVER e AS title_count,
+                   MIN(DATE(t.pubdate_utc)) OVER e AS first_date,
+                   MAX(DATE(t.pubdate_utc)) OVER e AS last_date
             FROM event_v3_titles evt
             JOIN titles_v3 t ON t.id = evt.title_id
-            LEFT JOIN title_labels tl ON tl.title_id = evt.title_id
-            WHERE evt.event_id = %s
-            """,
-            (event_id,),
+            WHERE evt.event_id = ANY(%s::uuid[])
+            WINDOW w AS (PARTITION BY evt.event_id
+                         ORDER BY t.pubdate_utc DESC, evt.title_id),
+                   e AS (PARTITION BY evt.event_id)
         )
-
-        result = {}
-        for row in cur.fetchall():
-            title_id, title_display, persons, orgs, commodities, policies, places = row
-            signals = set()
-            if persons:
-                signals.update(persons)
-            if orgs:
-                signals.update(orgs)
-            if commodities:
-                signals.update(commodities)
-            if policies:
-                signals.update(policies)
-            if places:
-                signals.update(places)
-            result[title_id] = {
-                "title": title_display,
-                "signals": signals,
+        SELECT s.event_id::text, s.title_id, s.title_display,
+               UPPER(f.country_code),
+               tl.persons, tl.orgs, tl.commodities, tl.policies, tl.places,
+               s.title_count, s.first_date, s.last_date
+        FROM sample s
+        LEFT JOIN feeds f ON f.id = s.feed_id
+        LEFT JOIN title_labels tl ON tl.title_id = s.title_id
+        WHERE s.rnk <= %s
+        ORDER BY s.event_id, s.rnk
+        """,
+        (event_ids, max_titles),
+    )
+    out = {}
+    for row in cur.fetchall():
+        event_id, title_id, title, country = row[:4]
+        title_count, first_date, last_date = row[9:]
+        sample = out.get(event_id)
+        if sample is None:
+            sample = out[event_id] = {
+                "titles": [],
+                "title_countries": [],
+                "title_signals": {},
+                "first_date": first_date,
+                "last_date": last_date,
+                "title_count": title_count,
             }
-        return result
+        signals = set()
+        for values in row[4:9]:
+            if values:
+                signals.update(values)
+        sample["titles"].append(title)
+        sample["title_countries"].append(country)
+        sample["title_signals"][title_id] = {"title": title, "signals": signals}
+    return out
+
+
+def get_new_titles_batch(cur, new_counts: dict) -> dict:
+    """Headlines linked to each event since its last summary: the newest
+    `n` links by event_v3_titles.created_at.
+
+    Args:
+        new_counts: {event_id: n}
+
+    Returns: {event_id: [title, ...]}, newest first
+    """
+    if not new_counts:
+        return {}
+    cur.execute(
+        """
+        WITH want AS (
+            SELECT * FROM unnest(%s::uuid[], %s::int[]) AS w(event_id, n)
+        ), ranked AS (
+            SELECT evt.event_id, t.title_display, w.n,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY evt.event_id
+                       ORDER BY evt.created_at DESC, t.pubdate_utc DESC
+                   ) AS rnk
+            FROM want w
+            JOIN event_v3_titles evt ON evt.event_id = w.event_id
+            JOIN titles_v3 t ON t.id = evt.title_id
+        )
+        SELECT event_id::text, title_display
+        FROM ranked
+        WHERE rnk <= n
+        ORDER BY event_id, rnk
+        """,
+        (list(new_counts), list(new_counts.values())),
+    )
+    out = {}
+    for event_id, title in cur.fetchall():
+        out.setdefault(event_id, []).append(title)
+    return out
+
+
+# (system_prompt, max_tokens) per size tier, smallest first
+SUMMARY_TIERS = (
+    (EVENT_SUMMARY_PROMPT_MINI, 300),
+    (EVENT_SUMMARY_PROMPT_MEDIUM, 500),
+    (EVENT_SUMMARY_PROMPT_MAXI, 800),
+)
+
+
+def summary_tier_index(num_titles: int) -> int:
+    """Size tier of an event with `num_titles` sources (SUMMARY_TIERS index)"""
+    if num_titles <= 10:
+        return 0
+    if num_titles <= 50:
+        return 1
+    return 2
+
+
+def summary_tier(num_titles: int) -> tuple:
+    """(system_prompt, max_tokens) for a full summary of `num_titles` sources"""
+    return SUMMARY_TIERS[summary_tier_index(num_titles)]
+
+
+def summary_mode(event: dict) -> str:
+    """'delta' or 'full' for an event that needs a summary.
+
+    Delta (previous summary + new headlines only) applies when the event
+    has a real summary and merely grew. Full rewrite when:
+      - there is no title/summary yet, or the summary is a mechanical label
+      - the previous source count is unknown, or the event did not grow
+      - the event is title-only (< MIN_SUMMARY_SOURCES)
+      - the size tier (and so the target length) changed since the summary
+      - it has grown past DELTA_MAX_GROWTH x its last full rewrite
+    process_event also falls back to full when a delta fails or the model
+    says the new headlines are a different story.
+    """
+    summary = event.get("label")
+    old = event.get("summary_source_count") or 0
+    full = event.get("summary_full_count") or old
+    count = event["count"]
+    if not event.get("title") or not summary:
+        return "full"
+    if any(marker in summary for marker in MECHANICAL_MARKERS):
+        return "full"
+    if old <= 0 or count <= old or count < MIN_SUMMARY_SOURCES:
+        return "full"
+    if summary_tier_index(count) != summary_tier_index(old):
+        return "full"
+    if count > DELTA_MAX_GROWTH * full:
+        return "full"
+    return "delta"
 
 
 def is_combo_headline(title: str) -> bool:
@@ -340,8 +472,8 @@ def filter_outlier_titles(
 
     Args:
         titles: List of title strings
-        title_signals: Dict from get_title_signals
-        backbone_signals: Dict from get_backbone_signals
+        title_signals: Dict from get_title_samples_batch
+        backbone_signals: Dict from get_backbone_signals_batch
         min_core_freq: Minimum frequency for a signal to be "core"
 
     Returns:
@@ -458,7 +590,7 @@ def signals_to_tags(signals: dict, min_freq: int = 2) -> list:
     return tags[:8]  # Limit to 8 tags
 
 
-def get_events_needing_summaries(
+def load_candidates(
     conn,
     max_events: int = None,
     ctm_id: str = None,
@@ -468,7 +600,7 @@ def get_events_needing_summaries(
     bilateral_only: bool = False,
     force_regenerate: bool = False,
 ) -> list:
-    """Fetch events that need title/summary generation.
+    """Events that need title/summary generation (rows only, no payload).
 
     Args:
         conn: Database connection
@@ -479,6 +611,11 @@ def get_events_needing_summaries(
         domestic_only: Only include events with bucket_key IS NULL
         bilateral_only: Only include events with bucket_key IS NOT NULL
         force_regenerate: Regenerate even if summary exists
+
+    Returns:
+        [(event_id, ctm_id, label, bucket_key, source_batch_count, date,
+          first_seen, title, summary_source_count, summary_full_count)],
+        grouped by CTM
     """
     with conn.cursor() as cur:
         conditions = []
@@ -528,7 +665,8 @@ def get_events_needing_summaries(
 
         query = """
             SELECT e.id, e.ctm_id, e.summary as label, e.bucket_key, e.source_batch_count,
-                   e.date, e.first_seen
+                   e.date, e.first_seen, e.title, e.summary_source_count,
+                   COALESCE(e.summary_full_count, e.summary_source_count)
             FROM events_v3 e
             JOIN ctm c ON c.id = e.ctm_id
             WHERE %s
@@ -540,72 +678,117 @@ def get_events_needing_summaries(
         )
 
         cur.execute(query, tuple(params) if params else None)
+        return cur.fetchall()
 
-        events = []
-        for row in cur.fetchall():
-            event_id, ctm_id_val, label, bucket_key, count, date, first_seen = row
-
-            # Fetch ALL titles for this event with dates and feed country
-            cur.execute(
-                """
-                SELECT t.title_display, DATE(t.pubdate_utc),
-                       UPPER(f.country_code)
-                FROM event_v3_titles evt
-                JOIN titles_v3 t ON evt.title_id = t.id
-                LEFT JOIN feeds f ON t.feed_id = f.id
-                WHERE evt.event_id = %s
-                ORDER BY t.pubdate_utc DESC
-                """,
-                (event_id,),
-            )
-            rows = cur.fetchall()
-            titles = [r[0] for r in rows]
-            dates = [r[1] for r in rows if r[1]]
-            title_countries = [r[2] for r in rows]
-
-            # Get backbone signals
-            backbone = get_backbone_signals(conn, event_id)
 
-            # Get per-title signals for outlier detection
-            title_signals = get_title_signals(conn, event_id)
+def iter_event_payloads(
+    conn, candidates: list, batch_size: int = PAYLOAD_BATCH, delta: bool = False
+):
+    """Yield lists of ready-to-summarize events, `batch_size` candidates at
+    a time: three set-based queries per batch (headline samples with
+    signals, backbone signals, centroid iso_codes) instead of three per
+    event.
 
+    With `delta`, each event gets a "mode" from summary_mode(); delta
+    events also carry "new_titles" (one more query per batch).
+    """
+    iso_codes = {}  # ctm_id -> centroid iso_codes, shared across batches
+    for i in range(0, len(candidates), batch_size):
+        rows = candidates[i : i + batch_size]
+        event_ids = [str(r[0]) for r in rows]
+        with conn.cursor() as cur:
+            samples = get_title_samples_batch(cur, event_ids, MAX_HEADLINES)
+            backbones = get_backbone_signals_batch(cur, event_ids)
+
+            new_ctms = list({str(r[1]) for r in rows} - set(iso_codes))
+            if new_ctms:
+                cur.execute(
+                    """SELECT c.id::text, cv.iso_codes FROM ctm c
+                       JOIN centroids_v3 cv ON cv.id = c.centroid_id
+                       WHERE c.id = ANY(%s::uuid[])""",
+                    (new_ctms,),
+                )
+                for cid, codes in cur.fetchall():
+                    iso_codes[cid] = set(codes) if codes else set()
+        events = []
+        for row in rows:
+            event_id, ctm_id_val, label, bucket_key, count, date, first_seen = row[:7]
+            title, summary_source_count, summary_full_count = row[7:10]
+            sample = samples.get(str(event_id)) or {
+                "titles": [],
+                "title_countries": [],
+                "title_signals": {},
+                "first_date": None,
+                "last_date": None,
+                "title_count": 0,
+            }
+            title_dates = [d for d in (sample["first_date"], sample["last_date"]) if d]
             events.append(
                 {
                     "id": event_id,
                     "ctm_id": ctm_id_val,
                     "label": label,
                     "bucket_key": bucket_key,
-                    "count": count or len(titles),
-                    "titles": titles,
-                    "title_countries": title_countries,
+                    "count": count or sample["title_count"],
+                    "titles": sample["titles"],
+                    "title_countries": sample["title_countries"],
                     "date": date,
                     "first_seen": first_seen,
-                    "title_dates": dates,
-                    "backbone_signals": backbone,
-                    "title_signals": title_signals,
+                    "title_dates": title_dates,
+                    "backbone_signals": backbones[str(event_id)],
+                    "title_signals": sample["title_signals"],
+                    # Both domestic and bilateral events get centroid countries
+                    # so [D]/[F] tagging works for all event types
+                    "centroid_countries": iso_codes.get(str(ctm_id_val), set()),
+                    "title": title,
+                    "summary_source_count": summary_source_count,
+                    "summary_full_count": summary_full_count,
+                    "mode": "full",
                 }
             )
 
-        # Look up centroid iso_codes for domestic perspective detection
-        ctm_iso_codes = {}
-        ctm_ids_seen = set(e["ctm_id"] for e in events)
-        for cid in ctm_ids_seen:
-            cur.execute(
-                """SELECT cv.iso_codes FROM ctm c
-                   JOIN centroids_v3 cv ON cv.id = c.centroid_id
-                   WHERE c.id = %s""",
-                (cid,),
-            )
-            row = cur.fetchone()
-            if row and row[0]:
-                ctm_iso_codes[cid] = set(row[0])
+        if delta:
+            new_counts = {}
+            for event in events:
+                event["mode"] = summary_mode(event)
+                if event["mode"] == "delta":
+                    new_counts[str(event["id"])] = min(
+                        event["count"] - event["summary_source_count"], MAX_HEADLINES
+                    )
+            with conn.cursor() as cur:
+                new_titles = get_new_titles_batch(cur, new_counts)
+            for event in events:
+                if event["mode"] == "delta":
+                    event["new_titles"] = new_titles.get(str(event["id"]), [])
+                    if not event["new_titles"]:
+                        event["mode"] = "full"
+        conn.commit()  # end the read transaction between batches
+        yield events
 
-        for event in events:
-            # Both domestic and bilateral events get centroid countries
-            # so [D]/[F] tagging works for all event types
-            event["centroid_countries"] = ctm_iso_codes.get(event["ctm_id"], set())
 
-        return events
+def get_events_needing_summaries(
+    conn,
+    max_events: int = None,
+    ctm_id: str = None,
+    centroid_id: str = None,
+    track: str = None,
+    domestic_only: bool = False,
+    bilateral_only: bool = False,
+    force_regenerate: bool = False,
+) -> list:
+    """Fetch events that need title/summary generation, with payloads
+    (see load_candidates for the arguments)."""
+    candidates = load_candidates(
+        conn,
+        max_events,
+        ctm_id,
+        centroid_id,
+        track=track,
+        domestic_only=domestic_only,
+        bilateral_only=bilateral_only,
+        force_regenerate=force_regenerate,
+    )
+    return [e for batch in iter_event_payloads(conn, candidates) for e in batch]
 
 
 async def generate_event_data(
@@ -731,82 +914,262 @@ async def generate_event_data(
             titles_text=titles_text + outlier_note + perspective_note,
             backbone_signals=backbone_text,
         )
-        if num_titles <= 10:
-            system_prompt = EVENT_SUMMARY_PROMPT_MINI
-            max_tokens = 300
-        elif num_titles <= 50:
-            system_prompt = EVENT_SUMMARY_PROMPT_MEDIUM
-            max_tokens = 500
-        else:
-            system_prompt = EVENT_SUMMARY_PROMPT_MAXI
-            max_tokens = 800
+        system_prompt, max_tokens = summary_tier(num_titles)
+
+    content = await call_llm(system_prompt, user_prompt, max_tokens)
+    return parse_summary(content)
+
+
+async def call_llm(system_prompt: str, user_prompt: str, max_tokens: int) -> str:
+    """One summary call; returns the raw message content."""
+    # Shared client (core/llm_client.py) runs on its own loop: retries,
+    # rate limit, adaptive in-flight cap, llm_stats + latency histograms
+    client = get_llm_client()
+    content, _ = await asyncio.wrap_future(
+        client.submit(
+            client.chat(
+                [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                phase=LLM_PHASE,
+                temperature=0.4,
+                max_tokens=max_tokens,
+                timeout=90,
+                validate=extract_json,
+            )
+        )
+    )
+    return content
 
-    headers = {
-        "Authorization": "Bearer %s" % config.deepseek_api_key,
-        "Content-Type": "application/json",
-    }
 
-    payload = {
-        "model": config.llm_model,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ],
-        "temperature": 0.4,
-        "max_tokens": max_tokens,
+def parse_summary(content: str) -> dict:
+    """{title, summary, coherent, unchanged} from a summary response.
+
+    The prompts ask for title_en/summary_en; plain title/summary is
+    accepted too.
+    """
+    result = extract_json(content)
+    title = result.get("title_en") or result.get("title") or ""
+    summary = result.get("summary_en") or result.get("summary") or ""
+
+    # Fix LLM training-data hallucinations (e.g. "Former President Trump")
+    return {
+        "title": fix_role_hallucinations(title).strip(),
+        "summary": fix_role_hallucinations(summary).strip(),
+        "coherent": result.get("coherent", True),
+        "unchanged": bool(result.get("unchanged")),
     }
 
-    from core.llm_utils import async_check_rate_limit
 
-    async with httpx.AsyncClient(timeout=90) as client:
-        for _attempt in range(3):
-            response = await client.post(
-                "%s/chat/completions" % config.deepseek_api_url,
-                headers=headers,
-                json=payload,
-            )
+async def generate_event_delta(event: dict) -> dict:
+    """Update a grown event's summary from its previous summary plus only
+    the headlines added since (see summary_mode for when this applies).
 
-            if await async_check_rate_limit(response, _attempt):
-                continue
+    Returns parse_summary() output; "unchanged" means keep the old text.
+    """
+    new_titles = event["new_titles"]
+    core = [new_titles[i] for i in select_core_titles(new_titles)]
+    titles_text = "\n".join("- %s" % t for t in core)
+    if len(new_titles) > len(core):
+        titles_text += "\n... and %d more new headlines" % (len(new_titles) - len(core))
+
+    user_prompt = EVENT_SUMMARY_DELTA_USER_PROMPT.format(
+        title=event["title"],
+        old_count=event["summary_source_count"],
+        summary=event["label"],
+        new_count=event["count"] - event["summary_source_count"],
+        num_titles=event["count"],
+        titles_text=titles_text,
+        backbone_signals=format_backbone_signals(event["backbone_signals"]),
+    )
+    _, max_tokens = summary_tier(event["count"])
+    content = await call_llm(EVENT_SUMMARY_PROMPT_DELTA, user_prompt, max_tokens)
+    return parse_summary(content)
 
-            if response.status_code != 200:
-                raise Exception(
-                    "LLM API error: %d - %s" % (response.status_code, response.text)
-                )
 
-            break
+class SummaryWriter:
+    """Dedicated DB writer thread for finished events.
 
-        data = response.json()
-        content = data["choices"][0]["message"]["content"].strip()
+    LLM workers hand rows over with put_*(); the thread owns its own
+    connection and applies them `batch_size` at a time (one UPDATE ... FROM
+    VALUES per kind and one commit per batch), or after `flush_sec` when
+    fewer are pending. A failed batch is retried row by row so one bad row
+    only loses itself.
+    """
 
-        result = extract_json(content)
+    # New title/summary. summary_full_count moves only on full rewrites
+    SUMMARY_SQL = """
+        UPDATE events_v3 e
+        SET title = v.title,
+            summary = v.summary,
+            tags = v.tags,
+            first_seen = v.first_seen,
+            date = v.date,
+            summary_source_count = e.source_batch_count,
+            summary_full_count = CASE WHEN v.full THEN e.source_batch_count
+                                      ELSE COALESCE(e.summary_full_count,
+                                                    e.summary_source_count)
+                                 END,
+            updated_at = NOW()
+        FROM (VALUES %s) AS v(id, title, summary, tags, first_seen, date, full)
+        WHERE e.id = v.id
+    """
+    SUMMARY_TEMPLATE = "(%s::uuid, %s, %s, %s::text[], %s::date, %s::date, %s::boolean)"
+
+    # LLM coherence check failed: demote to catchall
+    CATCHALL_SQL = """
+        UPDATE events_v3 e
+        SET is_catchall = TRUE, title = v.title, summary = NULL,
+            updated_at = NOW()
+        FROM (VALUES %s) AS v(id, title)
+        WHERE e.id = v.id
+    """
+    CATCHALL_TEMPLATE = "(%s::uuid, %s)"
+
+    # Delta found nothing new: text stays, only the growth baseline moves
+    TOUCH_SQL = """
+        UPDATE events_v3 e
+        SET summary_source_count = e.source_batch_count
+        FROM (VALUES %s) AS v(id)
+        WHERE e.id = v.id
+    """
+    TOUCH_TEMPLATE = "(%s::uuid)"
+
+    def __init__(self, batch_size: int, flush_sec: float = 5.0):
+        self.batch_size = max(1, batch_size)
+        self.flush_sec = flush_sec
+        self.written = 0
+        self.failed = 0
+        self._statements = {
+            "summary": (self.SUMMARY_SQL, self.SUMMARY_TEMPLATE),
+            "catchall": (self.CATCHALL_SQL, self.CATCHALL_TEMPLATE),
+            "touch": (self.TOUCH_SQL, self.TOUCH_TEMPLATE),
+        }
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="4.5a-writer", daemon=True
+        )
+        self._thread.start()
 
-        # Fix LLM training-data hallucinations (e.g. "Former President Trump")
-        title = fix_role_hallucinations(result.get("title", "")).strip()
-        summary = fix_role_hallucinations(result.get("summary", "")).strip()
+    def put_summary(self, event_id, title, summary, tags, first_seen, date, full=True):
+        self._queue.put(
+            (
+                "summary",
+                (str(event_id), title, summary, tags, first_seen, date, full),
+            )
+        )
 
-        return {
-            "title": title,
-            "summary": summary,
-        }
+    def put_catchall(self, event_id, title):
+        self._queue.put(("catchall", (str(event_id), title)))
+
+    def put_touch(self, event_id):
+        self._queue.put(("touch", (str(event_id),)))
+
+    def close(self) -> None:
+        """Flush what is pending and stop the thread"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        conn = psycopg2.connect(**config.db_connect_kwargs())
+        pending = []
+        done = False
+        try:
+            while not done:
+                idle = False
+                try:
+                    item = self._queue.get(timeout=self.flush_sec)
+                    if item is None:
+                        done = True
+                    else:
+                        pending.append(item)
+                except queue.Empty:
+                    idle = True
+                if pending and (done or idle or len(pending) >= self.batch_size):
+                    self._flush(conn, pending)
+                    pending = []
+        finally:
+            conn.close()
+
+    def _flush(self, conn, items):
+        try:
+            for kind in self._statements:
+                self._apply(conn, kind, [row for k, row in items if k == kind])
+            conn.commit()
+            self.written += len(items)
+            return
+        except Exception as e:
+            conn.rollback()
+            print(
+                "  ! Write batch of %d failed (%s), retrying per row" % (len(items), e)
+            )
+        for kind, row in items:
+            try:
+                self._apply(conn, kind, [row])
+                conn.commit()
+                self.written += 1
+            except Exception as e:
+                conn.rollback()
+                self.failed += 1
+                print("  X Write failed for %s: %s" % (row[0][:8], e))
+
+    def _apply(self, conn, kind, rows):
+        if not rows:
+            return
+        sql, template = self._statements[kind]
+        with conn.cursor() as cur:
+            execute_values(cur, sql, rows, template=template, page_size=len(rows))
 
 
 async def process_event(
-    semaphore: asyncio.Semaphore,
-    conn,
+    writer: SummaryWriter,
     event: dict,
-) -> bool:
-    """Process a single event with semaphore for concurrency control."""
-    async with semaphore:
-        try:
-            if not event["titles"]:
-                print("  Skipping %s: no titles" % event["id"][:8])
-                return False
+    latency: LatencyHistogram = None,
+):
+    """Summarize one event and hand the result to the writer thread.
+
+    Delta events (event["mode"], see summary_mode) try the previous summary
+    plus new headlines first and fall back to a full rewrite. On return
+    event["mode"] says what was done: full, delta or unchanged.
 
-            backbone = event.get("backbone_signals", {})
-            title_signals = event.get("title_signals", {})
-            title_only = event["count"] < MIN_SUMMARY_SOURCES
+    Returns the EN title on success, None on error.
+    """
+    try:
+        if not event["titles"]:
+            print("  Skipping %s: no titles" % str(event["id"])[:8])
+            return None
 
+        backbone = event.get("backbone_signals", {})
+        title_signals = event.get("title_signals", {})
+        title_only = event["count"] < MIN_SUMMARY_SOURCES
+
+        result = None
+        if event.get("mode") == "delta":
+            t0 = time.monotonic()
+            try:
+                result = await generate_event_delta(event)
+            except Exception as e:
+                print(
+                    "  ~ Delta failed for %s (%s), full rewrite"
+                    % (str(event["id"])[:8], e)
+                )
+            if latency is not None:
+                latency.observe(time.monotonic() - t0)
+
+            if result and result["unchanged"]:
+                writer.put_touch(event["id"])
+                print("  [%3d] unchanged: %s" % (event["count"], event["title"][:50]))
+                event["mode"] = "unchanged"
+                return event["title"]
+            if result and not (result["coherent"] and result["title"]):
+                # New headlines read as another story: judge the whole event
+                result = None
+            if result is None:
+                event["mode"] = "full"
+
+        if result is None:
+            t0 = time.monotonic()
             result = await generate_event_data(
                 event["titles"],
                 backbone,
@@ -816,77 +1179,64 @@ async def process_event(
                 title_countries=event.get("title_countries", []),
                 title_only=title_only,
             )
+            if latency is not None:
+                latency.observe(time.monotonic() - t0)
+
+        title = result["title"]
+        summary = result["summary"] if not title_only else None
+
+        # LLM coherence check: demote incoherent clusters to catchall.
+        # Off by default (V3_P45A_INCOHERENT_TO_CATCHALL): "coherent" was
+        # never parsed before, so this would newly demote titled events.
+        if config.v3_p45a_incoherent_to_catchall and not result.get("coherent", True):
+            writer.put_catchall(event["id"], title)
+            print("  [%3d] INCOHERENT -> catchall: %s" % (event["count"], title[:50]))
+            return title
 
-            title = result["title"]
-            summary = result["summary"] if not title_only else None
-
-            # LLM coherence check: demote incoherent clusters to catchall
-            if not result.get("coherent", True):
-                with conn.cursor() as cur:
-                    cur.execute(
-                        "UPDATE events_v3 SET is_catchall = TRUE, "
-                        "title = %s, summary = NULL, updated_at = NOW() "
-                        "WHERE id = %s",
-                        (title, event["id"]),
-                    )
-                conn.commit()
-                print(
-                    "  [%3d] INCOHERENT -> catchall: %s" % (event["count"], title[:50])
-                )
-                return title
-
-            # Derive tags from backbone signals (the actual clustering anchors)
-            tags = signals_to_tags(backbone, min_freq=2)
-
-            # Calculate date range from titles
-            title_dates = event.get("title_dates", [])
-            if title_dates:
-                first_seen = min(title_dates)
-                last_seen = max(title_dates)
-            else:
-                first_seen = event.get("first_seen") or event.get("date")
-                last_seen = event.get("date")
+        # Derive tags from backbone signals (the actual clustering anchors)
+        tags = signals_to_tags(backbone, min_freq=2)
 
-            # Update event (title_de set later in batch)
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    UPDATE events_v3
-                    SET title = %s,
-                        summary = %s,
-                        tags = %s,
-                        first_seen = %s,
-                        date = %s,
-                        summary_source_count = source_batch_count,
-                        updated_at = NOW()
-                    WHERE id = %s
-                    """,
-                    (
-                        title,
-                        summary,
-                        tags,
-                        first_seen,
-                        last_seen,
-                        event["id"],
-                    ),
-                )
-            conn.commit()
+        # Calculate date range from titles
+        title_dates = event.get("title_dates", [])
+        if title_dates:
+            first_seen = min(title_dates)
+            last_seen = max(title_dates)
+        else:
+            first_seen = event.get("first_seen") or event.get("date")
+            last_seen = event.get("date")
+
+        # Update event (title_de set later in batch)
+        writer.put_summary(
+            event["id"],
+            title,
+            summary,
+            tags,
+            first_seen,
+            last_seen,
+            full=event.get("mode") != "delta",
+        )
 
-            # Print progress
-            print("  [%3d] %s" % (event["count"], title[:60]))
-            if summary:
-                summary_preview = summary.replace("\n", " ")[:100]
-                print("        %s..." % summary_preview)
-            else:
-                print("        (title only)")
-            print("        tags: %s" % tags[:5])
+        # Print progress
+        print(
+            "  [%3d] %s%s"
+            % (
+                event["count"],
+                "(delta) " if event.get("mode") == "delta" else "",
+                title[:60],
+            )
+        )
+        if summary:
+            summary_preview = summary.replace("\n", " ")[:100]
+            print("        %s..." % summary_preview)
+        else:
+            print("        (title only)")
+        print("        tags: %s" % tags[:5])
 
-            return title
+        return title
 
-        except Exception as e:
-            print("  X Error for %s: %s" % (event["id"][:8], e))
-            conn.rollback()
-            return None
+    except Exception as e:
+        print("  X Error for %s: %s" % (str(event["id"])[:8], e))
+        return None
 
 
 async def process_events(
@@ -894,14 +1244,30 @@ async def process_events(
     ctm_id: str = None,
     centroid_id: str = None,
     track: str = None,
-    concurrency: int = 5,
+    concurrency: int = None,
     domestic_only: bool = False,
     bilateral_only: bool = False,
     force_regenerate: bool = False,
+    delta: bool = None,
 ):
-    """Process events to generate title, summary, and tags."""
+    """Process events to generate title, summary, and tags.
+
+    Grown events get delta summaries (previous summary + new headlines,
+    see summary_mode) unless `delta` is False (default: V3_P45A_DELTA;
+    force_regenerate always rewrites in full).
+
+    One bounded queue feeds `concurrency` workers across all CTMs, so a
+    large CTM no longer stalls the next one behind its slowest call.
+    Payloads are read on their own connection in a worker thread while the
+    workers run; results go to a SummaryWriter thread that commits every
+    V3_P45A_WRITE_BATCH events.
+    """
+    concurrency = concurrency or config.v3_p45a_concurrency
+    if delta is None:
+        delta = config.v3_p45a_delta
+    delta = delta and not force_regenerate
 
-    conn = psycopg2.connect(
+    reader = psycopg2.connect(
         host=config.db_host,
         port=config.db_port,
         database=config.db_name,
@@ -910,8 +1276,8 @@ async def process_events(
     )
 
     try:
-        events = get_events_needing_summaries(
-            conn,
+        candidates = load_candidates(
+            reader,
             max_events,
             ctm_id,
             centroid_id,
@@ -921,7 +1287,7 @@ async def process_events(
             force_regenerate=force_regenerate,
         )
 
-        if not events:
+        if not candidates:
             print("No events need processing.")
             return
 
@@ -934,50 +1300,76 @@ async def process_events(
             filter_desc.append("force")
         filter_str = " (%s)" % ", ".join(filter_desc) if filter_desc else ""
 
-        # Group events by CTM for ordered processing
-        ctm_groups = {}
-        for event in events:
-            cid = event["ctm_id"]
-            if cid not in ctm_groups:
-                ctm_groups[cid] = []
-            ctm_groups[cid].append(event)
+        # Centroid/track per CTM for logging
+        ctm_sizes = Counter(str(row[1]) for row in candidates)
+        with reader.cursor() as cur:
+            cur.execute(
+                "SELECT id::text, centroid_id, track FROM ctm WHERE id = ANY(%s::uuid[])",
+                (list(ctm_sizes),),
+            )
+            ctm_labels = {r[0]: "%s / %s" % (r[1], r[2]) for r in cur.fetchall()}
+        reader.commit()
 
-        ctm_count = len(ctm_groups)
         print(
             "Processing %d events across %d CTMs%s (concurrency: %d)...\n"
-            % (len(events), ctm_count, filter_str, concurrency)
+            % (len(candidates), len(ctm_sizes), filter_str, concurrency)
         )
 
-        semaphore = asyncio.Semaphore(concurrency)
+        # The shared client's adaptive in-flight cap starts at our worker count
+        get_llm_client().limiter.seed(concurrency)
 
-        # Process CTM-by-CTM: complete one CTM before starting the next
-        # process_event returns the EN title (str) on success, None on error
-        results = []
+        work = asyncio.Queue(maxsize=concurrency * 2)
+        writer = SummaryWriter(config.v3_p45a_write_batch)
+        latency = LatencyHistogram()
+        results = []  # process_event: EN title (str) on success, None on error
         titles_for_de = []  # (event_id, english_title)
-
-        for ctm_idx, (ctm_id_key, ctm_events) in enumerate(ctm_groups.items(), 1):
-            # Look up centroid/track for logging
-            with conn.cursor() as cur:
-                cur.execute(
-                    "SELECT centroid_id, track FROM ctm WHERE id = %s",
-                    (ctm_id_key,),
-                )
-                row = cur.fetchone()
-            ctm_label = "%s / %s" % (row[0], row[1]) if row else ctm_id_key[:8]
-
-            print(
-                "[CTM %d/%d] %s (%d events)"
-                % (ctm_idx, ctm_count, ctm_label, len(ctm_events))
-            )
-
-            tasks = [process_event(semaphore, conn, event) for event in ctm_events]
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            for event, result in zip(ctm_events, batch_results):
+        modes = Counter()  # full / delta / unchanged
+        started = time.monotonic()
+
+        async def produce():
+            # CTMs are announced as their first event is queued
+            seen = set()
+            batches = iter_event_payloads(reader, candidates, delta=delta)
+            try:
+                while True:
+                    batch = await asyncio.to_thread(next, batches, None)
+                    if batch is None:
+                        break
+                    for event in batch:
+                        cid = str(event["ctm_id"])
+                        if cid not in seen:
+                            seen.add(cid)
+                            print(
+                                "[CTM %d/%d] %s (%d events)"
+                                % (
+                                    len(seen),
+                                    len(ctm_sizes),
+                                    ctm_labels.get(cid, cid[:8]),
+                                    ctm_sizes[cid],
+                                )
+                            )
+                        await work.put(event)
+            finally:
+                for _ in range(concurrency):
+                    await work.put(None)
+
+        async def worker():
+            while True:
+                event = await work.get()
+                if event is None:
+                    return
+                result = await process_event(writer, event, latency)
                 results.append(result)
-                if isinstance(result, str) and result:
+                modes[event.get("mode", "full")] += 1
+                # title_de only goes stale when the EN title changed
+                if result and result != event.get("title"):
                     titles_for_de.append((event["id"], result))
 
+        try:
+            await asyncio.gather(produce(), *(worker() for _ in range(concurrency)))
+        finally:
+            await asyncio.to_thread(writer.close)
+
         success = sum(1 for r in results if isinstance(r, str) and r)
         errors = len(results) - success
 
@@ -985,9 +1377,18 @@ async def process_events(
         print("=" * 60)
         print("RESULTS")
         print("=" * 60)
-        print("Total events:  %d" % len(events))
+        print("Total events:  %d" % len(candidates))
         print("Processed:     %d" % success)
         print("Errors:        %d" % errors)
+        print(
+            "Summaries:     %d full, %d delta, %d unchanged"
+            % (modes["full"], modes["delta"], modes["unchanged"])
+        )
+        print("Written:       %d (%d failed)" % (writer.written, writer.failed))
+        print("Elapsed:       %.0fs" % (time.monotonic() - started))
+        print("LLM latency:   %s" % latency.format())
+        hits, misses = get_llm_cache().flush_stats().get(LLM_PHASE, (0, 0))
+        print("Result cache:  %d hits, %d misses" % (hits, misses))
 
         # Batch-translate titles to German (25 per LLM call instead of 1:1)
         if titles_for_de:
@@ -996,19 +1397,22 @@ async def process_events(
                 % len(titles_for_de)
             )
             de_translations = await translate_titles_de_batch(titles_for_de)
-            de_count = 0
-            with conn.cursor() as cur:
-                for event_id, title_de in de_translations.items():
-                    cur.execute(
-                        "UPDATE events_v3 SET title_de = %s WHERE id = %s",
-                        (title_de, event_id),
-                    )
-                    de_count += 1
-            conn.commit()
-            print("  DE translations: %d/%d" % (de_count, len(titles_for_de)))
+            with reader.cursor() as cur:
+                execute_values(
+                    cur,
+                    """UPDATE events_v3 e SET title_de = v.title_de
+                       FROM (VALUES %s) AS v(id, title_de)
+                       WHERE e.id = v.id""",
+                    [(str(eid), t) for eid, t in de_translations.items()],
+                    template="(%s::uuid, %s)",
+                )
+            reader.commit()
+            print(
+                "  DE translations: %d/%d" % (len(de_translations), len(titles_for_de))
+            )
 
     finally:
-        conn.close()
+        reader.close()
 
 
 if __name__ == "__main__":
@@ -1032,7 +1436,15 @@ if __name__ == "__main__":
         help="Process events for specific track (e.g., geo_economy)",
     )
     parser.add_argument(
-        "--concurrency", type=int, default=5, help="Number of concurrent LLM calls"
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Events in flight across all CTMs (default: V3_P45A_CONCURRENCY)",
+    )
+    parser.add_argument(
+        "--no-delta",
+        action="store_true",
+        help="Rewrite grown events in full instead of delta updates",
     )
     parser.add_argument(
         "--domestic-only",
@@ -1062,5 +1474,6 @@ if __name__ == "__main__":
             domestic_only=args.domestic_only,
             bilateral_only=args.bilateral_only,
             force_regenerate=args.force,
+            delta=False if args.no_delta else None,
         )
     )
@@ -12,14 +12,17 @@ Usage:
 """
 
 import argparse
+import io
 import re
 import sys
+import uuid
 from collections import Counter, defaultdict
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 import psycopg2
+from psycopg2.extras import execute_values
 
 from core.config import HIGH_FREQ_ORGS, HIGH_FREQ_PERSONS, config
 from core.publisher_filter import filter_publisher_signals, load_publisher_patterns
@@ -590,42 +593,32 @@ def _merge_day_clusters(day_clusters: list) -> list:
     # (target=US) on the same day because both share many surface tokens
     # ("khamenei", "iran", "us", "strike"). Target is the cleanest
     # discriminator when place is absent.
-    cluster_title_tokens = [
-        [_tokenize_title(t.get("title_display") or "") for t in c["titles"]]
-        for c in day_clusters
-    ]
-    empty_targets = [
-        _dominant_target(day_clusters[i]["titles"]) if not dominants[i] else None
-        for i in range(n)
-    ]
+    # Title pairs without a shared token have Dice 0, so only pairs found
+    # through the (target, token) index are scored. Components do not
+    # depend on pair order, so this unions exactly like the pairwise scan.
     empty_idx = [i for i in range(n) if not dominants[i]]
-    for a_pos in range(len(empty_idx)):
-        i = empty_idx[a_pos]
-        ti = cluster_title_tokens[i]
-        if not ti:
-            continue
-        for b_pos in range(a_pos + 1, len(empty_idx)):
-            j = empty_idx[b_pos]
-            if find(i) == find(j):
-                continue
-            if empty_targets[i] != empty_targets[j]:
-                continue
-            tj = cluster_title_tokens[j]
-            if not tj:
-                continue
-            matched = False
-            for a in ti:
-                if matched:
-                    break
-                if not a:
-                    continue
-                for b in tj:
-                    if not b:
+    empty_targets = {i: _dominant_target(day_clusters[i]["titles"]) for i in empty_idx}
+    title_tokens = {}
+    by_token = defaultdict(list)
+    for i in empty_idx:
+        target = empty_targets[i]
+        for k, t in enumerate(day_clusters[i]["titles"]):
+            toks = _tokenize_title(t.get("title_display") or "")
+            title_tokens[(i, k)] = toks
+            for tok in toks:
+                by_token[(target, tok)].append((i, k))
+    for i in empty_idx:
+        target = empty_targets[i]
+        for k in range(len(day_clusters[i]["titles"])):
+            a = title_tokens[(i, k)]
+            scored = set()
+            for tok in a:
+                for j, m in by_token[(target, tok)]:
+                    if j == i or (j, m) in scored or find(i) == find(j):
                         continue
-                    if _dice(a, b) >= TEXT_DICE_THRESHOLD:
+                    scored.add((j, m))
+                    if _dice(a, title_tokens[(j, m)]) >= TEXT_DICE_THRESHOLD:
                         union(i, j)
-                        matched = True
-                        break
 
     groups = defaultdict(list)
     for i in range(n):
@@ -716,90 +709,136 @@ def cluster_by_day_beat(titles: list, home_centroid_id: str) -> list:
 # =============================================================================
 
 
+def _beat_summary(cluster: dict) -> str:
+    """Mechanical event summary: 'actor action -> target [anchor]'."""
+    actor, action, target = cluster.get("beat") or (None, None, None)
+    anchor = cluster.get("dominant_entity")
+    anchor_str = anchor.split(":", 1)[1] if anchor else "misc"
+    parts = []
+    if actor:
+        parts.append(actor)
+    if action:
+        parts.append(action)
+    if target and target != "NONE":
+        parts.append("-> " + target)
+    parts.append("[" + anchor_str + "]")
+    return " ".join(parts)
+
+
+def _event_row(event_id: str, ctm_id: str, cluster: dict) -> tuple:
+    """events_v3 VALUES tuple for a new cluster (see _insert_events)."""
+    # Mechanical fallback title: Phase 4.5a can overwrite it with an LLM
+    # title later, until then the event is human-readable and searchable.
+    return (
+        event_id,
+        ctm_id,
+        cluster["date"],
+        cluster["first_date"],
+        _pick_mechanical_title(cluster["titles"]),
+        _beat_summary(cluster),
+        cluster["event_type"],
+        cluster["bucket_key"],
+        cluster["source_count"],
+        False,
+        cluster["last_date"],
+    )
+
+
+def _insert_events(cur, rows: list) -> list:
+    """Insert events_v3 rows in multi-row statements. Returns inserted ids."""
+    if not rows:
+        return []
+    inserted = execute_values(
+        cur,
+        """
+        INSERT INTO events_v3 (
+            id, ctm_id, date, first_seen, title, summary, event_type, bucket_key,
+            source_batch_count, is_catchall, last_active
+        ) VALUES %s
+        RETURNING id::text
+        """,
+        rows,
+        page_size=1000,
+        fetch=True,
+    )
+    return [r[0] for r in inserted]
+
+
+def _copy_title_links(cur, links: list) -> None:
+    """Link (event_id, title_id) pairs: COPY into a temp stage, then one
+    INSERT ... ON CONFLICT DO NOTHING (COPY itself cannot skip duplicates)."""
+    if not links:
+        return
+    cur.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS event_title_links_stage (
+            event_id UUID NOT NULL,
+            title_id UUID NOT NULL
+        ) ON COMMIT DELETE ROWS
+        """
+    )
+    buf = io.StringIO("".join("%s\t%s\n" % link for link in links))
+    cur.copy_expert("COPY event_title_links_stage (event_id, title_id) FROM STDIN", buf)
+    cur.execute(
+        """
+        INSERT INTO event_v3_titles (event_id, title_id)
+        SELECT event_id, title_id FROM event_title_links_stage
+        ON CONFLICT DO NOTHING
+        """
+    )
+    cur.execute("TRUNCATE event_title_links_stage")
+
+
+def _refresh_source_counts(cur, last_active: dict) -> None:
+    """Recount source_batch_count and extend last_active for grown events.
+
+    Args:
+        last_active: {event_id: latest date of the titles just linked}
+    """
+    if not last_active:
+        return
+    execute_values(
+        cur,
+        """
+        WITH v (id, last_active) AS (VALUES %s),
+        n AS (
+            SELECT et.event_id, COUNT(*) AS titles
+            FROM event_v3_titles et
+            JOIN v ON et.event_id = v.id
+            GROUP BY et.event_id
+        )
+        UPDATE events_v3 e
+        SET source_batch_count = n.titles,
+            last_active = GREATEST(e.last_active, v.last_active)
+        FROM v
+        JOIN n ON n.event_id = v.id
+        WHERE e.id = v.id
+        """,
+        list(last_active.items()),
+        template="(%s::uuid, %s::date)",
+        page_size=1000,
+    )
+
+
 def write_clusters_to_db(conn, clusters: list, ctm_id: str) -> int:
     """D-056: Write day-beat clusters to events_v3.
 
     No min_titles filter - singletons are kept (frontend filters by per-CTM
     percentile). No catchall event - singletons are just size-1 events_v3 rows.
+    Set-based: one multi-row insert for events, one COPY for title links.
 
     Returns: count of events written.
     """
-    import uuid
-
-    cur = conn.cursor()
-    written = 0
-
+    rows = []
+    links = []
     for c in clusters:
         event_id = str(uuid.uuid4())
-        # Build summary from dominant entity + beat
-        beat = c.get("beat") or (None, None, None)
-        actor, action, target = beat
-        anchor = c.get("dominant_entity")
-        anchor_str = anchor.split(":", 1)[1] if anchor else "misc"
-        summary_parts = []
-        if actor:
-            summary_parts.append(actor)
-        if action:
-            summary_parts.append(action)
-        if target and target != "NONE":
-            summary_parts.append("-> " + target)
-        summary_parts.append("[" + anchor_str + "]")
-        summary = " ".join(summary_parts)
-
-        # Mechanical fallback title: pick the earliest title_display that has
-        # a reasonable length. Phase 4.5a can overwrite this with an LLM title
-        # later, but until then the cluster is human-readable and searchable.
-        mechanical_title = None
-        sorted_titles = sorted(
-            c["titles"],
-            key=lambda t: (
-                t.get("pubdate_utc") or 0,
-                -(len(t.get("title_display") or "")),
-            ),
-        )
-        for t in sorted_titles:
-            td = t.get("title_display")
-            if td and len(td) >= 20:
-                mechanical_title = td
-                break
-        if not mechanical_title and sorted_titles:
-            mechanical_title = sorted_titles[0].get("title_display")
-
-        try:
-            cur.execute(
-                """
-                INSERT INTO events_v3 (
-                    id, ctm_id, date, first_seen, title, summary, event_type, bucket_key,
-                    source_batch_count, is_catchall, last_active
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (
-                    event_id,
-                    ctm_id,
-                    c["date"],
-                    c["first_date"],
-                    mechanical_title,
-                    summary,
-                    c["event_type"],
-                    c["bucket_key"],
-                    c["source_count"],
-                    False,
-                    c["last_date"],
-                ),
-            )
-            for title in c["titles"]:
-                cur.execute(
-                    """
-                    INSERT INTO event_v3_titles (event_id, title_id)
-                    VALUES (%s, %s)
-                    ON CONFLICT DO NOTHING
-                    """,
-                    (event_id, title["id"]),
-                )
-            written += 1
-        except Exception as e:
-            print("Failed to write cluster: {}".format(e))
+        rows.append(_event_row(event_id, ctm_id, c))
+        links.extend((event_id, t["id"]) for t in c["titles"])
 
+    with conn.cursor() as cur:
+        written = len(_insert_events(cur, rows))
+        _copy_title_links(cur, links)
     conn.commit()
     return written
 
@@ -855,79 +894,35 @@ def process_ctm_for_daemon(conn, ctm_id: str, centroid_id: str, track: str) -> i
     affected_dates = {c["date"] for c in new_clusters}
     existing_events = _load_existing_events(conn, ctm_id, affected_dates)
 
-    cur = conn.cursor()
+    new_rows = []
+    links = []
+    grown = {}  # appended-to event id -> latest title date
     created = 0
     appended = 0
 
     for nc in new_clusters:
-        match_id = _find_matching_event(nc, existing_events.get(nc["date"], []))
+        match_id = _find_matching_event(nc, existing_events.get(nc["date"]))
         if match_id:
             # Append titles to existing event
-            for t in nc["titles"]:
-                cur.execute(
-                    "INSERT INTO event_v3_titles (event_id, title_id) VALUES (%s, %s) ON CONFLICT DO NOTHING",
-                    (match_id, t["id"]),
-                )
-            # Update source count
-            cur.execute(
-                """UPDATE events_v3 SET source_batch_count = (
-                       SELECT COUNT(*) FROM event_v3_titles WHERE event_id = %s
-                   ), last_active = GREATEST(last_active, %s)
-                   WHERE id = %s""",
-                (match_id, nc["date"], match_id),
-            )
+            event_id = match_id
+            grown[event_id] = max(grown.get(event_id, nc["date"]), nc["date"])
             appended += 1
         else:
             # Create new event
-            import uuid as _uuid
-
-            event_id = str(_uuid.uuid4())
-            mechanical_title = _pick_mechanical_title(nc["titles"])
-            beat = nc.get("beat") or (None, None, None)
-            actor, action, target = beat
-            anchor = nc.get("dominant_entity")
-            anchor_str = anchor.split(":", 1)[1] if anchor else "misc"
-            parts = []
-            if actor:
-                parts.append(actor)
-            if action:
-                parts.append(action)
-            if target and target != "NONE":
-                parts.append("-> " + target)
-            parts.append("[" + anchor_str + "]")
-            summary = " ".join(parts)
-
-            cur.execute(
-                """INSERT INTO events_v3 (
-                       id, ctm_id, date, first_seen, title, summary,
-                       event_type, bucket_key, source_batch_count,
-                       is_catchall, last_active
-                   ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)""",
-                (
-                    event_id,
-                    ctm_id,
-                    nc["date"],
-                    nc["first_date"],
-                    mechanical_title,
-                    summary,
-                    nc["event_type"],
-                    nc["bucket_key"],
-                    nc["source_count"],
-                    False,
-                    nc["last_date"],
-                ),
-            )
-            for t in nc["titles"]:
-                cur.execute(
-                    "INSERT INTO event_v3_titles (event_id, title_id) VALUES (%s, %s) ON CONFLICT DO NOTHING",
-                    (event_id, t["id"]),
-                )
+            event_id = str(uuid.uuid4())
+            new_rows.append(_event_row(event_id, ctm_id, nc))
             created += 1
             # Add to existing_events so subsequent clusters can match against it
-            existing_events.setdefault(nc["date"], []).append(
+            existing_events.setdefault(nc["date"], _EventIndex()).add(
                 _event_record(event_id, nc)
             )
+        links.extend((event_id, t["id"]) for t in nc["titles"])
 
+    # Events first (link FKs), then links, then counts that include them
+    with conn.cursor() as cur:
+        _insert_events(cur, new_rows)
+        _copy_title_links(cur, links)
+        _refresh_source_counts(cur, grown)
     conn.commit()
     if appended or created:
         print(
@@ -937,6 +932,45 @@ def process_ctm_for_daemon(conn, ctm_id: str, centroid_id: str, track: str) -> i
     return created
 
 
+def mark_ctm_clustered(conn, ctm_id: str) -> None:
+    """Record the title_count this CTM was clustered at; commits."""
+    with conn.cursor() as cur:
+        cur.execute(
+            "UPDATE ctm SET title_count_at_clustering = title_count WHERE id = %s",
+            (ctm_id,),
+        )
+    conn.commit()
+
+
+# Connection of a spawned pool worker (see cluster_ctm_job)
+_worker_conn = None
+
+
+def cluster_ctm_job(ctm_id: str, centroid_id: str, track: str) -> int:
+    """Process-pool job: cluster one CTM on this process's own connection.
+
+    Loads, clusters, writes and marks the CTM like the daemon's serial loop.
+    CTMs never share events (events_v3 rows belong to one ctm_id and
+    matching stays inside the CTM), so jobs need no ordering among each
+    other; cross-CTM merging (Phase 3.2) runs after the whole phase.
+
+    Returns: number of new events created.
+    """
+    global _worker_conn
+    if _worker_conn is None or _worker_conn.closed:
+        _worker_conn = get_connection()
+    try:
+        created = process_ctm_for_daemon(_worker_conn, ctm_id, centroid_id, track)
+        mark_ctm_clustered(_worker_conn, ctm_id)
+    except Exception:
+        try:
+            _worker_conn.rollback()
+        except psycopg2.Error:
+            _worker_conn.close()
+        raise
+    return created
+
+
 def _pick_mechanical_title(titles):
     """Pick earliest title_display with length >= 20 as fallback title."""
     sorted_titles = sorted(
@@ -950,8 +984,47 @@ def _pick_mechanical_title(titles):
     return sorted_titles[0].get("title_display") if sorted_titles else None
 
 
+class _EventIndex:
+    """One date's existing events with inverted indexes for matching.
+
+    An event can only match a new cluster through a shared (action_class,
+    entity) pair or a shared title word (see _find_matching_event), so
+    lookups score those events instead of every event of the date.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.by_entity = defaultdict(list)  # (action, entity) -> positions
+        self.by_word = defaultdict(list)  # title word -> positions
+
+    def add(self, ev: dict) -> None:
+        pos = len(self.events)
+        ev["match_entities"] = ev.get("entities", set()) - _HIGH_FREQ
+        ev["match_words"] = ev.get("title_words", set()) - _STOP
+        self.events.append(ev)
+        if ev.get("action") is not None:
+            for e in ev["match_entities"]:
+                self.by_entity[(ev["action"], e)].append(pos)
+        for w in ev["match_words"]:
+            self.by_word[w].append(pos)
+
+    def candidates(self, action, entities: set, words: set) -> list:
+        """Events sharing an entity under `action` or a title word, in
+        insertion order (keeps the first-biggest tie-break)."""
+        positions = set()
+        if action is not None:
+            for e in entities:
+                positions.update(self.by_entity.get((action, e), ()))
+        for w in words:
+            positions.update(self.by_word.get(w, ()))
+        return [self.events[p] for p in sorted(positions)]
+
+
 def _load_existing_events(conn, ctm_id, dates):
-    """Load existing events for specific dates with their entity signals."""
+    """Load existing events for specific dates with their entity signals.
+
+    Returns: {date: _EventIndex}
+    """
     if not dates:
         return {}
     cur = conn.cursor()
@@ -1009,7 +1082,12 @@ def _load_existing_events(conn, ctm_id, dates):
                             ev["title_words"].add(w)
 
     cur.close()
-    return events
+    indexes = {}
+    for date, date_events in events.items():
+        indexes[date] = _EventIndex()
+        for ev in date_events:
+            indexes[date].add(ev)
+    return indexes
 
 
 def _event_record(event_id, cluster):
@@ -1053,14 +1131,15 @@ _STOP = frozenset(
 )
 
 
-def _find_matching_event(new_cluster, existing_events):
+def _find_matching_event(new_cluster, index):
     """Find best matching existing event for a new mini-cluster.
 
     Returns event_id if match found, None otherwise.
     Uses same hybrid logic as merge_same_day_events: entity overlap OR Dice.
-    Prefers the biggest existing event when multiple match.
+    Prefers the biggest existing event when multiple match. Only events
+    from the date's _EventIndex that share an entity or word are scored.
     """
-    if not existing_events:
+    if index is None or not index.events:
         return None
 
     nc_entities = set()
@@ -1085,14 +1164,13 @@ def _find_matching_event(new_cluster, existing_events):
     best_id = None
     best_src = -1
 
-    for ev in existing_events:
-        ev_ents = ev.get("entities", set()) - _HIGH_FREQ
-        shared = nc_ents & ev_ents
+    for ev in index.candidates(nc_action, nc_ents, nc_words):
+        shared = nc_ents & ev["match_entities"]
         entity_match = (
             len(shared) >= 1 and nc_action == ev.get("action") and nc_action is not None
         )
 
-        ev_words = ev.get("title_words", set()) - _STOP
+        ev_words = ev["match_words"]
         dice = 0
         if nc_words and ev_words:
             dice = 2 * len(nc_words & ev_words) / (len(nc_words) + len(ev_words))
@@ -9,7 +9,6 @@ Depends on mv_event_triples being populated first.
 """
 
 import argparse
-import json
 import sys
 import time
 from collections import defaultdict
@@ -19,6 +18,7 @@ import psycopg2
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.config import config
+from pipeline.phase_4.mv_upsert import record_refresh, upsert_changed
 
 MIN_BASELINE_WEEKS = 4  # Skip deviation flagging with fewer weeks
 
@@ -221,35 +221,29 @@ def materialize(all_weeks=False):
                         if flags:
                             deviations = flags
 
-                    upsert_rows.append(
-                        (
-                            cid,
-                            week,
-                            json.dumps(metrics),
-                            json.dumps(deviations) if deviations else None,
-                        )
-                    )
+                    upsert_rows.append((cid, week, metrics, deviations))
 
             # Upsert — rows persist across runs; each run refreshes only
             # the weeks it recomputes. History survives even if upstream
-            # mv_event_triples is pruned or retention-trimmed.
-            if upsert_rows:
-                for row in upsert_rows:
-                    cur.execute(
-                        """INSERT INTO mv_centroid_baselines (centroid_id, week, metrics, deviations, updated_at)
-                           VALUES (%s, %s, %s::jsonb, %s::jsonb, NOW())
-                           ON CONFLICT (centroid_id, week) DO UPDATE SET
-                               metrics = EXCLUDED.metrics,
-                               deviations = EXCLUDED.deviations,
-                               updated_at = NOW()""",
-                        row,
-                    )
+            # mv_event_triples is pruned or retention-trimmed. Unchanged
+            # weeks (most of them) are not rewritten.
+            changed = upsert_changed(
+                cur,
+                "mv_centroid_baselines",
+                ("centroid_id", "week"),
+                ("metrics", "deviations"),
+                upsert_rows,
+                page_size=500,
+            )
+            record_refresh(cur, "mv_centroid_baselines", len(upsert_rows), changed)
 
             conn.commit()
             elapsed = time.time() - start
             print(
-                "Done: %d centroid-weeks computed (%.1fs)" % (len(upsert_rows), elapsed)
+                "Done: %d centroid-weeks computed, %d changed (%.1fs)"
+                % (len(upsert_rows), changed, elapsed)
             )
+            return changed
     finally:
         conn.close()
 
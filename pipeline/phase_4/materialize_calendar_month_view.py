@@ -20,16 +20,15 @@ gate AND the frozen-skip (use after a JSONB shape change).
 
 import argparse
 import calendar
-import json
 import sys
 import time
 from pathlib import Path
 
 import psycopg2
-from psycopg2.extras import execute_values
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.config import config
+from pipeline.phase_4.mv_upsert import record_refresh, refresh_age_hours, upsert_changed
 
 DEFAULT_MAX_AGE_HOURS = 12
 LOCALES = ("en", "de")
@@ -44,11 +43,7 @@ def get_connection():
 
 
 def is_stale(cur, max_age_hours):
-    cur.execute(
-        "SELECT EXTRACT(EPOCH FROM (NOW() - MAX(updated_at)))/3600 FROM mv_calendar_month_view"
-    )
-    row = cur.fetchone()
-    age = row[0] if row else None
+    age = refresh_age_hours(cur, "mv_calendar_month_view")
     return age is None or age >= max_age_hours
 
 
@@ -370,21 +365,16 @@ def materialize_one(cur, ctm_id, centroid_id, track, month_str, locale):
 
 
 def upsert_batch(cur, rows):
-    """rows: list of (centroid_id, track, month_str, locale, view_dict)"""
-    if not rows:
-        return 0
-    execute_values(
+    """rows: list of (centroid_id, track, month_str, locale, view_dict).
+    Returns the number of rows whose view changed."""
+    return upsert_changed(
         cur,
-        """INSERT INTO mv_calendar_month_view
-              (centroid_id, track, month, locale, view, updated_at)
-           VALUES %s
-           ON CONFLICT (centroid_id, track, month, locale) DO UPDATE
-             SET view = EXCLUDED.view,
-                 updated_at = EXCLUDED.updated_at""",
-        [(c, tr, m, loc, json.dumps(v)) for c, tr, m, loc, v in rows],
-        template="(%s, %s, %s::date, %s, %s::jsonb, NOW())",
+        "mv_calendar_month_view",
+        ("centroid_id", "track", "month", "locale"),
+        ("view",),
+        rows,
+        key_casts=("", "", "::date", ""),
     )
-    return len(rows)
 
 
 # ─── main loop ──────────────────────────────────────────────────────────
@@ -395,10 +385,7 @@ def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False, batch_size=50)
     try:
         with conn.cursor() as cur:
             if not force and not is_stale(cur, max_age_hours):
-                cur.execute(
-                    "SELECT EXTRACT(EPOCH FROM (NOW() - MAX(updated_at)))/3600 FROM mv_calendar_month_view"
-                )
-                age = cur.fetchone()[0]
+                age = refresh_age_hours(cur, "mv_calendar_month_view")
                 print(
                     "Skipped: mv_calendar_month_view refreshed %.1fh ago (gate=%.1fh)"
                     % (age, max_age_hours)
@@ -431,7 +418,7 @@ def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False, batch_size=50)
             )
 
             batch = []
-            done = 0
+            done = changed = 0
             for ctm_id, centroid_id, track, month_str, locale in todo:
                 view = materialize_one(
                     cur, ctm_id, centroid_id, track, month_str, locale
@@ -440,20 +427,23 @@ def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False, batch_size=50)
                     continue
                 batch.append((centroid_id, track, month_str, locale, view))
                 if len(batch) >= batch_size:
-                    upsert_batch(cur, batch)
+                    changed += upsert_batch(cur, batch)
                     conn.commit()
                     done += len(batch)
                     batch = []
                     if done % 200 == 0:
                         print("  ... %d/%d rows" % (done, len(todo)))
             if batch:
-                upsert_batch(cur, batch)
-                conn.commit()
+                changed += upsert_batch(cur, batch)
                 done += len(batch)
+            record_refresh(cur, "mv_calendar_month_view", done, changed)
+            conn.commit()
 
             elapsed = time.time() - start
-            print("Done: %d rows upserted (%.1fs)" % (done, elapsed))
-            return done
+            print(
+                "Done: %d rows checked, %d changed (%.1fs)" % (done, changed, elapsed)
+            )
+            return changed
     finally:
         conn.close()
 
@@ -9,6 +9,11 @@ ready for the frontend to read with a single PK lookup.
 Title-word Dice de-dup of cross-day event fragments runs on the worker
 side here (ported from lib/queries.ts); the frontend just renders.
 
+Data is fetched per month, not per blob: fetch_month() pulls the stripes,
+top events, CTMs, theme chips and nav of up to MONTH_FETCH_CENTROIDS
+centroids in five set-based queries, and build_view() renders both
+locales from that shared data (only the title coalesce is per locale).
+
 Staleness gate: skips refresh if the table was updated within
 --max-age-hours (default 12, matching ingestion cadence). Daemon may
 call freely; the script no-ops between refreshes. Run with --force to
@@ -17,17 +22,16 @@ bypass.
 
 import argparse
 import calendar
-import json
 import re
 import sys
 import time
 from pathlib import Path
 
 import psycopg2
-from psycopg2.extras import execute_values
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.config import config
+from pipeline.phase_4.mv_upsert import record_refresh, refresh_age_hours, upsert_changed
 
 DEFAULT_MAX_AGE_HOURS = 12
 LOCALES = ("en", "de")
@@ -35,6 +39,7 @@ CARD_DICE_THRESHOLD = 0.3
 CARD_TOP_N = 5
 CARD_FETCH_LIMIT = 10  # pre-dedup pool size per track
 CALENDAR_EVENT_PAGE_MIN_SOURCES = 5
+MONTH_FETCH_CENTROIDS = 200  # centroids per set-based month fetch
 
 # Ported from lib/queries.ts so dedup matches the legacy frontend behavior.
 CARD_STOP_WORDS = set(
@@ -75,11 +80,7 @@ def get_connection():
 
 
 def is_stale(cur, max_age_hours):
-    cur.execute(
-        "SELECT EXTRACT(EPOCH FROM (NOW() - MAX(updated_at)))/3600 FROM mv_centroid_month_view"
-    )
-    row = cur.fetchone()
-    age = row[0] if row else None
+    age = refresh_age_hours(cur, "mv_centroid_month_view")
     return age is None or age >= max_age_hours
 
 
@@ -108,105 +109,173 @@ def existing_keys(cur):
     return {tuple(r) for r in cur.fetchall()}
 
 
-def fetch_stripe(cur, centroid_id, month):
+def fetch_stripes(cur, centroid_ids, month):
+    """{centroid_id: [(date, track, sources)]} for one month"""
     cur.execute(
-        """SELECT e.date::text, c.track, SUM(e.source_batch_count)::int
+        """SELECT c.centroid_id, e.date::text, c.track,
+                  SUM(e.source_batch_count)::int
              FROM events_v3 e
              JOIN ctm c ON c.id = e.ctm_id
-            WHERE c.centroid_id = %s AND c.month = %s
+            WHERE c.centroid_id = ANY(%s) AND c.month = %s
               AND e.is_promoted = true AND e.merged_into IS NULL
-            GROUP BY e.date, c.track""",
-        (centroid_id, month),
+            GROUP BY c.centroid_id, e.date, c.track""",
+        (centroid_ids, month),
     )
-    return cur.fetchall()
-
-
-def fetch_top(cur, centroid_id, month, locale):
-    """Top-N promoted events per track, locale-aware title coalesce."""
-    title_expr = "COALESCE(e.title_de, e.title)" if locale == "de" else "e.title"
-    sql = f"""WITH ranked AS (
-                 SELECT c.track,
-                        e.id::text AS event_id,
-                        e.date::text AS date,
-                        COALESCE(
-                            {title_expr},
-                            (SELECT t2.title_display FROM event_v3_titles evt2
-                             JOIN titles_v3 t2 ON t2.id = evt2.title_id
-                             WHERE evt2.event_id = e.id
-                             ORDER BY t2.pubdate_utc ASC LIMIT 1)
-                        ) AS title,
-                        e.source_batch_count,
-                        ROW_NUMBER() OVER (
-                            PARTITION BY c.track
-                            ORDER BY e.source_batch_count DESC, e.date DESC, e.id
-                        ) AS rnk
-                   FROM events_v3 e
-                   JOIN ctm c ON c.id = e.ctm_id
-                  WHERE c.centroid_id = %s AND c.month = %s
-                    AND e.is_promoted = true AND e.merged_into IS NULL
-                    AND e.is_catchall = false
-              )
-              SELECT track, event_id, date, title, source_batch_count
-                FROM ranked WHERE rnk <= %s
-               ORDER BY track, rnk"""
-    cur.execute(sql, (centroid_id, month, CARD_FETCH_LIMIT))
-    return cur.fetchall()
-
-
-def fetch_ctms(cur, centroid_id, month):
-    """Per-track CTM metadata + ctm_id (for theme chips)."""
+    out = {}
+    for centroid_id, date, track, src in cur.fetchall():
+        out.setdefault(centroid_id, []).append((date, track, src))
+    return out
+
+
+def fetch_top(cur, centroid_ids, month):
+    """{centroid_id: [(track, event_id, date, titles, sources)]}: top
+    CARD_FETCH_LIMIT promoted events per (centroid, track), in rank order.
+
+    Ranking is locale-neutral, so both locales share one fetch; titles is
+    (title, title_de, first headline) and locale_title() picks from it.
+    The first headline is only looked up for events without a title.
+    """
     cur.execute(
-        """SELECT c.id::text, c.track, c.title_count::int,
+        """WITH ranked AS (
+              SELECT c.centroid_id, c.track,
+                     e.id, e.date, e.title, e.title_de, e.source_batch_count,
+                     ROW_NUMBER() OVER (
+                         PARTITION BY c.centroid_id, c.track
+                         ORDER BY e.source_batch_count DESC, e.date DESC, e.id
+                     ) AS rnk
+                FROM events_v3 e
+                JOIN ctm c ON c.id = e.ctm_id
+               WHERE c.centroid_id = ANY(%s) AND c.month = %s
+                 AND e.is_promoted = true AND e.merged_into IS NULL
+                 AND e.is_catchall = false
+           )
+           SELECT r.centroid_id, r.track, r.id::text, r.date::text,
+                  r.title, r.title_de,
+                  CASE WHEN r.title IS NULL THEN
+                      (SELECT t2.title_display FROM event_v3_titles evt2
+                       JOIN titles_v3 t2 ON t2.id = evt2.title_id
+                       WHERE evt2.event_id = r.id
+                       ORDER BY t2.pubdate_utc ASC LIMIT 1)
+                  END,
+                  r.source_batch_count
+             FROM ranked r
+            WHERE r.rnk <= %s
+            ORDER BY r.centroid_id, r.track, r.rnk""",
+        (centroid_ids, month, CARD_FETCH_LIMIT),
+    )
+    out = {}
+    for (
+        centroid_id,
+        track,
+        event_id,
+        date,
+        title,
+        title_de,
+        first,
+        src,
+    ) in cur.fetchall():
+        out.setdefault(centroid_id, []).append(
+            (track, event_id, date, (title, title_de, first), src)
+        )
+    return out
+
+
+def locale_title(titles, locale):
+    """Locale-aware title coalesce (de falls back to the English title)"""
+    title, title_de, first = titles
+    if locale == "de" and title_de is not None:
+        return title_de
+    return title if title is not None else first
+
+
+def fetch_ctms(cur, centroid_ids, month):
+    """{centroid_id: [(ctm_id, track, title_count, last_active)]}"""
+    cur.execute(
+        """SELECT c.centroid_id, c.id::text, c.track, c.title_count::int,
                   (SELECT MAX(e.date)::text FROM events_v3 e WHERE e.ctm_id = c.id)
              FROM ctm c
-            WHERE c.centroid_id = %s AND c.month = %s""",
-        (centroid_id, month),
+            WHERE c.centroid_id = ANY(%s) AND c.month = %s""",
+        (centroid_ids, month),
     )
-    return cur.fetchall()
+    out = {}
+    for centroid_id, *row in cur.fetchall():
+        out.setdefault(centroid_id, []).append(tuple(row))
+    return out
 
 
-def fetch_theme_chips(cur, ctm_id, limit=3):
+def fetch_theme_chips(cur, ctm_ids, limit=3):
+    """{ctm_id: [chip]}: top `limit` (sector, subject) shares per CTM"""
+    if not ctm_ids:
+        return {}
     cur.execute(
         """WITH labels AS (
-              SELECT tl.sector, tl.subject, COUNT(*) AS cnt
+              SELECT e.ctm_id, tl.sector, tl.subject, COUNT(*) AS cnt
                 FROM events_v3 e
                 JOIN event_v3_titles evt ON evt.event_id = e.id
                 JOIN title_labels tl ON tl.title_id = evt.title_id
-               WHERE e.ctm_id = %s AND e.is_promoted = true
+               WHERE e.ctm_id = ANY(%s::uuid[]) AND e.is_promoted = true
                  AND tl.sector IS NOT NULL AND tl.sector <> 'NON_STRATEGIC'
-               GROUP BY tl.sector, tl.subject
+               GROUP BY e.ctm_id, tl.sector, tl.subject
+            ), ranked AS (
+              SELECT ctm_id, sector, subject,
+                     (cnt::float / SUM(cnt) OVER (PARTITION BY ctm_id))::float
+                         AS weight,
+                     ROW_NUMBER() OVER (
+                         PARTITION BY ctm_id ORDER BY cnt DESC, sector, subject
+                     ) AS rnk
+                FROM labels
             )
-            SELECT sector, subject, (cnt::float / SUM(cnt) OVER ())::float
-              FROM labels
-             ORDER BY cnt DESC, sector, subject
-             LIMIT %s""",
-        (ctm_id, limit),
+            SELECT ctm_id::text, sector, subject, weight
+              FROM ranked
+             WHERE rnk <= %s
+             ORDER BY ctm_id, rnk""",
+        (ctm_ids, limit),
     )
-    return [
-        {"sector": r[0], "subject": r[1], "weight": float(r[2])} for r in cur.fetchall()
-    ]
+    out = {}
+    for ctm_id, sector, subject, weight in cur.fetchall():
+        out.setdefault(ctm_id, []).append(
+            {"sector": sector, "subject": subject, "weight": float(weight)}
+        )
+    return out
 
 
-def fetch_nav(cur, centroid_id, month):
-    """Prev / next month with coverage (any ctm row)."""
+def fetch_nav(cur, centroid_ids, month):
+    """{centroid_id: (prev_month, next_month)} with coverage (any ctm row)."""
     cur.execute(
-        """(SELECT month::text, true
-              FROM ctm WHERE centroid_id = %s AND month < %s
-              ORDER BY month DESC LIMIT 1)
-           UNION ALL
-           (SELECT month::text, false
-              FROM ctm WHERE centroid_id = %s AND month > %s
-              ORDER BY month ASC LIMIT 1)""",
-        (centroid_id, month, centroid_id, month),
+        """SELECT centroid_id,
+                  MAX(month) FILTER (WHERE month < %s)::text,
+                  MIN(month) FILTER (WHERE month > %s)::text
+             FROM ctm
+            WHERE centroid_id = ANY(%s)
+            GROUP BY centroid_id""",
+        (month, month, centroid_ids),
     )
-    prev_month = None
-    next_month = None
-    for m, is_prev in cur.fetchall():
-        if is_prev:
-            prev_month = m[:7]
-        else:
-            next_month = m[:7]
-    return prev_month, next_month
+    return {
+        centroid_id: (prev and prev[:7], nxt and nxt[:7])
+        for centroid_id, prev, nxt in cur.fetchall()
+    }
+
+
+def fetch_month(cur, centroid_ids, month):
+    """Everything the views of `centroid_ids` in `month` need, for both
+    locales, in five set-based queries: {centroid_id: data}."""
+    stripes = fetch_stripes(cur, centroid_ids, month)
+    top = fetch_top(cur, centroid_ids, month)
+    ctms = fetch_ctms(cur, centroid_ids, month)
+    chips = fetch_theme_chips(
+        cur, [row[0] for rows in ctms.values() for row in rows], 3
+    )
+    nav = fetch_nav(cur, centroid_ids, month)
+    return {
+        centroid_id: {
+            "stripe": stripes.get(centroid_id, []),
+            "top": top.get(centroid_id, []),
+            "ctms": ctms.get(centroid_id, []),
+            "chips": chips,
+            "nav": nav.get(centroid_id, (None, None)),
+        }
+        for centroid_id in centroid_ids
+    }
 
 
 def build_activity_stripe(month_str, stripe_rows):
@@ -234,10 +303,11 @@ def build_activity_stripe(month_str, stripe_rows):
     return out
 
 
-def dedup_top_events(top_rows):
+def dedup_top_events(top_rows, locale):
     """Group top_rows by track, dedup with title-word Dice, keep CARD_TOP_N."""
     by_track = {}
-    for track, event_id, date, title, src in top_rows:
+    for track, event_id, date, titles, src in top_rows:
+        title = locale_title(titles, locale)
         by_track.setdefault(track, []).append(
             {
                 "event": {
@@ -263,25 +333,20 @@ def dedup_top_events(top_rows):
     return out
 
 
-def materialize_one(cur, centroid_id, month, locale):
-    """Compute the full CentroidMonthView for one (centroid, month, locale)
-    and return the dict (caller upserts)."""
-    stripe_rows = fetch_stripe(cur, centroid_id, month)
-    top_rows = fetch_top(cur, centroid_id, month, locale)
-    ctm_rows = fetch_ctms(cur, centroid_id, month)
-    prev_month, next_month = fetch_nav(cur, centroid_id, month)
-
-    activity_stripe = build_activity_stripe(month, stripe_rows)
-    top_by_track = dedup_top_events(top_rows)
+def build_view(centroid_id, month, locale, data):
+    """CentroidMonthView for one locale from fetch_month() data."""
+    activity_stripe = build_activity_stripe(month, data["stripe"])
+    top_by_track = dedup_top_events(data["top"], locale)
+    prev_month, next_month = data["nav"]
 
     tracks = []
-    for ctm_id, track, title_count, last_active in ctm_rows:
+    for ctm_id, track, title_count, last_active in data["ctms"]:
         tracks.append(
             {
                 "track": track,
                 "title_count": title_count,
                 "last_active": last_active,
-                "theme_chips": fetch_theme_chips(cur, ctm_id, 3),
+                "theme_chips": data["chips"].get(ctm_id, []),
                 "top_events": top_by_track.get(track, []),
             }
         )
@@ -296,22 +361,24 @@ def materialize_one(cur, centroid_id, month, locale):
     }
 
 
+def materialize_one(cur, centroid_id, month, locale):
+    """Compute the full CentroidMonthView for one (centroid, month, locale)
+    and return the dict (caller upserts)."""
+    data = fetch_month(cur, [centroid_id], month)[centroid_id]
+    return build_view(centroid_id, month, locale, data)
+
+
 def upsert_batch(cur, rows):
-    """rows: list of (centroid_id, month, locale, view_dict)"""
-    if not rows:
-        return 0
-    execute_values(
+    """rows: list of (centroid_id, month, locale, view_dict).
+    Returns the number of rows whose view changed."""
+    return upsert_changed(
         cur,
-        """INSERT INTO mv_centroid_month_view
-              (centroid_id, month, locale, view, updated_at)
-           VALUES %s
-           ON CONFLICT (centroid_id, month, locale) DO UPDATE
-             SET view = EXCLUDED.view,
-                 updated_at = EXCLUDED.updated_at""",
-        [(c, m, loc, json.dumps(v)) for c, m, loc, v in rows],
-        template="(%s, %s::date, %s, %s::jsonb, NOW())",
+        "mv_centroid_month_view",
+        ("centroid_id", "month", "locale"),
+        ("view",),
+        rows,
+        key_casts=("", "::date", ""),
     )
-    return len(rows)
 
 
 def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False, batch_size=50):
@@ -319,10 +386,7 @@ def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False, batch_size=50)
     try:
         with conn.cursor() as cur:
             if not force and not is_stale(cur, max_age_hours):
-                cur.execute(
-                    "SELECT EXTRACT(EPOCH FROM (NOW() - MAX(updated_at)))/3600 FROM mv_centroid_month_view"
-                )
-                age = cur.fetchone()[0]
+                age = refresh_age_hours(cur, "mv_centroid_month_view")
                 print(
                     "Skipped: mv_centroid_month_view refreshed %.1fh ago (gate=%.1fh)"
                     % (age, max_age_hours)
@@ -351,26 +415,42 @@ def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False, batch_size=50)
                 "%d rows to materialize" % (len(targets), skipped_frozen, len(todo))
             )
 
-            batch = []
-            done = 0
+            # One fetch per (month, chunk of centroids) feeds every locale
+            by_month = {}
             for centroid_id, month, locale in todo:
-                view = materialize_one(cur, centroid_id, month, locale)
-                batch.append((centroid_id, month, locale, view))
-                if len(batch) >= batch_size:
-                    upsert_batch(cur, batch)
-                    conn.commit()
-                    done += len(batch)
-                    batch = []
-                    if done % 200 == 0:
+                centroids = by_month.setdefault(month, {})
+                centroids.setdefault(centroid_id, []).append(locale)
+
+            batch = []
+            done = changed = 0
+            for month, centroids in by_month.items():
+                ids = list(centroids)
+                for i in range(0, len(ids), MONTH_FETCH_CENTROIDS):
+                    chunk = ids[i : i + MONTH_FETCH_CENTROIDS]
+                    data = fetch_month(cur, chunk, month)
+                    for centroid_id in chunk:
+                        for locale in centroids[centroid_id]:
+                            view = build_view(
+                                centroid_id, month, locale, data[centroid_id]
+                            )
+                            batch.append((centroid_id, month, locale, view))
+                    if len(batch) >= batch_size:
+                        changed += upsert_batch(cur, batch)
+                        conn.commit()
+                        done += len(batch)
+                        batch = []
                         print("  ... %d/%d rows" % (done, len(todo)))
             if batch:
-                upsert_batch(cur, batch)
-                conn.commit()
+                changed += upsert_batch(cur, batch)
                 done += len(batch)
+            record_refresh(cur, "mv_centroid_month_view", done, changed)
+            conn.commit()
 
             elapsed = time.time() - start
-            print("Done: %d rows upserted (%.1fs)" % (done, elapsed))
-            return done
+            print(
+                "Done: %d rows checked, %d changed (%.1fs)" % (done, changed, elapsed)
+            )
+            return changed
     finally:
         conn.close()
 
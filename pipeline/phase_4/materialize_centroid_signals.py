@@ -5,16 +5,15 @@ with a simple PK lookup on pre-computed JSONB.
 """
 
 import argparse
-import json
 import sys
 import time
 from pathlib import Path
 
 import psycopg2
-from psycopg2.extras import execute_values
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.config import config
+from pipeline.phase_4.mv_upsert import record_refresh, upsert_changed
 
 SIGNAL_COLUMNS = ["persons", "orgs", "places", "commodities", "policies"]
 TOP_N = 5  # top signals overall per centroid+month
@@ -70,21 +69,31 @@ def materialize(month=None, all_months=False):
 
             if not months:
                 print("No months to process")
-                return
+                return 0
 
-            total_upserted = 0
+            total_checked = total_changed = 0
             for m in months:
-                count = _materialize_month(cur, m)
-                total_upserted += count
+                checked, changed = _materialize_month(cur, m)
+                total_checked += checked
+                total_changed += changed
 
+            record_refresh(cur, "mv_centroid_signals", total_checked, total_changed)
             conn.commit()
-            print("Done: %d centroid-months upserted" % total_upserted)
+            print(
+                "Done: %d centroid-months checked, %d changed"
+                % (total_checked, total_changed)
+            )
+            return total_changed
     finally:
         conn.close()
 
 
 def _materialize_month(cur, month_str):
-    """Compute top signals for all centroids in a single month."""
+    """Compute top signals for all centroids in a single month.
+
+    Returns:
+        (centroids checked, centroids changed)
+    """
     start = time.time()
     month_date = month_str + "-01"
 
@@ -115,21 +124,22 @@ def _materialize_month(cur, month_str):
 
     if not rows:
         print("  %s: no data" % month_str)
-        return 0
+        return 0, 0
 
-    # Upsert
-    execute_values(
+    changed = upsert_changed(
         cur,
-        """INSERT INTO mv_centroid_signals (centroid_id, month, signals, updated_at)
-           VALUES %s
-           ON CONFLICT (centroid_id, month) DO UPDATE
-           SET signals = EXCLUDED.signals, updated_at = NOW()""",
-        [(r[0], month_date, json.dumps(r[1])) for r in rows],
-        template="(%s, %s::date, %s::jsonb, NOW())",
+        "mv_centroid_signals",
+        ("centroid_id", "month"),
+        ("signals",),
+        [(r[0], month_date, r[1]) for r in rows],
+        key_casts=("", "::date"),
     )
     elapsed = time.time() - start
-    print("  %s: %d centroids (%.1fs)" % (month_str, len(rows), elapsed))
-    return len(rows)
+    print(
+        "  %s: %d centroids, %d changed (%.1fs)"
+        % (month_str, len(rows), changed, elapsed)
+    )
+    return len(rows), changed
 
 
 def main():
@@ -17,17 +17,16 @@ gate AND the frozen-skip.
 
 import argparse
 import calendar
-import json
 import re
 import sys
 import time
 from pathlib import Path
 
 import psycopg2
-from psycopg2.extras import execute_values
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.config import config
+from pipeline.phase_4.mv_upsert import record_refresh, refresh_age_hours, upsert_changed
 
 DEFAULT_MAX_AGE_HOURS = 12
 LOCALES = ("en", "de")
@@ -84,11 +83,7 @@ def get_connection():
 
 
 def is_stale(cur, max_age_hours):
-    cur.execute(
-        "SELECT EXTRACT(EPOCH FROM (NOW() - MAX(updated_at)))/3600 FROM mv_global_month_view"
-    )
-    row = cur.fetchone()
-    age = row[0] if row else None
+    age = refresh_age_hours(cur, "mv_global_month_view")
     return age is None or age >= max_age_hours
 
 
@@ -676,18 +671,15 @@ def materialize_one(cur, month, locale):
 
 
 def upsert_batch(cur, rows):
-    if not rows:
-        return 0
-    execute_values(
+    """rows: list of (month, locale, view_dict); returns rows changed"""
+    return upsert_changed(
         cur,
-        """INSERT INTO mv_global_month_view (month, locale, view, updated_at)
-           VALUES %s
-           ON CONFLICT (month, locale) DO UPDATE
-             SET view = EXCLUDED.view, updated_at = EXCLUDED.updated_at""",
-        [(m, loc, json.dumps(v)) for m, loc, v in rows],
-        template="(%s::date, %s, %s::jsonb, NOW())",
+        "mv_global_month_view",
+        ("month", "locale"),
+        ("view",),
+        rows,
+        key_casts=("::date", ""),
     )
-    return len(rows)
 
 
 def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False, batch_size=10):
@@ -695,10 +687,7 @@ def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False, batch_size=10)
     try:
         with conn.cursor() as cur:
             if not force and not is_stale(cur, max_age_hours):
-                cur.execute(
-                    "SELECT EXTRACT(EPOCH FROM (NOW() - MAX(updated_at)))/3600 FROM mv_global_month_view"
-                )
-                age = cur.fetchone()[0]
+                age = refresh_age_hours(cur, "mv_global_month_view")
                 print(
                     "Skipped: mv_global_month_view refreshed %.1fh ago (gate=%.1fh)"
                     % (age, max_age_hours)
@@ -725,25 +714,28 @@ def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False, batch_size=10)
             )
 
             batch = []
-            done = 0
+            done = changed = 0
             for month, locale in todo:
                 view = materialize_one(cur, month, locale)
                 if view is None:
                     continue
                 batch.append((month, locale, view))
                 if len(batch) >= batch_size:
-                    upsert_batch(cur, batch)
+                    changed += upsert_batch(cur, batch)
                     conn.commit()
                     done += len(batch)
                     batch = []
             if batch:
-                upsert_batch(cur, batch)
-                conn.commit()
+                changed += upsert_batch(cur, batch)
                 done += len(batch)
+            record_refresh(cur, "mv_global_month_view", done, changed)
+            conn.commit()
 
             elapsed = time.time() - start
-            print("Done: %d rows upserted (%.1fs)" % (done, elapsed))
-            return done
+            print(
+                "Done: %d rows checked, %d changed (%.1fs)" % (done, changed, elapsed)
+            )
+            return changed
     finally:
         conn.close()
 
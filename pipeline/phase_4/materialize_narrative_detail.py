@@ -17,17 +17,16 @@ new event_strategic_narratives rows automatically.
 """
 
 import argparse
-import json
 import sys
 import time
 from collections import defaultdict
 from pathlib import Path
 
 import psycopg2
-from psycopg2.extras import execute_values
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.config import config
+from pipeline.phase_4.mv_upsert import record_refresh, refresh_age_hours, upsert_changed
 
 DEFAULT_MAX_AGE_HOURS = 12
 LOCALES = ("en", "de")
@@ -44,11 +43,7 @@ def get_connection():
 
 
 def is_stale(cur, max_age_hours):
-    cur.execute(
-        "SELECT EXTRACT(EPOCH FROM (NOW() - MAX(updated_at)))/3600 FROM mv_narrative_detail"
-    )
-    row = cur.fetchone()
-    age = row[0] if row else None
+    age = refresh_age_hours(cur, "mv_narrative_detail")
     return age is None or age >= max_age_hours
 
 
@@ -249,18 +244,10 @@ def fetch_competing_all(cur):
 
 
 def upsert_batch(cur, rows):
-    if not rows:
-        return 0
-    execute_values(
-        cur,
-        """INSERT INTO mv_narrative_detail (narrative_id, locale, view, updated_at)
-           VALUES %s
-           ON CONFLICT (narrative_id, locale) DO UPDATE
-             SET view = EXCLUDED.view, updated_at = EXCLUDED.updated_at""",
-        [(nid, loc, json.dumps(v)) for nid, loc, v in rows],
-        template="(%s, %s, %s::jsonb, NOW())",
+    """rows: list of (narrative_id, locale, view_dict); returns rows changed"""
+    return upsert_changed(
+        cur, "mv_narrative_detail", ("narrative_id", "locale"), ("view",), rows
     )
-    return len(rows)
 
 
 def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False):
@@ -268,10 +255,7 @@ def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False):
     try:
         with conn.cursor() as cur:
             if not force and not is_stale(cur, max_age_hours):
-                cur.execute(
-                    "SELECT EXTRACT(EPOCH FROM (NOW() - MAX(updated_at)))/3600 FROM mv_narrative_detail"
-                )
-                age = cur.fetchone()[0]
+                age = refresh_age_hours(cur, "mv_narrative_detail")
                 print(
                     "Skipped: mv_narrative_detail refreshed %.1fh ago (gate=%.1fh)"
                     % (age, max_age_hours)
@@ -286,7 +270,7 @@ def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False):
             weekly = fetch_weekly_activity_all(cur)
             competing = fetch_competing_all(cur)
 
-            done = 0
+            done = changed = 0
             batch = []
             for locale in LOCALES:
                 meta = fetch_narrative_meta_all(cur, locale)
@@ -303,18 +287,21 @@ def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False):
                     }
                     batch.append((nid_str, locale, view))
                     if len(batch) >= BATCH_SIZE:
-                        upsert_batch(cur, batch)
+                        changed += upsert_batch(cur, batch)
                         conn.commit()
                         done += len(batch)
                         batch = []
             if batch:
-                upsert_batch(cur, batch)
-                conn.commit()
+                changed += upsert_batch(cur, batch)
                 done += len(batch)
+            record_refresh(cur, "mv_narrative_detail", done, changed)
+            conn.commit()
 
             elapsed = time.time() - start
-            print("Done: %d rows upserted (%.1fs)" % (done, elapsed))
-            return done
+            print(
+                "Done: %d rows checked, %d changed (%.1fs)" % (done, changed, elapsed)
+            )
+            return changed
     finally:
         conn.close()
 
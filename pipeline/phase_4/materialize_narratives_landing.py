@@ -14,16 +14,15 @@ bypasses the gate (for JSONB shape changes).
 """
 
 import argparse
-import json
 import sys
 import time
 from pathlib import Path
 
 import psycopg2
-from psycopg2.extras import execute_values
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.config import config
+from pipeline.phase_4.mv_upsert import record_refresh, refresh_age_hours, upsert_changed
 
 DEFAULT_MAX_AGE_HOURS = 12
 LOCALES = ("en", "de")
@@ -37,11 +36,7 @@ def get_connection():
 
 
 def is_stale(cur, max_age_hours):
-    cur.execute(
-        "SELECT EXTRACT(EPOCH FROM (NOW() - MAX(updated_at)))/3600 FROM mv_narratives_landing"
-    )
-    row = cur.fetchone()
-    age = row[0] if row else None
+    age = refresh_age_hours(cur, "mv_narratives_landing")
     return age is None or age >= max_age_hours
 
 
@@ -189,18 +184,8 @@ def materialize_one(cur, locale, sparklines, meta_activity):
 
 
 def upsert_batch(cur, rows):
-    if not rows:
-        return 0
-    execute_values(
-        cur,
-        """INSERT INTO mv_narratives_landing (locale, view, updated_at)
-           VALUES %s
-           ON CONFLICT (locale) DO UPDATE
-             SET view = EXCLUDED.view, updated_at = EXCLUDED.updated_at""",
-        [(loc, json.dumps(v)) for loc, v in rows],
-        template="(%s, %s::jsonb, NOW())",
-    )
-    return len(rows)
+    """rows: list of (locale, view_dict); returns rows changed"""
+    return upsert_changed(cur, "mv_narratives_landing", ("locale",), ("view",), rows)
 
 
 def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False):
@@ -208,10 +193,7 @@ def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False):
     try:
         with conn.cursor() as cur:
             if not force and not is_stale(cur, max_age_hours):
-                cur.execute(
-                    "SELECT EXTRACT(EPOCH FROM (NOW() - MAX(updated_at)))/3600 FROM mv_narratives_landing"
-                )
-                age = cur.fetchone()[0]
+                age = refresh_age_hours(cur, "mv_narratives_landing")
                 print(
                     "Skipped: mv_narratives_landing refreshed %.1fh ago (gate=%.1fh)"
                     % (age, max_age_hours)
@@ -227,14 +209,16 @@ def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False):
                 view = materialize_one(cur, locale, sparklines, meta_activity)
                 rows.append((locale, view))
 
-            upsert_batch(cur, rows)
+            changed = upsert_batch(cur, rows)
+            record_refresh(cur, "mv_narratives_landing", len(rows), changed)
             conn.commit()
 
             elapsed = time.time() - start
             print(
-                "Done: %d rows upserted (%d narratives, %d meta, %d sparklines, %d meta_activity) in %.1fs"
+                "Done: %d rows checked, %d changed (%d narratives, %d meta, %d sparklines, %d meta_activity) in %.1fs"
                 % (
                     len(rows),
+                    changed,
                     len(rows[0][1]["narratives"]),
                     len(rows[0][1]["meta_narratives"]),
                     len(sparklines),
@@ -242,7 +226,7 @@ def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False):
                     elapsed,
                 )
             )
-            return len(rows)
+            return changed
     finally:
         conn.close()
 
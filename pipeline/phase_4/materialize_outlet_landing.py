@@ -19,17 +19,16 @@ the TS source.
 """
 
 import argparse
-import json
 import re
 import sys
 import time
 from pathlib import Path
 
 import psycopg2
-from psycopg2.extras import execute_values
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.config import config
+from pipeline.phase_4.mv_upsert import record_refresh, refresh_age_hours, upsert_changed
 
 DEFAULT_MAX_AGE_HOURS = 12
 SIBLING_LIMIT = 50
@@ -46,11 +45,7 @@ def get_connection():
 
 
 def is_stale(cur, max_age_hours):
-    cur.execute(
-        "SELECT EXTRACT(EPOCH FROM (NOW() - MAX(updated_at)))/3600 FROM mv_outlet_landing"
-    )
-    row = cur.fetchone()
-    age = row[0] if row else None
+    age = refresh_age_hours(cur, "mv_outlet_landing")
     return age is None or age >= max_age_hours
 
 
@@ -435,18 +430,8 @@ def materialize_one(cur, pubs_values, feed, stance_by_month_map):
 
 
 def upsert_batch(cur, rows):
-    if not rows:
-        return 0
-    execute_values(
-        cur,
-        """INSERT INTO mv_outlet_landing (feed_name, view, updated_at)
-           VALUES %s
-           ON CONFLICT (feed_name) DO UPDATE
-             SET view = EXCLUDED.view, updated_at = EXCLUDED.updated_at""",
-        [(fn, json.dumps(v)) for fn, v in rows],
-        template="(%s, %s::jsonb, NOW())",
-    )
-    return len(rows)
+    """rows: list of (feed_name, view_dict); returns rows changed"""
+    return upsert_changed(cur, "mv_outlet_landing", ("feed_name",), ("view",), rows)
 
 
 def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False):
@@ -454,10 +439,7 @@ def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False):
     try:
         with conn.cursor() as cur:
             if not force and not is_stale(cur, max_age_hours):
-                cur.execute(
-                    "SELECT EXTRACT(EPOCH FROM (NOW() - MAX(updated_at)))/3600 FROM mv_outlet_landing"
-                )
-                age = cur.fetchone()[0]
+                age = refresh_age_hours(cur, "mv_outlet_landing")
                 print(
                     "Skipped: mv_outlet_landing refreshed %.1fh ago (gate=%.1fh)"
                     % (age, max_age_hours)
@@ -475,24 +457,27 @@ def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False):
                 % (len(feeds), len(pairs), len(stance_by_month_map))
             )
 
-            done = 0
+            done = changed = 0
             batch = []
             for feed in feeds:
                 view = materialize_one(cur, pubs_values, feed, stance_by_month_map)
                 batch.append((feed[0], view))
                 if len(batch) >= BATCH_SIZE:
-                    upsert_batch(cur, batch)
+                    changed += upsert_batch(cur, batch)
                     conn.commit()
                     done += len(batch)
                     batch = []
             if batch:
-                upsert_batch(cur, batch)
-                conn.commit()
+                changed += upsert_batch(cur, batch)
                 done += len(batch)
+            record_refresh(cur, "mv_outlet_landing", done, changed)
+            conn.commit()
 
             elapsed = time.time() - start
-            print("Done: %d rows upserted (%.1fs)" % (done, elapsed))
-            return done
+            print(
+                "Done: %d rows checked, %d changed (%.1fs)" % (done, changed, elapsed)
+            )
+            return changed
     finally:
         conn.close()
 
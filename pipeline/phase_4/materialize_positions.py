@@ -16,14 +16,13 @@ publishers (never stored). 12h staleness gate; --force to rebuild.
 """
 
 import argparse
-import json
 import sys
 import time
 from collections import defaultdict
 from pathlib import Path
 
 import psycopg2
-from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.extras import RealDictCursor
 
 ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(ROOT))
@@ -399,15 +398,15 @@ def build(cur):
 
 
 def is_stale(cur, table, max_age_hours):
-    cur.execute(
-        f"SELECT EXTRACT(EPOCH FROM (NOW()-MAX(updated_at)))/3600 AS age FROM {table}"
-    )
-    row = cur.fetchone()
-    age = row["age"] if row else None
+    from pipeline.phase_4.mv_upsert import refresh_age_hours
+
+    age = refresh_age_hours(cur, table)
     return age is None or age >= max_age_hours
 
 
 def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False):
+    from pipeline.phase_4.mv_upsert import record_refresh, upsert_changed
+
     conn = get_connection()
     try:
         with conn.cursor() as cur:
@@ -417,33 +416,38 @@ def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False):
             start = time.time()
             built = build(cur)
 
-            execute_values(
-                cur,
-                """INSERT INTO mv_positions_landing (locale, view, updated_at)
-                   VALUES %s ON CONFLICT (locale) DO UPDATE
-                     SET view = EXCLUDED.view, updated_at = EXCLUDED.updated_at""",
-                [(loc, json.dumps(landing)) for loc, (landing, _) in built.items()],
-                template="(%s, %s::jsonb, NOW())",
+            landing_rows = [(loc, landing) for loc, (landing, _) in built.items()]
+            landing_changed = upsert_changed(
+                cur, "mv_positions_landing", ("locale",), ("view",), landing_rows
             )
             detail_rows = [
-                (pid, loc, json.dumps(view))
+                (pid, loc, view)
                 for loc, (_, detail) in built.items()
                 for pid, view in detail.items()
             ]
-            execute_values(
+            detail_changed = upsert_changed(
                 cur,
-                """INSERT INTO mv_position_detail (position_id, locale, view, updated_at)
-                   VALUES %s ON CONFLICT (position_id, locale) DO UPDATE
-                     SET view = EXCLUDED.view, updated_at = EXCLUDED.updated_at""",
+                "mv_position_detail",
+                ("position_id", "locale"),
+                ("view",),
                 detail_rows,
-                template="(%s, %s, %s::jsonb, NOW())",
             )
+            record_refresh(
+                cur, "mv_positions_landing", len(landing_rows), landing_changed
+            )
+            record_refresh(cur, "mv_position_detail", len(detail_rows), detail_changed)
             conn.commit()
             print(
-                "Done: %d landing rows, %d detail rows (%.1fs)"
-                % (len(built), len(detail_rows), time.time() - start)
+                "Done: %d/%d landing rows, %d/%d detail rows changed (%.1fs)"
+                % (
+                    landing_changed,
+                    len(landing_rows),
+                    detail_changed,
+                    len(detail_rows),
+                    time.time() - start,
+                )
             )
-            return len(detail_rows)
+            return landing_changed + detail_changed
     finally:
         conn.close()
 
@@ -6,7 +6,6 @@ temporal patterns, and signal richness. All SQL -- no LLM calls.
 """
 
 import argparse
-import json
 import sys
 import time
 from collections import Counter
@@ -17,6 +16,7 @@ from psycopg2.extras import RealDictCursor
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.config import config
+from pipeline.phase_4.mv_upsert import record_refresh, upsert_changed
 
 
 def _load_publisher_map(cur):
@@ -338,9 +338,9 @@ def materialize(feed_name=None):
 
             if not feeds:
                 print("No feeds to process")
-                return
+                return 0
 
-            total = 0
+            rows = []
             skipped = 0
             for f in feeds:
                 name = f["name"]
@@ -352,21 +352,20 @@ def materialize(feed_name=None):
                     skipped += 1
                     continue
 
-                cur.execute(
-                    """INSERT INTO mv_publisher_stats (feed_name, stats, updated_at)
-                       VALUES (%s, %s, NOW())
-                       ON CONFLICT (feed_name) DO UPDATE
-                       SET stats = EXCLUDED.stats, updated_at = NOW()""",
-                    (name, json.dumps(stats)),
-                )
-                total += 1
+                rows.append((name, stats))
                 print("  %s: %d titles (%.1fs)" % (name, stats["title_count"], elapsed))
 
+            changed = upsert_changed(
+                cur, "mv_publisher_stats", ("feed_name",), ("stats",), rows
+            )
+            if not feed_name:
+                record_refresh(cur, "mv_publisher_stats", len(rows), changed)
             conn.commit()
             print(
-                "Done: %d feeds materialized, %d skipped (<10 titles)"
-                % (total, skipped)
+                "Done: %d feeds materialized (%d changed), %d skipped (<10 titles)"
+                % (len(rows), changed, skipped)
             )
+            return changed
     finally:
         conn.close()
 
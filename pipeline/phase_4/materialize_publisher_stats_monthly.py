@@ -12,7 +12,6 @@ Usage:
 """
 
 import argparse
-import json
 import sys
 import time
 from collections import Counter
@@ -28,6 +27,7 @@ from pipeline.phase_4.materialize_publisher_stats import (  # noqa: E402
     _top_n,
     get_connection,
 )
+from pipeline.phase_4.mv_upsert import record_refresh, upsert_changed  # noqa: E402
 
 MIN_TITLES_FOR_MONTH = 10
 
@@ -157,7 +157,7 @@ def materialize_month(month, feed_name=None):
                 )
                 feeds = cur.fetchall()
             print("Month %s: processing %d feeds" % (month, len(feeds)), flush=True)
-            written = 0
+            rows = []
             skipped = 0
             for f in feeds:
                 name = f["name"]
@@ -165,22 +165,24 @@ def materialize_month(month, feed_name=None):
                 if stats is None:
                     skipped += 1
                     continue
-                cur.execute(
-                    """
-                    INSERT INTO mv_publisher_stats_monthly (feed_name, month, stats, updated_at)
-                    VALUES (%s, %s::date, %s, NOW())
-                    ON CONFLICT (feed_name, month) DO UPDATE
-                    SET stats = EXCLUDED.stats, updated_at = NOW()
-                    """,
-                    (name, start, json.dumps(stats)),
-                )
-                written += 1
+                rows.append((name, start, stats))
+            changed = upsert_changed(
+                cur,
+                "mv_publisher_stats_monthly",
+                ("feed_name", "month"),
+                ("stats",),
+                rows,
+                key_casts=("", "::date"),
+            )
+            if not feed_name:
+                record_refresh(cur, "mv_publisher_stats_monthly", len(rows), changed)
             conn.commit()
             print(
-                "  %s: %d written, %d skipped (< %d titles)"
-                % (month, written, skipped, MIN_TITLES_FOR_MONTH),
+                "  %s: %d written (%d changed), %d skipped (< %d titles)"
+                % (month, len(rows), changed, skipped, MIN_TITLES_FOR_MONTH),
                 flush=True,
             )
+            return changed
     finally:
         conn.close()
 
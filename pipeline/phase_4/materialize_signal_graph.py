@@ -3,19 +3,29 @@
 Replaces the expensive 7-CTE self-join edges query in the frontend
 with a simple PK lookup on pre-computed JSONB.
 
+Graphs are read from incrementally maintained tables instead of
+re-deriving co-occurrence from titles each run: event_signals (event ->
+signal incidence) and signal_edges_monthly (events per signal pair and
+month). Triggers queue events whose titles, labels, date, catchall flag or
+merged_into changed; sync_incidence() applies just those. Monthly graphs
+read the edge counters; the rolling 30d graph joins incidence rows of the
+top signals. Without the tables (migration 20261016_signal_graph_incidence
+not applied) it falls back to the full recompute.
+
 Part of the mv_* materialization pattern (see also: materialize_centroid_signals.py).
 """
 
 import argparse
-import json
 import sys
 import time
 from pathlib import Path
 
 import psycopg2
+from psycopg2 import errors as pg_errors
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.config import config
+from pipeline.phase_4.mv_upsert import record_refresh, upsert_changed
 
 SIGNAL_COLUMNS = [
     "persons",
@@ -46,7 +56,7 @@ def _build_nodes_sql(date_clause, per_type):
             "JOIN event_v3_titles evt ON evt.event_id = e.id "
             "JOIN title_labels tl ON tl.title_id = evt.title_id "
             "CROSS JOIN LATERAL unnest(tl.%s) AS val "
-            "WHERE %s AND e.is_catchall = false "
+            "WHERE %s AND e.is_catchall = false AND e.merged_into IS NULL "
             "GROUP BY val ORDER BY event_count DESC LIMIT %d"
             % (col, col, date_clause, per_type)
         )
@@ -64,7 +74,7 @@ def _build_edges_sql(date_clause, per_type):
             "JOIN event_v3_titles evt ON evt.event_id = e.id "
             "JOIN title_labels tl ON tl.title_id = evt.title_id "
             "CROSS JOIN LATERAL unnest(tl.%s) AS val "
-            "WHERE %s AND e.is_catchall = false "
+            "WHERE %s AND e.is_catchall = false AND e.merged_into IS NULL "
             "GROUP BY val ORDER BY COUNT(DISTINCT evt.event_id) DESC LIMIT %d"
             ")" % (col, col, col, date_clause, per_type)
         )
@@ -88,7 +98,7 @@ def _build_edges_sql(date_clause, per_type):
             JOIN title_labels tl ON tl.title_id = evt.title_id
             JOIN events_v3 e ON e.id = evt.event_id
             CROSS JOIN LATERAL (%s) expanded(sig_type, value)
-            WHERE %s AND e.is_catchall = false
+            WHERE %s AND e.is_catchall = false AND e.merged_into IS NULL
               AND EXISTS (SELECT 1 FROM all_top WHERE all_top.signal_type = expanded.sig_type AND all_top.value = expanded.value)
         )
         SELECT a.value as source, b.value as target,
@@ -108,45 +118,307 @@ def _build_edges_sql(date_clause, per_type):
     )
 
 
-def materialize(period=None):
+# ─── incremental incidence + edge counters ──────────────────────────────
+# event_signals / signal_edges_monthly / signal_graph_dirty, see
+# db/migrations/20261016_signal_graph_incidence.sql. Triggers only queue
+# event ids; this module is the single writer of both tables.
+
+DIRTY_BATCH = 2000  # queued events applied per transaction
+MIN_EDGE_WEIGHT = 3
+
+_SIGNAL_UNNEST = " UNION ALL ".join(
+    "SELECT '%s'::text, unnest(COALESCE(tl.%s, '{}'))" % (col, col)
+    for col in SIGNAL_COLUMNS
+)
+
+# Distinct signals of live events (not catchall, not merged away)
+_EVENT_SIGNALS_SQL = (
+    """
+    SELECT DISTINCT e.id AS event_id, x.signal_type, x.value, e.date AS event_date
+      FROM events_v3 e
+      JOIN event_v3_titles evt ON evt.event_id = e.id
+      JOIN title_labels tl ON tl.title_id = evt.title_id
+      CROSS JOIN LATERAL (%s) x(signal_type, value)
+     WHERE %%s
+       AND e.is_catchall = false AND e.merged_into IS NULL
+       AND e.date IS NOT NULL AND x.value IS NOT NULL
+"""
+    % _SIGNAL_UNNEST
+)
+
+
+def _pairs_sql(table, sign):
+    """Signal pairs per event of an incidence-shaped table, a < b"""
+    return (
+        "SELECT a.signal_type AS type_a, a.value AS value_a, "
+        "b.signal_type AS type_b, b.value AS value_b, "
+        "date_trunc('month', a.event_date)::date AS month, %d AS sign "
+        "FROM %s a JOIN %s b ON b.event_id = a.event_id "
+        "AND (a.value, a.signal_type) < (b.value, b.signal_type)" % (sign, table, table)
+    )
+
+
+def rebuild_incidence(conn):
+    """Recompute event_signals and signal_edges_monthly from scratch.
+
+    Queued events stay queued; re-applying them is a no-op unless they
+    changed after this snapshot.
+    """
+    start = time.time()
+    with conn.cursor() as cur:
+        cur.execute("TRUNCATE event_signals, signal_edges_monthly")
+        cur.execute(
+            "INSERT INTO event_signals (event_id, signal_type, value, event_date) "
+            + _EVENT_SIGNALS_SQL % "true"
+        )
+        incidence = cur.rowcount
+        cur.execute(
+            """INSERT INTO signal_edges_monthly
+                   (type_a, value_a, type_b, value_b, month, event_count)
+               SELECT type_a, value_a, type_b, value_b, month, COUNT(*)
+                 FROM (%s) p
+                GROUP BY type_a, value_a, type_b, value_b, month"""
+            % _pairs_sql("event_signals", 1)
+        )
+        edges = cur.rowcount
+    conn.commit()
+    print(
+        "  rebuilt: %d incidence rows, %d edge counters (%.1fs)"
+        % (incidence, edges, time.time() - start)
+    )
+
+
+def apply_dirty(conn, batch_size=DIRTY_BATCH):
+    """Drain signal_graph_dirty: swap each queued event's incidence rows
+    and move the edge counters by the pair difference.
+
+    Claiming (DELETE ... SKIP LOCKED) and applying share a transaction, so
+    a failed batch goes back to the queue. Returns events applied.
+    """
+    applied = 0
+    while True:
+        with conn.cursor() as cur:
+            cur.execute(
+                """CREATE TEMP TABLE sg_batch (event_id uuid PRIMARY KEY)
+                   ON COMMIT DROP"""
+            )
+            cur.execute(
+                """WITH claimed AS (
+                       DELETE FROM signal_graph_dirty
+                        WHERE event_id IN (
+                              SELECT event_id FROM signal_graph_dirty
+                               ORDER BY event_id
+                               LIMIT %s
+                                 FOR UPDATE SKIP LOCKED)
+                       RETURNING event_id)
+                   INSERT INTO sg_batch SELECT event_id FROM claimed""",
+                (batch_size,),
+            )
+            claimed = cur.rowcount
+            if not claimed:
+                conn.commit()
+                return applied
+
+            cur.execute(
+                "CREATE TEMP TABLE sg_new ON COMMIT DROP AS "
+                + _EVENT_SIGNALS_SQL % "e.id IN (SELECT event_id FROM sg_batch)"
+            )
+            cur.execute(
+                """CREATE TEMP TABLE sg_old ON COMMIT DROP AS
+                   SELECT s.event_id, s.signal_type, s.value, s.event_date
+                     FROM event_signals s
+                     JOIN sg_batch b ON b.event_id = s.event_id"""
+            )
+            # Pairs present before and after cancel out; counters that
+            # reach zero are dropped.
+            cur.execute(
+                """CREATE TEMP TABLE sg_zero ON COMMIT DROP AS
+                   SELECT type_a, value_a, type_b, value_b, month
+                     FROM signal_edges_monthly WITH NO DATA"""
+            )
+            cur.execute(
+                """WITH deltas AS (
+                       SELECT type_a, value_a, type_b, value_b, month,
+                              SUM(sign) AS delta
+                         FROM (%s UNION ALL %s) p
+                        GROUP BY type_a, value_a, type_b, value_b, month
+                       HAVING SUM(sign) <> 0
+                   ), bumped AS (
+                       INSERT INTO signal_edges_monthly
+                           (type_a, value_a, type_b, value_b, month, event_count)
+                       SELECT type_a, value_a, type_b, value_b, month, delta
+                         FROM deltas
+                       ON CONFLICT (month, type_a, value_a, type_b, value_b)
+                       DO UPDATE SET event_count =
+                           signal_edges_monthly.event_count + EXCLUDED.event_count
+                       RETURNING type_a, value_a, type_b, value_b, month,
+                                 event_count)
+                   INSERT INTO sg_zero
+                   SELECT type_a, value_a, type_b, value_b, month
+                     FROM bumped WHERE event_count <= 0"""
+                % (_pairs_sql("sg_new", 1), _pairs_sql("sg_old", -1))
+            )
+            cur.execute(
+                """DELETE FROM signal_edges_monthly s
+                    USING sg_zero z
+                   WHERE s.month = z.month
+                     AND s.type_a = z.type_a AND s.value_a = z.value_a
+                     AND s.type_b = z.type_b AND s.value_b = z.value_b"""
+            )
+            cur.execute(
+                """DELETE FROM event_signals s
+                    USING sg_batch b WHERE s.event_id = b.event_id"""
+            )
+            cur.execute(
+                """INSERT INTO event_signals (event_id, signal_type, value, event_date)
+                   SELECT event_id, signal_type, value, event_date FROM sg_new"""
+            )
+        conn.commit()
+        applied += claimed
+
+
+def sync_incidence(conn, rebuild=False):
+    """Bring event_signals / signal_edges_monthly up to date (rebuild when
+    asked or never filled, then apply queued events)."""
+    if not rebuild:
+        with conn.cursor() as cur:
+            cur.execute("SELECT EXISTS (SELECT 1 FROM event_signals)")
+            rebuild = not cur.fetchone()[0]
+    if rebuild:
+        rebuild_incidence(conn)
+    applied = apply_dirty(conn)
+    if applied:
+        print("  applied %d queued events" % applied)
+
+
+def _window(period):
+    """(event_signals date filter, counter month or None) for a period"""
+    if period == "rolling":
+        return "s.event_date >= CURRENT_DATE - INTERVAL '30 days'", None
+    month = "%s-01" % period
+    return (
+        "s.event_date >= '%s'::date AND s.event_date < ('%s'::date + INTERVAL '1 month')"
+        % (month, month),
+        month,
+    )
+
+
+def read_nodes(cur, period, per_type=PER_TYPE):
+    """Top `per_type` signals per type by events in the period"""
+    date_clause, _ = _window(period)
+    cur.execute(
+        """WITH counts AS (
+               SELECT s.signal_type, s.value, COUNT(*)::int AS event_count
+                 FROM event_signals s
+                WHERE %s
+                GROUP BY s.signal_type, s.value
+           ), ranked AS (
+               SELECT *, ROW_NUMBER() OVER (
+                          PARTITION BY signal_type
+                          ORDER BY event_count DESC, value) AS rnk
+                 FROM counts
+           )
+           SELECT signal_type, value, event_count
+             FROM ranked
+            WHERE rnk <= %%s
+            ORDER BY array_position(%%s::text[], signal_type), rnk"""
+        % date_clause,
+        (per_type, SIGNAL_COLUMNS),
+    )
+    return cur.fetchall()
+
+
+def read_edges(cur, period, node_rows):
+    """Co-occurrence edges between the period's top signals. Months read
+    the counters; the rolling window joins incidence rows of top signals."""
+    if not node_rows:
+        return []
+    date_clause, month = _window(period)
+    types = [r[0] for r in node_rows]
+    values = [r[1] for r in node_rows]
+    if month:
+        cur.execute(
+            """SELECT m.value_a, m.value_b, m.type_a, m.type_b, m.event_count
+                 FROM signal_edges_monthly m
+                 JOIN unnest(%s::text[], %s::text[]) ta(signal_type, value)
+                   ON ta.signal_type = m.type_a AND ta.value = m.value_a
+                 JOIN unnest(%s::text[], %s::text[]) tb(signal_type, value)
+                   ON tb.signal_type = m.type_b AND tb.value = m.value_b
+                WHERE m.month = %s AND m.event_count >= %s
+                ORDER BY m.event_count DESC, m.value_a, m.value_b""",
+            (types, values, types, values, month, MIN_EDGE_WEIGHT),
+        )
+        return cur.fetchall()
+    cur.execute(
+        """WITH event_sigs AS (
+               SELECT s.event_id, s.signal_type, s.value
+                 FROM event_signals s
+                 JOIN unnest(%%s::text[], %%s::text[]) t(signal_type, value)
+                   ON t.signal_type = s.signal_type AND t.value = s.value
+                WHERE %s
+           )
+           SELECT a.value, b.value, a.signal_type, b.signal_type,
+                  COUNT(*)::int AS weight
+             FROM event_sigs a
+             JOIN event_sigs b ON a.event_id = b.event_id
+              AND (a.value, a.signal_type) < (b.value, b.signal_type)
+            GROUP BY a.value, b.value, a.signal_type, b.signal_type
+           HAVING COUNT(*) >= %%s
+            ORDER BY weight DESC, a.value, b.value"""
+        % date_clause,
+        (types, values, MIN_EDGE_WEIGHT),
+    )
+    return cur.fetchall()
+
+
+def _recompute(conn, period):
+    """Full recompute straight from titles (no incidence tables yet)"""
+    if period == "rolling":
+        date_clause = "e.date >= CURRENT_DATE - INTERVAL '30 days'"
+    else:
+        date_clause = (
+            "e.date >= '%s-01'::date AND e.date < ('%s-01'::date + INTERVAL '1 month')"
+            % (period, period)
+        )
+    with conn.cursor() as cur:
+        cur.execute(_build_nodes_sql(date_clause, PER_TYPE))
+        node_rows = cur.fetchall()
+        cur.execute(_build_edges_sql(date_clause, PER_TYPE))
+        edge_rows = cur.fetchall()
+    return node_rows, edge_rows
+
+
+def materialize(period=None, rebuild=False):
     """Compute and upsert signal graph.
 
     Args:
         period: 'rolling' (default) or a month string like '2026-02'.
+        rebuild: recompute the incidence + edge counters from scratch first.
     """
     if period is None:
         period = "rolling"
 
     conn = get_connection()
     try:
-        # Disable JIT for this heavy query
+        # Disable JIT for the heavy (rebuild / fallback) queries
         with conn.cursor() as cur:
             cur.execute("SET jit = off")
 
         start = time.time()
 
-        if period == "rolling":
-            date_clause = "e.date >= CURRENT_DATE - INTERVAL '30 days'"
-        else:
-            date_clause = (
-                "e.date >= '%s-01'::date AND e.date < ('%s-01'::date + INTERVAL '1 month')"
-                % (period, period)
-            )
-
-        # Compute nodes
-        with conn.cursor() as cur:
-            cur.execute(_build_nodes_sql(date_clause, PER_TYPE))
-            node_rows = cur.fetchall()
+        try:
+            sync_incidence(conn, rebuild)
+            with conn.cursor() as cur:
+                node_rows = read_nodes(cur, period)
+                edge_rows = read_edges(cur, period, node_rows)
+        except pg_errors.UndefinedTable as e:
+            conn.rollback()
+            print("  event_signals missing (%s); full recompute" % e)
+            node_rows, edge_rows = _recompute(conn, period)
 
         nodes = [
             {"signal_type": r[0], "value": r[1], "event_count": r[2]} for r in node_rows
         ]
-
-        # Compute edges
-        with conn.cursor() as cur:
-            cur.execute(_build_edges_sql(date_clause, PER_TYPE))
-            edge_rows = cur.fetchall()
-
         edges = [
             {
                 "source": r[0],
@@ -158,22 +430,30 @@ def materialize(period=None):
             for r in edge_rows
         ]
 
-        # Upsert
+        # Upsert (skipped when the graph did not change)
         with conn.cursor() as cur:
-            cur.execute(
-                """INSERT INTO mv_signal_graph (period, nodes, edges, updated_at)
-                   VALUES (%s, %s, %s, NOW())
-                   ON CONFLICT (period) DO UPDATE
-                   SET nodes = EXCLUDED.nodes, edges = EXCLUDED.edges, updated_at = NOW()""",
-                (period, json.dumps(nodes), json.dumps(edges)),
+            changed = upsert_changed(
+                cur,
+                "mv_signal_graph",
+                ("period",),
+                ("nodes", "edges"),
+                [(period, nodes, edges)],
             )
+            record_refresh(cur, "mv_signal_graph", 1, changed)
         conn.commit()
 
         elapsed = time.time() - start
         print(
-            "  %s: %d nodes, %d edges (%.1fs)"
-            % (period, len(nodes), len(edges), elapsed)
+            "  %s: %d nodes, %d edges, %s (%.1fs)"
+            % (
+                period,
+                len(nodes),
+                len(edges),
+                "changed" if changed else "unchanged",
+                elapsed,
+            )
         )
+        return changed
     finally:
         conn.close()
 
@@ -187,8 +467,13 @@ def main():
         default="rolling",
         help="'rolling' (default) or a month like '2026-02'",
     )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Recompute the event-signal incidence and edge counters first",
+    )
     args = parser.parse_args()
-    materialize(period=args.period)
+    materialize(period=args.period, rebuild=args.rebuild)
 
 
 if __name__ == "__main__":
@@ -23,16 +23,15 @@ Refresh 12h, no frozen-skip — rolling 30d window.
 """
 
 import argparse
-import json
 import sys
 import time
 from pathlib import Path
 
 import psycopg2
-from psycopg2.extras import execute_values
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.config import config
+from pipeline.phase_4.mv_upsert import record_refresh, refresh_age_hours, upsert_changed
 
 DEFAULT_MAX_AGE_HOURS = 12
 PERIOD = "rolling"
@@ -63,11 +62,7 @@ def get_connection():
 
 
 def is_stale(cur, max_age_hours, table):
-    cur.execute(
-        f"SELECT EXTRACT(EPOCH FROM (NOW() - MAX(updated_at)))/3600 FROM {table}"
-    )
-    row = cur.fetchone()
-    age = row[0] if row else None
+    age = refresh_age_hours(cur, table)
     return age is None or age >= max_age_hours
 
 
@@ -144,18 +139,14 @@ def fetch_category(cur, signal_type):
 
 
 def upsert_categories(cur, rows):
-    if not rows:
-        return 0
-    execute_values(
+    """rows: list of (signal_type, entries); returns rows changed"""
+    return upsert_changed(
         cur,
-        """INSERT INTO mv_signal_category (signal_type, period, view, updated_at)
-           VALUES %s
-           ON CONFLICT (signal_type, period) DO UPDATE
-             SET view = EXCLUDED.view, updated_at = EXCLUDED.updated_at""",
-        [(st, PERIOD, json.dumps({"entries": entries})) for st, entries in rows],
-        template="(%s, %s, %s::jsonb, NOW())",
+        "mv_signal_category",
+        ("signal_type", "period"),
+        ("view",),
+        [(st, PERIOD, {"entries": entries}) for st, entries in rows],
     )
-    return len(rows)
 
 
 def materialize_categories(cur, conn):
@@ -163,9 +154,10 @@ def materialize_categories(cur, conn):
     for st in SIGNAL_TYPES:
         entries = fetch_category(cur, st)
         rows.append((st, entries))
-    upsert_categories(cur, rows)
+    changed = upsert_categories(cur, rows)
+    record_refresh(cur, "mv_signal_category", len(rows), changed)
     conn.commit()
-    return rows
+    return rows, changed
 
 
 # ─── Phase 2: detail MV ────────────────────────────────────────────────
@@ -299,25 +291,25 @@ def fetch_relationship_clusters(cur, signal_type, value):
 
 
 def upsert_details(cur, rows):
-    if not rows:
-        return 0
-    execute_values(
+    """rows: list of (signal_type, value, stats, clusters); returns rows changed"""
+    return upsert_changed(
         cur,
-        """INSERT INTO mv_signal_detail (signal_type, value, period, view, updated_at)
-           VALUES %s
-           ON CONFLICT (signal_type, value, period) DO UPDATE
-             SET view = EXCLUDED.view, updated_at = EXCLUDED.updated_at""",
+        "mv_signal_detail",
+        ("signal_type", "value", "period"),
+        ("view",),
         [
-            (st, val, PERIOD, json.dumps({"stats": stats, "clusters": clusters}))
+            (st, val, PERIOD, {"stats": stats, "clusters": clusters})
             for st, val, stats, clusters in rows
         ],
-        template="(%s, %s, %s, %s::jsonb, NOW())",
     )
-    return len(rows)
 
 
 def materialize_details(cur, conn, category_rows):
-    """category_rows: [(signal_type, [entry, ...]), ...]"""
+    """category_rows: [(signal_type, [entry, ...]), ...]
+
+    Returns:
+        (rows checked, rows changed)
+    """
     pairs = []
     for st, entries in category_rows:
         for entry in entries:
@@ -325,21 +317,22 @@ def materialize_details(cur, conn, category_rows):
 
     print("Detail targets: %d (type, value) pairs" % len(pairs))
     batch = []
-    done = 0
+    done = changed = 0
     for st, val in pairs:
         stats = fetch_signal_stats(cur, st, val)
         clusters = fetch_relationship_clusters(cur, st, val)
         batch.append((st, val, stats, clusters))
         if len(batch) >= 25:
-            upsert_details(cur, batch)
+            changed += upsert_details(cur, batch)
             conn.commit()
             done += len(batch)
             batch = []
     if batch:
-        upsert_details(cur, batch)
-        conn.commit()
+        changed += upsert_details(cur, batch)
         done += len(batch)
-    return done
+    record_refresh(cur, "mv_signal_detail", done, changed)
+    conn.commit()
+    return done, changed
 
 
 # ─── Driver ────────────────────────────────────────────────────────────
@@ -362,22 +355,24 @@ def materialize(max_age_hours=DEFAULT_MAX_AGE_HOURS, force=False):
 
             start = time.time()
             print("Phase 1: materializing categories (%d types)" % len(SIGNAL_TYPES))
-            category_rows = materialize_categories(cur, conn)
+            category_rows, cat_changed = materialize_categories(cur, conn)
             cat_elapsed = time.time() - start
-            print("  done in %.1fs" % cat_elapsed)
+            print("  done (%d changed) in %.1fs" % (cat_changed, cat_elapsed))
 
             print("Phase 2: materializing details for top values")
             det_start = time.time()
-            done = materialize_details(cur, conn, category_rows)
+            done, changed = materialize_details(cur, conn, category_rows)
             det_elapsed = time.time() - det_start
-            print("  done %d details in %.1fs" % (done, det_elapsed))
+            print(
+                "  done %d details (%d changed) in %.1fs" % (done, changed, det_elapsed)
+            )
 
             total_elapsed = time.time() - start
             print(
                 "Done: %d categories + %d details in %.1fs total"
                 % (len(SIGNAL_TYPES), done, total_elapsed)
             )
-            return len(SIGNAL_TYPES) + done
+            return cat_changed + changed
     finally:
         conn.close()
 
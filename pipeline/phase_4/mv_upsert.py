@@ -0,0 +1,125 @@
+"""Content-hash guarded upserts for the mv_* JSONB materializations.
+
+Materializers rebuild every blob on each refresh, but most blobs come out
+identical. Rewriting them anyway left a dead tuple + WAL per row per run.
+upsert_changed() stores a content_hash next to the blobs and its ON
+CONFLICT update only fires when the hash differs, so unchanged rows are
+never rewritten and updated_at only moves when a row's content did (the
+frontend can invalidate exactly those keys).
+
+Because unchanged rows no longer bump updated_at, the 12h staleness gates
+read the last refresh from mv_refresh_log instead of MAX(updated_at).
+Migration: db/migrations/20261016_mv_content_hash.sql.
+"""
+
+import hashlib
+import json
+
+from psycopg2.extras import execute_values
+
+
+def blob_json(blob) -> str:
+    """Canonical JSON text for a blob (sorted keys: hash-stable)"""
+    return json.dumps(blob, sort_keys=True)
+
+
+def content_hash(*texts) -> str:
+    """md5 over one or more canonical JSON texts (None = SQL NULL blob)"""
+    h = hashlib.md5()
+    for text in texts:
+        h.update(b"\x00" if text is None else text.encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def upsert_changed(
+    cur,
+    table: str,
+    keys: tuple,
+    blobs: tuple,
+    rows: list,
+    key_casts: tuple = None,
+    page_size: int = 100,
+) -> int:
+    """Upsert rows whose blobs changed; unchanged rows are not written.
+
+    Args:
+        table: mv_* table with a content_hash column
+        keys: primary key columns
+        blobs: JSONB columns (values may be None -> NULL)
+        rows: tuples of key values followed by blob objects
+        key_casts: per-key SQL cast suffix, e.g. ("", "::date")
+
+    Returns:
+        rows inserted or changed
+    """
+    if not rows:
+        return 0
+    key_casts = key_casts or ("",) * len(keys)
+    nkeys = len(keys)
+    values = []
+    for row in rows:
+        texts = [None if b is None else blob_json(b) for b in row[nkeys:]]
+        values.append(tuple(row[:nkeys]) + tuple(texts) + (content_hash(*texts),))
+
+    template = "(%s, NOW())" % ", ".join(
+        ["%s" + cast for cast in key_casts] + ["%s::jsonb"] * len(blobs) + ["%s"]
+    )
+    columns = ", ".join(keys + blobs)
+    updates = ", ".join("%s = EXCLUDED.%s" % (col, col) for col in blobs)
+    changed = execute_values(
+        cur,
+        f"""INSERT INTO {table} ({columns}, content_hash, updated_at)
+            VALUES %s
+            ON CONFLICT ({", ".join(keys)}) DO UPDATE
+              SET {updates},
+                  content_hash = EXCLUDED.content_hash,
+                  updated_at = EXCLUDED.updated_at
+              WHERE {table}.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+            RETURNING 1""",
+        values,
+        template=template,
+        page_size=page_size,
+        fetch=True,
+    )
+    return len(changed)
+
+
+def _scalar(cur):
+    """First column of the next row (tuple or RealDictCursor rows)"""
+    row = cur.fetchone()
+    if row is None:
+        return None
+    return next(iter(row.values())) if isinstance(row, dict) else row[0]
+
+
+def refresh_age_hours(cur, table: str):
+    """Hours since the last recorded refresh of `table` (None = never).
+
+    Falls back to MAX(updated_at) for tables refreshed before
+    mv_refresh_log existed.
+    """
+    cur.execute(
+        """SELECT EXTRACT(EPOCH FROM (NOW() - refreshed_at))/3600
+             FROM mv_refresh_log WHERE view_name = %s""",
+        (table,),
+    )
+    if cur.rowcount:
+        return _scalar(cur)
+    cur.execute(
+        f"SELECT EXTRACT(EPOCH FROM (NOW() - MAX(updated_at)))/3600 FROM {table}"
+    )
+    return _scalar(cur)
+
+
+def record_refresh(cur, table: str, rows_checked: int, rows_changed: int) -> None:
+    """Log a completed refresh (drives the staleness gates)"""
+    cur.execute(
+        """INSERT INTO mv_refresh_log (view_name, refreshed_at, rows_checked, rows_changed)
+           VALUES (%s, NOW(), %s, %s)
+           ON CONFLICT (view_name) DO UPDATE
+             SET refreshed_at = EXCLUDED.refreshed_at,
+                 rows_checked = EXCLUDED.rows_checked,
+                 rows_changed = EXCLUDED.rows_changed""",
+        (table, rows_checked, rows_changed),
+    )
@@ -38,6 +38,7 @@ from core.config import (
     TOP_CLUSTERS_PER_DAY,
     config,
 )
+from core.llm_client import get_llm_client
 from core.llm_logger import log_llm_call
 from core.llm_utils import async_check_rate_limit, extract_json, fix_role_hallucinations
 from core.prompts import (
@@ -252,30 +253,18 @@ def pick_mechanical_english_title(titles: list[dict]) -> str:
 
 
 async def _call_llm(payload: dict, phase: str = "event_prose") -> dict:
-    import time as _time
-
-    headers = {
-        "Authorization": "Bearer %s" % config.deepseek_api_key,
-        "Content-Type": "application/json",
-    }
-    async with httpx.AsyncClient(timeout=120) as client:
-        for attempt in range(3):
-            t0 = _time.time()
-            response = await client.post(
-                "%s/chat/completions" % config.deepseek_api_url,
-                headers=headers,
-                json=payload,
-            )
-            if await async_check_rate_limit(response, attempt):
-                continue
-            if response.status_code != 200:
-                raise RuntimeError(
-                    "LLM error %d: %s" % (response.status_code, response.text[:200])
-                )
-            data = response.json()
-            log_llm_call(phase, data.get("usage"), int((_time.time() - t0) * 1000))
-            return extract_json(data["choices"][0]["message"]["content"])
-        raise RuntimeError("LLM retries exhausted")
+    # Shared client: retries, rate limit, llm_stats and the result cache
+    # (only answers extract_json accepts are cached)
+    content, _ = await get_llm_client().chat_from(
+        payload["messages"],
+        phase=phase,
+        model=payload["model"],
+        temperature=payload.get("temperature"),
+        max_tokens=payload.get("max_tokens"),
+        timeout=120,
+        validate=extract_json,
+    )
+    return extract_json(content)
 
 
 def _format_titles(titles_sample: list[dict]) -> str:
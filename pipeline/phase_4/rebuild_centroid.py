@@ -14,8 +14,6 @@ import uuid
 from collections import Counter, defaultdict
 from pathlib import Path
 
-import httpx
-
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 if sys.platform == "win32":
     sys.stdout.reconfigure(errors="replace")
@@ -25,6 +23,7 @@ import networkx as nx
 import psycopg2
 
 from core.config import HIGH_FREQ_ORGS, config
+from core.llm_client import get_llm_client
 
 UBIQUITOUS_RATIO = 0.10  # labels in >10% of titles are ubiquitous for this centroid
 
@@ -1352,33 +1351,20 @@ async def _llm_merge_clusters(clusters, titles, ubiquitous):
 
         pairs_text = "\n\n".join(lines)
 
-        headers = {
-            "Authorization": "Bearer %s" % config.deepseek_api_key,
-            "Content-Type": "application/json",
-        }
-        payload = {
-            "model": config.llm_model,
-            "messages": [
-                {"role": "system", "content": LLM_CANDIDATE_MERGE_PROMPT},
-                {"role": "user", "content": pairs_text},
-            ],
-            "temperature": 0.1,
-            "max_tokens": 500,
-        }
-
+        # Shared client: retries, rate limit, llm_stats and the result cache
+        # (unchanged candidate pairs get the stored verdict)
         try:
-            async with httpx.AsyncClient(timeout=60) as client:
-                resp = await client.post(
-                    "%s/chat/completions" % config.deepseek_api_url,
-                    headers=headers,
-                    json=payload,
-                )
-                if resp.status_code != 200:
-                    print("    LLM error: HTTP %d" % resp.status_code)
-                    all_merged.extend(track_clusters)
-                    continue
-
-            raw = resp.json()["choices"][0]["message"]["content"]
+            raw, _ = await get_llm_client().chat_from(
+                [
+                    {"role": "system", "content": LLM_CANDIDATE_MERGE_PROMPT},
+                    {"role": "user", "content": pairs_text},
+                ],
+                phase="centroid_merge",
+                temperature=0.1,
+                max_tokens=500,
+                timeout=60,
+                validate=lambda content: "merge" in extract_json(content),
+            )
             result = extract_json(raw)
         except Exception as e:
             print("    LLM error: %s" % e)
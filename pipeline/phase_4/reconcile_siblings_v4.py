@@ -25,6 +25,7 @@ if sys.platform == "win32":
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 from core.config import config  # noqa: E402
+from core.near_duplicates import similar_pairs  # noqa: E402
 from pipeline.phase_4.chain_event_sagas import dice, title_words  # noqa: E402
 from pipeline.phase_4.merge_sibling_events import merge_sibling_group  # noqa: E402
 
@@ -72,7 +73,8 @@ def find_cross_centroid_groups(events, threshold):
     dupes that Phase 3.2 missed.
 
     Groups can contain multiple events per centroid (same-CTM identical
-    titles are legitimate merges). Keyed internally by event_id."""
+    titles are legitimate merges). Keyed internally by event_id.
+    Large days only score MinHash/LSH candidate pairs (core.near_duplicates)."""
     by_date = defaultdict(list)
     for e in events:
         by_date[e["date"]].append(e)
@@ -80,12 +82,11 @@ def find_cross_centroid_groups(events, threshold):
 
     pairs = []
     for date, lst in by_date.items():
-        for i in range(len(lst)):
-            for j in range(i + 1, len(lst)):
-                a, b = lst[i], lst[j]
-                score = dice(a["_words"], b["_words"])
-                if score >= threshold:
-                    pairs.append((a, b, score))
+        words = [e["_words"] for e in lst]
+        for i, j, score in similar_pairs(
+            words, threshold, lambda i, j: dice(words[i], words[j])
+        ):
+            pairs.append((lst[i], lst[j], score))
 
     pairs.sort(key=lambda p: p[2], reverse=True)
 
@@ -13,15 +13,13 @@ See db/migrations/20260420_add_centroid_summaries.sql for schema.
 import asyncio
 import hashlib
 import json
-import time
 from datetime import date, timedelta
 
-import httpx
 import psycopg2
 
 from core.config import config
-from core.llm_logger import log_llm_call
-from core.llm_utils import async_check_rate_limit, extract_json, fix_role_hallucinations
+from core.llm_client import get_llm_client
+from core.llm_utils import extract_json, fix_role_hallucinations
 
 # Tier thresholds
 TIER1_MIN_TOTAL_EVENTS = 20
@@ -258,37 +256,19 @@ def _fmt_ambient_block(ambient: dict) -> str:
 
 
 async def _call_llm(system_prompt: str, user_prompt: str, max_tokens: int) -> dict:
-    headers = {
-        "Authorization": f"Bearer {config.deepseek_api_key}",
-        "Content-Type": "application/json",
-    }
-    payload = {
-        "model": config.llm_model,
-        "messages": [
+    # Shared client: retries, rate limit, llm_stats and the result cache
+    content, _ = await get_llm_client().chat_from(
+        [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt},
         ],
-        "temperature": 0.3,
-        "max_tokens": max_tokens,
-    }
-    async with httpx.AsyncClient(timeout=120) as client:
-        for attempt in range(3):
-            t0 = time.time()
-            resp = await client.post(
-                f"{config.deepseek_api_url}/chat/completions",
-                headers=headers,
-                json=payload,
-            )
-            if await async_check_rate_limit(resp, attempt):
-                continue
-            if resp.status_code != 200:
-                raise RuntimeError(f"LLM {resp.status_code}: {resp.text[:300]}")
-            data = resp.json()
-            log_llm_call(
-                "centroid_summary", data.get("usage"), int((time.time() - t0) * 1000)
-            )
-            return extract_json(data["choices"][0]["message"]["content"])
-        raise RuntimeError("LLM retries exhausted")
+        phase="centroid_summary",
+        temperature=0.3,
+        max_tokens=max_tokens,
+        timeout=120,
+        validate=extract_json,
+    )
+    return extract_json(content)
 
 
 # ---------------------------------------------------------------------------
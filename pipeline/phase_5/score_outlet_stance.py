@@ -20,7 +20,6 @@ import sys
 import time
 from pathlib import Path
 
-import httpx
 import psycopg2
 import psycopg2.extras
 from psycopg2.extras import RealDictCursor
@@ -30,6 +29,7 @@ if sys.platform == "win32":
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from core.config import config  # noqa: E402
+from core.llm_client import get_llm_client  # noqa: E402
 
 # Ensure psycopg2 returns uuid[] as list of uuid objects, not PG array literal.
 psycopg2.extras.register_uuid()
@@ -297,47 +297,29 @@ def parse_json(text: str):
     return None
 
 
-async def call_llm(
-    client: httpx.AsyncClient, user: str, sem: asyncio.Semaphore
-) -> tuple[str, dict, float]:
-    headers = {
-        "Authorization": "Bearer %s" % config.deepseek_api_key,
-        "Content-Type": "application/json",
-    }
-    payload = {
-        "model": config.llm_model,
-        "messages": [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user},
-        ],
-        "temperature": 0.0,
-        "max_tokens": 800,
-    }
+async def call_llm(user: str, sem: asyncio.Semaphore) -> tuple[str, dict, float]:
+    """(content, usage, latency); ("", {}, latency) when the call fails.
+
+    Shared client: retries, rate limit, llm_stats and the result cache (a
+    re-run over the same headlines reuses the score).
+    """
     async with sem:
-        for attempt in range(3):
-            try:
-                t0 = time.time()
-                resp = await client.post(
-                    "%s/chat/completions" % config.deepseek_api_url,
-                    headers=headers,
-                    json=payload,
-                    timeout=120.0,
-                )
-                if resp.status_code in (429, 502, 503, 504):
-                    await asyncio.sleep(5 * (3**attempt))
-                    continue
-                if resp.status_code != 200:
-                    return ("", {}, time.time() - t0)
-                data = resp.json()
-                return (
-                    data["choices"][0]["message"]["content"],
-                    data.get("usage", {}),
-                    time.time() - t0,
-                )
-            except (httpx.RequestError, httpx.TimeoutException):
-                await asyncio.sleep(2 * (attempt + 1))
-                continue
-        return ("", {}, 0.0)
+        t0 = time.time()
+        try:
+            content, usage = await get_llm_client().chat_from(
+                [
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": user},
+                ],
+                phase="outlet_stance",
+                temperature=0.0,
+                max_tokens=800,
+                timeout=120.0,
+                validate=parse_json,
+            )
+        except Exception:
+            return ("", {}, time.time() - t0)
+        return (content, usage, time.time() - t0)
 
 
 # ----------------------------------------------------------------------
@@ -621,16 +603,14 @@ async def process_outlet(
 
     # LLM calls
     sem = asyncio.Semaphore(concurrency)
-    async with httpx.AsyncClient() as client:
-        tasks = [
-            call_llm(
-                client,
-                build_user_prompt(outlet, b["kind"], b["code"], month, b["headlines"]),
-                sem,
-            )
-            for b in bundles
-        ]
-        results = await asyncio.gather(*tasks)
+    tasks = [
+        call_llm(
+            build_user_prompt(outlet, b["kind"], b["code"], month, b["headlines"]),
+            sem,
+        )
+        for b in bundles
+    ]
+    results = await asyncio.gather(*tasks)
 
     # Upsert
     cur = conn.cursor()
@@ -0,0 +1,106 @@
+"""
+Frontend cache busts after materializer runs
+
+The frontend keeps mv_* blobs in an in-memory cache (apps/frontend/lib/cache.ts,
+up to 12h TTL). Materializers only rewrite rows whose content hash changed
+and return the changed-row count, so the daemon busts just the cache-key
+prefixes that read a view, and only when that view actually changed.
+
+Disabled unless REVALIDATE_API_KEY is set (same key as the frontend route).
+"""
+
+import httpx
+
+from core.config import config
+
+# mv_* table -> cached() key prefixes in apps/frontend/lib/queries.ts that
+# read it. Views read without cached() (mv_centroid_signals, mv_signal_graph)
+# or not read by the frontend (mv_event_triples) need no bust.
+MV_CACHE_PREFIXES = {
+    "mv_centroid_baselines": ("centroidDeviationsMonth:",),
+    "mv_centroid_stats": ("centroids:class:", "centroids:theater:"),
+    "mv_centroid_month_view": ("centroid_cal:",),
+    "mv_calendar_month_view": ("calendar:",),
+    "mv_global_month_view": (
+        "global_view:",
+        "global_narratives:",
+        "global_growing:",
+        "global_day_top:",
+        "trending:signals:",
+    ),
+    "mv_narratives_landing": (
+        "meta_narratives:",
+        "meta_narrative_activity:",
+        "strategic_narratives:",
+        "narrative_sparklines:",
+        "competing_narratives:",
+    ),
+    "mv_narrative_detail": (
+        "strategic_narrative:",
+        "strategic_narratives:",
+        "narrative_weekly:",
+        "narrative_events:",
+        "competing_narratives:",
+    ),
+    "mv_positions_landing": ("positions_landing:",),
+    "mv_position_detail": ("position_detail:",),
+    "mv_publisher_stats": (
+        "publisher-stats:all",
+        "outletStanceMonths:",
+        "outletMonths:",
+    ),
+    "mv_outlet_landing": (
+        "outletProfile:",
+        "outletDesc:",
+        "outletStance",
+        "outletEntityDaily:",
+        "outletMinorEntities:",
+        "outletTrackTimeline:",
+        "outletMonths:",
+        "siblingOutlets:",
+        "publisherStats:",
+    ),
+    "mv_signal_category": ("signal-heatmap:", "signal-cat:"),
+    "mv_signal_detail": ("signal-stats:", "signal-relationships:"),
+}
+
+
+def revalidate(changed, tables) -> int:
+    """Bust the frontend cache prefixes of `tables` if any rows changed.
+
+    Args:
+        changed: changed-row count returned by materialize() (0/None = skip)
+        tables: mv_* tables that materialize() writes
+
+    Returns:
+        number of cache entries cleared
+    """
+    if not changed or not config.revalidate_api_key:
+        return 0
+    prefixes = []
+    for table in tables:
+        for prefix in MV_CACHE_PREFIXES.get(table, ()):
+            if prefix not in prefixes:
+                prefixes.append(prefix)
+
+    url = "%s/api/admin/revalidate-cache" % config.social_base_url.rstrip("/")
+    headers = {"x-revalidate-token": config.revalidate_api_key}
+    cleared = 0
+    for prefix in prefixes:
+        try:
+            resp = httpx.post(url, headers=headers, json={"prefix": prefix}, timeout=10)
+            if resp.status_code != 200:
+                print(
+                    "  Cache revalidate error: %d - %s"
+                    % (resp.status_code, resp.text[:200])
+                )
+                continue
+            cleared += resp.json().get("cleared", 0)
+        except Exception as e:
+            print("  Cache revalidate failed (%s): %s" % (prefix, e))
+    if prefixes:
+        print(
+            "  Frontend cache: %d changed rows, cleared %d entries (%s)"
+            % (changed, cleared, ", ".join(prefixes))
+        )
+    return cleared
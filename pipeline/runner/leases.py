@@ -0,0 +1,259 @@
+"""
+Work leases so several daemon workers can share the pipeline
+
+Rows in work_leases (task, key) are claimed with FOR UPDATE SKIP LOCKED,
+so concurrent workers pick disjoint work without waiting on each other.
+A lease expires after config.work_lease_seconds unless the holder's
+heartbeat thread extends it, so a crashed worker's CTMs are picked up
+again by the others.
+
+Two uses:
+- per-CTM tasks ('cluster', 'promote', 'describe', 'daily_brief'):
+  every worker walks the same candidate list, iter_claimed() hands each
+  worker the CTMs nobody else holds
+- whole phases (task 'node', key = PhaseNode key): try_acquire() keeps
+  global jobs (ingestion, materializers, ...) on one worker at a time,
+  and skips them when another worker finished them recently
+
+A finished lease keeps done_at; a claimer skips keys finished after it
+built its candidate list, so a CTM is not processed twice per round.
+
+Without the work_leases table (20261016_work_leases.sql not applied) the
+manager warns once and lets this worker take everything, i.e. the old
+single-daemon behaviour.
+"""
+
+import os
+import socket
+import threading
+import uuid
+
+import psycopg2
+from psycopg2 import errors as pg_errors
+
+from core.config import config
+
+_CLAIM_SQL = """
+    UPDATE work_leases l
+       SET worker_id = %(worker)s,
+           leased_until = NOW() + make_interval(secs => %(secs)s),
+           heartbeat_at = NOW(),
+           claimed_at = NOW(),
+           done_at = NULL
+     WHERE (l.task, l.key) IN (
+            SELECT task, key
+              FROM work_leases
+             WHERE task = %(task)s
+               AND key = ANY(%(keys)s)
+               AND leased_until < NOW()
+               AND (done_at IS NULL OR done_at < %(listed_at)s)
+             ORDER BY array_position(%(keys)s, key)
+             LIMIT %(limit)s
+               FOR UPDATE SKIP LOCKED)
+    RETURNING l.key
+"""
+
+
+class LeaseManager:
+    """Claims, heartbeats and releases work_leases rows for one worker."""
+
+    def __init__(self, worker_id: str = None, lease_seconds: int = None):
+        self.worker_id = (
+            worker_id
+            or config.daemon_worker_id
+            or "%s:%d:%s"
+            % (
+                socket.gethostname(),
+                os.getpid(),
+                uuid.uuid4().hex[:6],
+            )
+        )
+        self.lease_seconds = lease_seconds or config.work_lease_seconds
+        self._held = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.available = True
+
+    # --- claiming ----------------------------------------------------------
+
+    def _missing_table(self, conn, e) -> None:
+        conn.rollback()
+        if self.available:
+            print("work_leases missing (%s); running without leases" % e)
+        self.available = False
+
+    def claim(self, conn, task: str, keys: list, limit: int, listed_at) -> list:
+        """Claim up to `limit` free keys (in `keys` order); commits."""
+        with conn.cursor() as cur:
+            cur.execute(
+                _CLAIM_SQL,
+                {
+                    "worker": self.worker_id,
+                    "secs": self.lease_seconds,
+                    "task": task,
+                    "keys": keys,
+                    "limit": limit,
+                    "listed_at": listed_at,
+                },
+            )
+            claimed = {row[0] for row in cur.fetchall()}
+        conn.commit()
+        self._track(len(claimed))
+        return [k for k in keys if k in claimed]
+
+    def iter_claimed(
+        self, conn, task: str, keys: list, batch: int = 1, auto_release: bool = True
+    ):
+        """Yield the keys this worker wins, in order; each is released as
+        done when the caller moves on to the next one.
+
+        Leases still held when the generator is closed early (exception,
+        break) are released without done_at, so others can retry them.
+        With auto_release=False the caller owns every yielded key and must
+        release() it (e.g. when work runs in a pool and finishes later).
+        """
+        keys = [str(k) for k in keys]
+        if not keys:
+            return
+        if not self.available:
+            yield from keys
+            return
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """INSERT INTO work_leases (task, key)
+                       SELECT %s, unnest(%s::text[])
+                       ON CONFLICT (task, key) DO NOTHING""",
+                    (task, keys),
+                )
+                cur.execute("SELECT clock_timestamp()")
+                listed_at = cur.fetchone()[0]
+            conn.commit()
+        except pg_errors.UndefinedTable as e:
+            self._missing_table(conn, e)
+            yield from keys
+            return
+
+        remaining = keys
+        while remaining:
+            claimed = self.claim(conn, task, remaining, batch, listed_at)
+            if not claimed:
+                return
+            last = remaining.index(claimed[-1])
+            remaining = remaining[last + 1 :]
+            for i, key in enumerate(claimed):
+                try:
+                    yield key
+                except GeneratorExit:
+                    if auto_release:
+                        # Do not commit the abandoned key's partial writes
+                        conn.rollback()
+                        abandoned = claimed[i:]
+                    else:
+                        abandoned = claimed[i + 1 :]
+                    for k in abandoned:
+                        self.release(conn, task, k, done=False)
+                    raise
+                if auto_release:
+                    self.release(conn, task, key)
+
+    def try_acquire(self, conn, task: str, key: str, fresh_seconds: int = 0) -> bool:
+        """Claim a single key unless it is held, or was finished less than
+        `fresh_seconds` ago; commits."""
+        if not self.available:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """INSERT INTO work_leases (task, key) VALUES (%s, %s)
+                       ON CONFLICT (task, key) DO NOTHING""",
+                    (task, key),
+                )
+                cur.execute(
+                    "SELECT clock_timestamp() - make_interval(secs => %s)",
+                    (fresh_seconds,),
+                )
+                listed_at = cur.fetchone()[0]
+            conn.commit()
+        except pg_errors.UndefinedTable as e:
+            self._missing_table(conn, e)
+            return True
+        return bool(self.claim(conn, task, [key], 1, listed_at))
+
+    def release(self, conn, task: str, key: str, done: bool = True) -> None:
+        """Give a lease back (done=True records completion); commits."""
+        if not self.available:
+            return
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """UPDATE work_leases
+                          SET worker_id = NULL,
+                              leased_until = '-infinity',
+                              done_at = CASE WHEN %s THEN NOW() END
+                        WHERE task = %s AND key = %s AND worker_id = %s""",
+                    (done, task, key, self.worker_id),
+                )
+            conn.commit()
+        except Exception as e:
+            # Expiry frees the lease anyway; never fail the phase over it
+            print("Lease release failed for %s/%s: %s" % (task, key, e))
+            conn.rollback()
+        self._track(-1)
+
+    # --- heartbeat ---------------------------------------------------------
+
+    def _track(self, delta: int) -> None:
+        with self._lock:
+            self._held = max(0, self._held + delta)
+            if self._held and self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._heartbeat, name="lease-heartbeat", daemon=True
+                )
+                self._thread.start()
+
+    def _heartbeat(self) -> None:
+        """Extend every open lease of this worker every lease_seconds / 3"""
+        conn = None
+        while not self._stop.wait(self.lease_seconds / 3):
+            if not self._held:
+                continue
+            try:
+                if conn is None or conn.closed:
+                    conn = psycopg2.connect(**config.db_connect_kwargs())
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """UPDATE work_leases
+                              SET leased_until = NOW() + make_interval(secs => %s),
+                                  heartbeat_at = NOW()
+                            WHERE worker_id = %s AND done_at IS NULL""",
+                        (self.lease_seconds, self.worker_id),
+                    )
+                conn.commit()
+            except Exception as e:
+                print("Lease heartbeat failed (%s); retrying" % e)
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                conn = None
+        if conn is not None:
+            conn.close()
+
+    def close(self) -> None:
+        self._stop.set()
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_lease_manager() -> LeaseManager:
+    """Process-wide LeaseManager (one worker id per process)"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = LeaseManager()
+        return _manager
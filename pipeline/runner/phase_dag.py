@@ -0,0 +1,190 @@
+"""
+Dependency-graph scheduler for PipelineDaemon cycles
+
+Phases are declared as PhaseNodes with explicit dependencies and a resource
+tag (db, llm, cpu, net). PhaseDAG.run() starts every node as soon as its
+dependencies have finished, within a per-resource concurrency limit, so
+independent phases overlap and a chain's wall time is max(path) instead of
+sum(all).
+
+Outcomes per node:
+- ok
+- timeout: reported, dependents still run (as the serial loop did). The
+  worker thread cannot be killed, so it keeps its resource slot until it
+  actually returns.
+- error (after retries): dependents are skipped, unrelated nodes continue
+- skipped: a dependency errored or was skipped
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+
+@dataclass
+class PhaseNode:
+    """One schedulable phase"""
+
+    key: str  # stable id; persisted as daemon_state slot 'node:<key>'
+    name: str  # display name used in logs
+    func: Callable
+    deps: tuple = ()
+    resource: str = "db"
+    timeout: int = 300
+    retries: Optional[int] = None  # None = daemon default
+    slot: Optional[str] = None
+    # True: leases its own work items, so every daemon worker may run it
+    shared: bool = False
+    kwargs: dict = field(default_factory=dict)
+
+
+@dataclass
+class NodeResult:
+    key: str
+    status: str  # ok | timeout | error | skipped
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    error: Optional[str] = None
+    exception: Optional[BaseException] = None
+
+    @property
+    def duration_ms(self) -> Optional[int]:
+        if self.started is None or self.finished is None:
+            return None
+        return int((self.finished - self.started) * 1000)
+
+
+def _topological_order(nodes: dict) -> list:
+    """Kahn's algorithm; raises ValueError on a dependency cycle"""
+    pending = {key: set(node.deps) for key, node in nodes.items()}
+    order = []
+    ready = [key for key, deps in pending.items() if not deps]
+    while ready:
+        key = ready.pop()
+        order.append(key)
+        for other, deps in pending.items():
+            if key in deps:
+                deps.discard(key)
+                if not deps and other not in order and other not in ready:
+                    ready.append(other)
+    if len(order) != len(nodes):
+        stuck = sorted(set(nodes) - set(order))
+        raise ValueError("Dependency cycle among phases: %s" % ", ".join(stuck))
+    return order
+
+
+class PhaseDAG:
+    """Run PhaseNodes concurrently along their dependency edges.
+
+    Dependencies on keys that are not part of this run (slot not due, phase
+    had no work) are dropped, so callers can declare the full graph and add
+    only the nodes that should fire.
+
+    Args:
+        nodes: PhaseNodes (unique keys)
+        limits: resource tag -> max concurrent nodes (unknown tags: 1)
+        run_node: blocking callable(node) executed in a worker thread
+        on_finish: optional blocking callable(node, result), e.g. persistence
+    """
+
+    def __init__(
+        self,
+        nodes: list,
+        limits: dict,
+        run_node: Callable,
+        on_finish: Callable = None,
+    ):
+        by_key = {}
+        for node in nodes:
+            if node.key in by_key:
+                raise ValueError("Duplicate phase key: %s" % node.key)
+            by_key[node.key] = node
+        for node in nodes:
+            node.deps = tuple(d for d in node.deps if d in by_key)
+        _topological_order(by_key)
+
+        self.nodes = by_key
+        self.limits = limits
+        self.run_node = run_node
+        self.on_finish = on_finish
+
+    def critical_path_ms(self, results: dict) -> int:
+        """Longest dependency chain by measured duration"""
+        longest = {}
+        for key in _topological_order(self.nodes):
+            own = results[key].duration_ms or 0
+            longest[key] = own + max(
+                (longest[d] for d in self.nodes[key].deps), default=0
+            )
+        return max(longest.values(), default=0)
+
+    async def run(self) -> dict:
+        """Run all nodes; returns {key: NodeResult}"""
+        semaphores = {}
+        for node in self.nodes.values():
+            if node.resource not in semaphores:
+                limit = max(1, self.limits.get(node.resource, 1))
+                semaphores[node.resource] = asyncio.Semaphore(limit)
+        done = {key: asyncio.Event() for key in self.nodes}
+        results = {}
+
+        async def schedule(node):
+            for dep in node.deps:
+                await done[dep].wait()
+            blocked = [
+                d for d in node.deps if results[d].status in ("error", "skipped")
+            ]
+            if blocked:
+                print(
+                    "%s skipped (failed dependency: %s)"
+                    % (node.name, ", ".join(blocked))
+                )
+                result = NodeResult(
+                    node.key,
+                    "skipped",
+                    error="dependency failed: %s" % ", ".join(blocked),
+                )
+            else:
+                result = await self._execute(node, semaphores[node.resource])
+            results[node.key] = result
+            done[node.key].set()
+            if self.on_finish is not None:
+                await asyncio.to_thread(self.on_finish, node, result)
+
+        await asyncio.gather(*(schedule(node) for node in self.nodes.values()))
+        return results
+
+    async def _execute(self, node: PhaseNode, semaphore) -> NodeResult:
+        await semaphore.acquire()
+
+        def release(task):
+            semaphore.release()
+            # Collect late failures of timed-out workers (no "never retrieved")
+            if not task.cancelled():
+                task.exception()
+
+        started = time.time()
+        task = asyncio.ensure_future(asyncio.to_thread(self.run_node, node))
+        task.add_done_callback(release)
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout=node.timeout)
+            return NodeResult(node.key, "ok", started, time.time())
+        except asyncio.TimeoutError:
+            print(f"{node.name} timed out after {node.timeout}s, moving on")
+            return NodeResult(
+                node.key,
+                "timeout",
+                started,
+                time.time(),
+                error="timed out after %ds" % node.timeout,
+            )
+        except Exception as e:
+            return NodeResult(
+                node.key,
+                "error",
+                started,
+                time.time(),
+                error="%s: %s" % (type(e).__name__, e),
+                exception=e,
+            )
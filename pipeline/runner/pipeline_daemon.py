@@ -1,7 +1,8 @@
 """
 SNI v3 Pipeline Daemon -- 4-Slot Architecture
 
-Scheduling slots (phases run sequentially within each slot):
+Scheduling slots (each due slot adds its phases to one dependency graph,
+see pipeline/runner/phase_dag.py):
 - Slot 1 INGESTION   (12h):  Phase 1 (RSS) + Phase 2 (centroid matching)
 - Slot 2 CLASSIFICATION (15m): Phase 3.1 (labels) + 3.2 (backfill) + 3.3 (tracks)
 - Slot 3 CLUSTERING  (30m):  Phase 4 event clustering + 3.2 sibling reconciliation + 4.5a promote + 4.2* materialize + 4.2f narrative matching
@@ -9,24 +10,43 @@ Scheduling slots (phases run sequentially within each slot):
 - Slot FN REFRESH    (6h):   FN attribution (incremental, additive) + fn_asset_evidence recompute (mechanical, no LLM)
 - Daily purge: Remove rejected titles + reset api_error_count
 
+Slots 2 and 3 are also woken early by LISTEN/NOTIFY on 'sni_pipeline'
+(triggers from 20261016_pipeline_work_notify.sql): Phase 2 assigning titles
+wakes classification, Phase 3.3 track writes wake clustering. Intervals
+remain the fallback, so nothing changes if notifications are unavailable.
+
+Several daemons (replicas or local processes) can run against one database:
+per-CTM phases (clustering, promote, describe, daily briefs) claim each CTM
+through work_leases, and every other phase takes a lease on itself so only
+one worker runs it per interval (pipeline/runner/leases.py).
+
 Features:
-- Sequential execution with configurable intervals
+- Phase graph: independent phases run concurrently under per-resource
+  limits (db / cpu / llm / net); per-node durations in daemon_state
 - Graceful shutdown on SIGTERM/SIGINT
 - Retry logic with exponential backoff
 - Phase-level timeouts to prevent hangs
 """
 
 import asyncio
+import multiprocessing
 import signal
 import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
 
-from psycopg2.pool import ThreadedConnectionPool
+import psycopg2
+from psycopg2 import errors as pg_errors
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from core.config import MAX_API_ERRORS, config
+from core.config import MAX_API_ERRORS, config, default_workers
+from core.llm_cache import get_llm_cache
 
 # Import phase modules
 from pipeline.phase_1.ingest_feeds import run_ingestion
@@ -38,6 +58,8 @@ from pipeline.phase_3_2.backfill_entity_centroids import (
 from pipeline.phase_3_3.assign_tracks_mechanical import process_batch as phase33_process
 from pipeline.phase_4.generate_daily_brief_4_5d import process_ctm as phase45d_brief
 from pipeline.phase_4.incremental_clustering import (
+    cluster_ctm_job,
+    mark_ctm_clustered,
     process_ctm_for_daemon,
 )
 from pipeline.phase_4.promote_and_describe_4_5a import (
@@ -46,6 +68,9 @@ from pipeline.phase_4.promote_and_describe_4_5a import (
 from pipeline.phase_4.promote_and_describe_4_5a import (
     promote_ctm as phase45a_promote_only,
 )
+from pipeline.runner import frontend_cache, queue_counters
+from pipeline.runner.leases import get_lease_manager
+from pipeline.runner.phase_dag import NodeResult, PhaseDAG, PhaseNode
 
 # Deprecated: 4.1 families (D-059), 4.1a/4.1b (D-056), 4.3/4.4 (D-053)
 # Replaced: old 4.5a event summaries + 4.5b CTM digests (D-058) -> new 4.5a promote+describe + 4.5d daily brief
@@ -58,6 +83,7 @@ class PipelineDaemon:
         self.config = config
         self.running = True
         self.cycle_count = 0
+        self._cluster_pool = None  # spawn pool for Phase 4 clustering
 
         # 4-slot intervals (seconds)
         self.ingestion_interval = 43200  # 12 hours - Phase 1 + 2
@@ -69,6 +95,18 @@ class PipelineDaemon:
         self.fn_refresh_interval = 21600  # 6 hours - FN re-attribution + asset evidence
         self.social_interval = 3600  # 1 hour - Slot 5: Social Posting (testing)
         self.purge_interval = 86400  # 24 hours - daily cleanup
+        self.counters_interval = 3600  # 1 hour - exact queue-counter recount
+
+        # Event-driven wakeups (NOTIFY payload = slot name). A woken slot still
+        # waits this long after its last run, so bursts of writes coalesce.
+        self.wake_channel = "sni_pipeline"
+        self.wake_min_interval = {
+            "classification": 60,
+            "clustering": 300,
+        }
+        self.pending_work = set()
+        self._listen_conn = None
+        self._wake = None
 
         # Last run timestamps (loaded from daemon_state in _load_last_run so
         # restarts do not re-fire every slot immediately).
@@ -80,6 +118,7 @@ class PipelineDaemon:
             "fn_refresh": 0,
             "social": 0,
             "purge": 0,
+            "counters": 0,
         }
 
         # Batch sizes
@@ -102,15 +141,33 @@ class PipelineDaemon:
         self.timeout_fn_refresh = 1800  # 30 min for FN re-attribution + evidence
         self.timeout_social = 300  # 5 min for social posting
         self.timeout_purge = 300  # 5 min for daily cleanup
+        self.timeout_counters = 1800  # 30 min for the exact recount
+
+        # Phase graph: max concurrent nodes per resource tag
+        self.resource_limits = {
+            "db": 3,  # materializers / mechanical DB phases
+            "cpu": 1,  # clustering, matching (GIL-bound in worker threads)
+            "llm": 2,  # share the process-wide LLM client limiter
+            "net": 1,  # RSS fetch, social posting
+        }
+        # One connection per concurrent node, plus headroom for the main
+        # loop (queue stats, node state) and threads of timed-out nodes
+        self.pool_maxconn = sum(self.resource_limits.values()) + 6
 
-        # Connection pool (minconn=2, maxconn=10).
+        # Work leases shared with other daemon workers
+        self.leases = get_lease_manager()
+
+        # Connection pool (minconn=2, maxconn=self.pool_maxconn).
         # Pool kwargs come from config.db_connect_kwargs() so TCP
         # keepalives are inherited everywhere — see core/config.py.
+        # ThreadedConnectionPool.getconn() raises PoolError when exhausted;
+        # checkout is gated by a semaphore so callers wait instead.
         self.pool = ThreadedConnectionPool(
             minconn=2,
-            maxconn=10,
+            maxconn=self.pool_maxconn,
             **self.config.db_connect_kwargs(),
         )
+        self._pool_slots = threading.BoundedSemaphore(self.pool_maxconn)
 
         # Setup signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -152,16 +209,20 @@ class PipelineDaemon:
         duration_ms: int | None = None,
         status: str = "ok",
         error: str | None = None,
+        ts: float | None = None,
     ):
         """Persist a slot's last_run + optional health metrics. Best-effort.
 
+        Also used for per-node rows ('node:<key>', explicit `ts`) written
+        by the phase graph after each node finishes.
+
         duration_ms / status / last_error feed `daemon_state` columns
         added in 20260506_daemon_state_health.sql. Older deployments
         without those columns: the INSERT still works because we name
         them; the ON CONFLICT update will silently fail and be caught
         below — daemon keeps running.
         """
-        ts = self.last_run.get(slot_name)
+        ts = ts or self.last_run.get(slot_name)
         if not ts:
             return
         conn = self.get_connection()
@@ -221,13 +282,25 @@ class PipelineDaemon:
         self.running = False
 
     def get_connection(self):
-        """Get database connection from pool"""
-        return self.pool.getconn()
+        """Get database connection from pool, blocking until one is free"""
+        self._pool_slots.acquire()
+        try:
+            return self.pool.getconn()
+        except Exception:
+            self._pool_slots.release()
+            raise
 
     def return_connection(self, conn):
         """Return connection to pool"""
-        if conn:
+        if not conn:
+            return
+        try:
             self.pool.putconn(conn)
+        except PoolError:
+            # Checked out from a pool that _reset_pool() has since replaced
+            conn.close()
+        finally:
+            self._pool_slots.release()
 
     def _reset_pool(self):
         """Discard the current pool and open a fresh one.
@@ -247,111 +320,156 @@ class PipelineDaemon:
             # closeall() may itself fault on a thoroughly broken pool;
             # log and proceed — we just need to drop the reference.
             print("Pool closeall() failed (non-fatal): %s" % e)
+        # Same size as in __init__; the checkout semaphore is kept, since
+        # connections still out are released to it via return_connection()
         self.pool = ThreadedConnectionPool(
             minconn=2,
-            maxconn=10,
+            maxconn=self.pool_maxconn,
             **self.config.db_connect_kwargs(),
         )
         print("Pool reset: opened a fresh connection pool")
 
     def get_queue_stats(self):
-        """Get current queue depths for adaptive scheduling"""
+        """Get current queue depths for adaptive scheduling.
+
+        Reads the trigger-maintained pipeline_queue_counters (O(1)); the
+        counters are seeded by a reconcile on first use and re-checked by
+        the hourly counters slot. A phase-gating counter at 0 is confirmed
+        with an EXISTS, so drift never starves Phase 3.1 / 3.3. Falls back
+        to exact counts if the table is not there yet.
+        """
         conn = self.get_connection()
         try:
-            with conn.cursor() as cur:
-                # Phase 2 queue (pending titles)
-                cur.execute(
-                    """
-                    SELECT COUNT(*)
-                    FROM titles_v3
-                    WHERE processing_status = 'pending'
-                """
-                )
-                pending_titles = cur.fetchone()[0]
-
-                # Phase 3.1 queue (assigned titles without labels)
-                cur.execute(
-                    """
-                    SELECT COUNT(*)
-                    FROM titles_v3 t
-                    WHERE t.processing_status = 'assigned'
-                      AND t.centroid_ids IS NOT NULL
-                      AND NOT EXISTS (SELECT 1 FROM title_labels tl WHERE tl.title_id = t.id)
-                """
-                )
-                titles_need_labels = cur.fetchone()[0]
-
-                # Phase 3.3 queue (assigned titles without track assignment).
-                # NOT EXISTS instead of NOT IN — the latter spilled to disk
-                # (BuffileRead) and ran 30+ min on Render, freezing every cycle
-                # behind get_queue_stats(). 2026-05-06.
-                cur.execute(
-                    """
-                    SELECT COUNT(*)
-                    FROM titles_v3 t
-                    WHERE t.processing_status = 'assigned'
-                      AND t.centroid_ids IS NOT NULL
-                      AND NOT EXISTS (
-                          SELECT 1 FROM title_assignments ta
-                          WHERE ta.title_id = t.id
-                      )
-                """
-                )
-                titles_need_track = cur.fetchone()[0]
-
-                # Phase 4 cluster queue (CTMs that may need event regeneration)
-                cur.execute(
-                    """
-                    SELECT COUNT(*)
-                    FROM ctm c
-                    WHERE c.title_count >= 3
-                      AND c.is_frozen = false
-                """
-                )
-                ctms_for_clustering = cur.fetchone()[0]
+            try:
+                with conn.cursor() as cur:
+                    counters = queue_counters.read_counters(cur)
+                conn.commit()
+                if not set(queue_counters.QUEUES) <= set(counters):
+                    print("Queue counters not seeded yet, reconciling...")
+                    queue_counters.reconcile(conn, self.config.v3_p4_min_titles)
+                    with conn.cursor() as cur:
+                        counters = queue_counters.read_counters(cur)
+                    conn.commit()
+                stats = queue_counters.queue_stats(counters)
+                with conn.cursor() as cur:
+                    drifted = queue_counters.confirm_empty(cur, stats)
+                conn.commit()
+                if drifted:
+                    print(
+                        "Queue counters read 0 but work exists: %s" % ", ".join(drifted)
+                    )
+                return stats
+            except pg_errors.UndefinedTable:
+                conn.rollback()
+                with conn.cursor() as cur:
+                    counters = queue_counters.count_exact(
+                        cur, self.config.v3_p4_min_titles
+                    )
+                conn.commit()
+            return queue_counters.queue_stats(counters)
+        finally:
+            self.return_connection(conn)
 
-                # Phase 4.5 summary queue: EVENT-DRIVEN regeneration
-                # Regenerate if: no summary, OR new events since last summary
-                # With 24h minimum cooldown to prevent thrashing
-                cur.execute(
-                    """
-                    SELECT COUNT(*)
-                    FROM ctm c
-                    WHERE c.title_count >= %s
-                      AND c.is_frozen = false
-                      AND EXISTS (SELECT 1 FROM events_v3 e WHERE e.ctm_id = c.id)
-                      AND (
-                          -- Never had a summary
-                          c.summary_text IS NULL
-                          OR (
-                              -- Has new events since last summary AND cooldown passed
-                              (SELECT COUNT(*) FROM events_v3 e WHERE e.ctm_id = c.id)
-                                  > COALESCE(c.event_count_at_summary, 0)
-                              AND (c.last_summary_at IS NULL
-                                   OR c.last_summary_at < NOW() - INTERVAL '24 hours')
-                          )
-                      )
-                """,
-                    (self.config.v3_p4_min_titles,),
+    def run_reconcile_counters(self):
+        """Recount queue depths exactly and correct pipeline_queue_counters."""
+        conn = self.get_connection()
+        try:
+            corrections = queue_counters.reconcile(conn, self.config.v3_p4_min_titles)
+            if corrections:
+                print(
+                    "Queue counters corrected: %s"
+                    % ", ".join("%s %+d" % kv for kv in sorted(corrections.items()))
                 )
-                ctms_need_summary = cur.fetchone()[0]
-
-                return {
-                    "pending_titles": pending_titles,
-                    "titles_need_track": titles_need_track,
-                    "titles_need_labels": titles_need_labels,
-                    "ctms_for_clustering": ctms_for_clustering,
-                    "ctms_need_summary": ctms_need_summary,
-                }
+            else:
+                print("Queue counters exact, no drift")
         finally:
             self.return_connection(conn)
 
     def should_run_slot(self, slot_name: str) -> bool:
-        """Check if enough time has passed since last run of this slot"""
-        now = time.time()
-        last = self.last_run[slot_name]
+        """Check if the slot's interval has passed, or upstream writes woke it"""
+        elapsed = time.time() - self.last_run[slot_name]
         interval = getattr(self, "%s_interval" % slot_name)
-        return (now - last) >= interval
+        if elapsed >= interval:
+            return True
+        return slot_name in self.pending_work and elapsed >= (
+            self.wake_min_interval.get(slot_name, 60)
+        )
+
+    def _seconds_until_work(self) -> float:
+        """Seconds until the next slot becomes due (<= 0: due now)"""
+        elapsed = {slot: time.time() - last for slot, last in self.last_run.items()}
+        waits = []
+        for slot in self.last_run:
+            if slot == "social" and not self.config.social_posting_enabled:
+                continue
+            waits.append(getattr(self, "%s_interval" % slot) - elapsed[slot])
+            if slot in self.pending_work:
+                waits.append(self.wake_min_interval.get(slot, 60) - elapsed[slot])
+        return min(waits)
+
+    def _start_listener(self):
+        """LISTEN on the wake channel over a dedicated autocommit connection.
+
+        Failure is non-fatal: the daemon keeps running on intervals and the
+        main loop retries on its next wait.
+        """
+        try:
+            conn = psycopg2.connect(**self.config.db_connect_kwargs())
+            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cur:
+                cur.execute("LISTEN %s" % self.wake_channel)
+        except Exception as e:
+            print("LISTEN %s failed (%s); intervals only" % (self.wake_channel, e))
+            return
+        self._listen_conn = conn
+        asyncio.get_running_loop().add_reader(conn.fileno(), self._on_notify)
+        print("Listening on '%s' for work notifications" % self.wake_channel)
+
+    def _stop_listener(self):
+        conn, self._listen_conn = self._listen_conn, None
+        if conn is None:
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(conn.fileno())
+        except Exception:
+            pass
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _on_notify(self):
+        """Event-loop reader callback: collect NOTIFY payloads, wake the loop"""
+        conn = self._listen_conn
+        try:
+            conn.poll()
+        except Exception as e:
+            print("LISTEN connection lost (%s); will reconnect" % e)
+            self._stop_listener()
+            return
+        while conn.notifies:
+            payload = conn.notifies.pop(0).payload
+            if payload in self.last_run:
+                self.pending_work.add(payload)
+        self._wake.set()
+
+    async def _wait_for_work(self):
+        """Sleep until a slot is due or a notification arrives (or shutdown).
+
+        Idle waiting issues no queries; the 1s tick only keeps SIGTERM
+        handling responsive.
+        """
+        if self._listen_conn is None:
+            self._start_listener()
+        while self.running:
+            wait = self._seconds_until_work()
+            if wait <= 0:
+                return
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=min(wait, 1.0))
+            except asyncio.TimeoutError:
+                pass
 
     def monitor_summary_word_counts(self):
         """Monitor summary word counts to detect length creep"""
@@ -616,27 +734,109 @@ class PipelineDaemon:
                 )
             )
 
-            processed = 0
-            total_topics = 0
-            for ctm_id, centroid_id, track, month in ctms:
-                written = process_ctm_for_daemon(conn, ctm_id, centroid_id, track)
-                if written > 0:
-                    total_topics += written
-                    processed += 1
-
-                # Mark as clustered at current title_count
-                with conn.cursor() as cur:
-                    cur.execute(
-                        "UPDATE ctm SET title_count_at_clustering = title_count WHERE id = %s",
-                        (ctm_id,),
-                    )
-                conn.commit()
+            by_id = {str(row[0]): row for row in ctms}
+            workers = self.config.v3_p4_cluster_workers or default_workers()
+            workers = min(workers, len(ctms))
+            if workers > 1:
+                total_topics, processed = self._cluster_in_pool(conn, by_id, workers)
+            else:
+                processed = 0
+                total_topics = 0
+                for key in self.leases.iter_claimed(conn, "cluster", list(by_id)):
+                    ctm_id, centroid_id, track, month = by_id[key]
+                    written = process_ctm_for_daemon(conn, ctm_id, centroid_id, track)
+                    if written > 0:
+                        total_topics += written
+                        processed += 1
+
+                    # Mark as clustered at current title_count
+                    mark_ctm_clustered(conn, ctm_id)
 
             print("Clustered {} topics across {} CTMs".format(total_topics, processed))
 
         finally:
             self.return_connection(conn)
 
+    def _get_cluster_pool(self) -> ProcessPoolExecutor:
+        """The long-lived clustering pool (created on first use)"""
+        if self._cluster_pool is None:
+            size = self.config.v3_p4_cluster_workers or default_workers()
+            self._cluster_pool = ProcessPoolExecutor(
+                max_workers=size,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._cluster_pool
+
+    def _close_cluster_pool(self) -> None:
+        if self._cluster_pool is not None:
+            self._cluster_pool.shutdown(wait=True, cancel_futures=True)
+            self._cluster_pool = None
+
+    def _cluster_in_pool(self, conn, by_id: dict, workers: int) -> tuple:
+        """Cluster leased CTMs on a spawned process pool (CPU-bound work).
+
+        At most `workers` CTMs are leased at a time: a CTM is claimed only
+        when a process is free, and released once its job returns. Each
+        process keeps its own connection (cluster_ctm_job), so the pool is
+        kept across cycles instead of re-spawning interpreters and
+        reconnecting every run. The first failure is re-raised after the
+        running jobs finish, like the serial loop would.
+
+        Returns: (topics created, CTMs with new topics)
+        """
+        total_topics = 0
+        processed = 0
+        first_error = None
+        running = {}
+        claims = self.leases.iter_claimed(
+            conn, "cluster", list(by_id), auto_release=False
+        )
+        executor = self._get_cluster_pool()
+        print("  clustering on %d processes" % workers)
+        try:
+            exhausted = False
+            while True:
+                while not exhausted and len(running) < workers:
+                    key = next(claims, None)
+                    if key is None:
+                        exhausted = True
+                        break
+                    ctm_id, centroid_id, track, _ = by_id[key]
+                    job = executor.submit(cluster_ctm_job, ctm_id, centroid_id, track)
+                    running[job] = key
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for job in finished:
+                    key = running.pop(job)
+                    try:
+                        written = job.result()
+                    except Exception as e:
+                        if isinstance(e, BrokenProcessPool):
+                            # A worker died: stop leasing, rebuild next cycle
+                            self._close_cluster_pool()
+                            exhausted = True
+                        _, centroid_id, track, _ = by_id[key]
+                        print("  clustering failed %s/%s: %s" % (centroid_id, track, e))
+                        self.leases.release(conn, "cluster", key, done=False)
+                        first_error = first_error or e
+                        continue
+                    self.leases.release(conn, "cluster", key)
+                    if written > 0:
+                        total_topics += written
+                        processed += 1
+        finally:
+            claims.close()
+            if running:
+                wait(running)
+            for key in running.values():
+                self.leases.release(conn, "cluster", key, done=False)
+
+        if first_error is not None:
+            raise first_error
+        return total_topics, processed
+
     # Unplugged (D-053): run_topic_aggregation (Phase 4.1 LLM merge)
     # Replaced by mechanical family assembly
 
@@ -726,7 +926,9 @@ class PipelineDaemon:
                 return
 
             print("Phase 4.5a-promote: %d CTMs..." % len(ctms))
-            for ctm_id, centroid_id, track in ctms:
+            by_id = {row[0]: row for row in ctms}
+            for key in self.leases.iter_claimed(conn, "promote", list(by_id)):
+                ctm_id, centroid_id, track = by_id[key]
                 try:
                     phase45a_promote_only(ctm_id)
                 except Exception as e:
@@ -762,7 +964,9 @@ class PipelineDaemon:
             print("Phase 4.5a-describe: %d CTMs need prose..." % len(ctms))
             import asyncio
 
-            for ctm_id, centroid_id, track in ctms:
+            by_id = {row[0]: row for row in ctms}
+            for key in self.leases.iter_claimed(conn, "describe", list(by_id)):
+                ctm_id, centroid_id, track = by_id[key]
                 try:
                     stats = asyncio.run(phase45a_describe(ctm_id))
                     if stats["written"] > 0:
@@ -770,6 +974,12 @@ class PipelineDaemon:
                 except Exception as e:
                     print("  4.5a-describe failed %s/%s: %s" % (centroid_id, track, e))
 
+            # One llm_stats cache row per phase for the whole slot
+            for phase, (hits, misses) in get_llm_cache().flush_stats().items():
+                print(
+                    "  LLM result cache %s: %d hits, %d misses" % (phase, hits, misses)
+                )
+
         finally:
             self.return_connection(conn)
 
@@ -812,7 +1022,9 @@ class PipelineDaemon:
             print("Phase 4.5-day: %d CTMs need briefs..." % len(ctms))
             import asyncio
 
-            for ctm_id, centroid_id, track in ctms:
+            by_id = {row[0]: row for row in ctms}
+            for key in self.leases.iter_claimed(conn, "daily_brief", list(by_id)):
+                ctm_id, centroid_id, track = by_id[key]
                 try:
                     stats = asyncio.run(phase45d_brief(ctm_id))
                     print("  %s/%s: %s" % (centroid_id, track, stats))
@@ -954,7 +1166,7 @@ class PipelineDaemon:
         """Materialize publisher analytics (all active feeds)."""
         from pipeline.phase_4.materialize_publisher_stats import materialize
 
-        materialize()
+        frontend_cache.revalidate(materialize(), ("mv_publisher_stats",))
 
     def run_materialize_event_triples(self):
         """Materialize event triples with polarity for current unfrozen months."""
@@ -966,7 +1178,7 @@ class PipelineDaemon:
         """Materialize centroid baselines and deviation detection."""
         from pipeline.phase_4.materialize_baselines import materialize
 
-        materialize()
+        frontend_cache.revalidate(materialize(), ("mv_centroid_baselines",))
 
     def run_materialize_centroid_stats(self):
         """Materialize per-centroid coverage stats (source counts + freshness).
@@ -977,7 +1189,7 @@ class PipelineDaemon:
         """
         from pipeline.phase_4.materialize_centroid_stats import materialize
 
-        materialize()
+        frontend_cache.revalidate(materialize(), ("mv_centroid_stats",))
 
     def run_materialize_centroid_month_view(self):
         """Materialize per-(centroid, month, locale) CentroidMonthView blobs.
@@ -989,7 +1201,7 @@ class PipelineDaemon:
         """
         from pipeline.phase_4.materialize_centroid_month_view import materialize
 
-        materialize()
+        frontend_cache.revalidate(materialize(), ("mv_centroid_month_view",))
 
     def run_materialize_calendar_month_view(self):
         """Materialize per-(centroid, track, month, locale) CalendarMonthView blobs.
@@ -1001,7 +1213,7 @@ class PipelineDaemon:
         """
         from pipeline.phase_4.materialize_calendar_month_view import materialize
 
-        materialize()
+        frontend_cache.revalidate(materialize(), ("mv_calendar_month_view",))
 
     def run_materialize_global_month_view(self):
         """Materialize per-(month, locale) GlobalMonthView blobs.
@@ -1012,7 +1224,7 @@ class PipelineDaemon:
         """
         from pipeline.phase_4.materialize_global_month_view import materialize
 
-        materialize()
+        frontend_cache.revalidate(materialize(), ("mv_global_month_view",))
 
     def run_materialize_narratives_landing(self):
         """Materialize per-locale NarrativesLanding blobs.
@@ -1023,7 +1235,7 @@ class PipelineDaemon:
         """
         from pipeline.phase_4.materialize_narratives_landing import materialize
 
-        materialize()
+        frontend_cache.revalidate(materialize(), ("mv_narratives_landing",))
 
     def run_materialize_narrative_detail(self):
         """Materialize per-(narrative_id, locale) NarrativeDetail blobs.
@@ -1034,7 +1246,7 @@ class PipelineDaemon:
         """
         from pipeline.phase_4.materialize_narrative_detail import materialize
 
-        materialize()
+        frontend_cache.revalidate(materialize(), ("mv_narrative_detail",))
 
     def run_materialize_positions(self):
         """Materialize the position landing + detail blobs (SPEC v2 §5.5).
@@ -1045,7 +1257,9 @@ class PipelineDaemon:
         """
         from pipeline.phase_4.materialize_positions import materialize
 
-        materialize()
+        frontend_cache.revalidate(
+            materialize(), ("mv_positions_landing", "mv_position_detail")
+        )
 
     def run_materialize_outlet_landing(self):
         """Materialize per-outlet OutletLanding blobs.
@@ -1057,7 +1271,7 @@ class PipelineDaemon:
         """
         from pipeline.phase_4.materialize_outlet_landing import materialize
 
-        materialize()
+        frontend_cache.revalidate(materialize(), ("mv_outlet_landing",))
 
     def run_materialize_signal_pages(self):
         """Materialize signal category + detail blobs.
@@ -1070,7 +1284,9 @@ class PipelineDaemon:
         """
         from pipeline.phase_4.materialize_signals import materialize
 
-        materialize()
+        frontend_cache.revalidate(
+            materialize(), ("mv_signal_category", "mv_signal_detail")
+        )
 
     def run_match_narratives(self):
         """Match events to strategic narratives (mechanical scoring)."""
@@ -1173,19 +1389,23 @@ class PipelineDaemon:
         finally:
             self.return_connection(conn)
 
-    def run_phase_with_retry(self, phase_name: str, phase_func, *args, **kwargs):
+    def run_phase_with_retry(
+        self, phase_name: str, phase_func, *args, max_retries=None, **kwargs
+    ):
         """
         Run a phase with retry logic.
 
         Args:
             phase_name: Human-readable phase name
             phase_func: Function to execute
+            max_retries: Attempts for this phase (default self.max_retries)
             *args, **kwargs: Arguments to pass to phase_func
         """
-        for attempt in range(1, self.max_retries + 1):
+        max_retries = max_retries or self.max_retries
+        for attempt in range(1, max_retries + 1):
             try:
                 print(f"\n{'='*70}")
-                print(f"{phase_name} - Attempt {attempt}/{self.max_retries}")
+                print(f"{phase_name} - Attempt {attempt}/{max_retries}")
                 print(f"{'='*70}")
 
                 start_time = time.time()
@@ -1196,16 +1416,14 @@ class PipelineDaemon:
                 return result
 
             except Exception as e:
-                print(
-                    f"{phase_name} failed (attempt {attempt}/{self.max_retries}): {e}"
-                )
+                print(f"{phase_name} failed (attempt {attempt}/{max_retries}): {e}")
 
-                if attempt < self.max_retries:
+                if attempt < max_retries:
                     backoff = self.retry_backoff**attempt
                     print(f"Retrying in {backoff:.1f}s...")
                     time.sleep(backoff)
                 else:
-                    print(f"{phase_name} failed after {self.max_retries} attempts")
+                    print(f"{phase_name} failed after {max_retries} attempts")
                     raise
 
     async def run_with_timeout(self, phase_name, coro, timeout_seconds):
@@ -1216,435 +1434,489 @@ class PipelineDaemon:
             print(f"{phase_name} timed out after {timeout_seconds}s, moving on")
             return None
 
-    async def run_cycle(self):
-        """Run one complete pipeline cycle (4 slots + daily purge)"""
-        self.cycle_count += 1
-        cycle_start = time.time()
-
-        print("\n" + "#" * 70)
-        print("# PIPELINE CYCLE %d" % self.cycle_count)
-        print("# %s" % datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        print("#" * 70)
-
-        # Get queue stats
-        stats = self.get_queue_stats()
-        print("\nQueue Status:")
-        print("  Pending titles (Phase 2):        %d" % stats["pending_titles"])
-        print("  Titles need labels (Phase 3.1):  %d" % stats["titles_need_labels"])
-        print("  Titles need track (Phase 3.3):   %d" % stats["titles_need_track"])
-        print("  CTMs for clustering (Phase 4):   %d" % stats["ctms_for_clustering"])
-        print("  CTMs need summary (Phase 4.5b):  %d" % stats["ctms_need_summary"])
-
-        # --- SLOT 1: INGESTION (Phase 1 + Phase 2) ---
-        if self.should_run_slot("ingestion"):
-            slot_t0 = time.time()
-            await self.run_with_timeout(
+    # --- Phase graph -------------------------------------------------------
+    # Each due slot contributes PhaseNodes; PhaseDAG runs independent nodes
+    # concurrently within self.resource_limits. Deps on nodes that are not
+    # in this cycle (slot not due, no work) are dropped by PhaseDAG.
+
+    # Cross-slot ordering when several slots are due in the same cycle:
+    # a slot's entry nodes wait for the terminal nodes of these slots.
+    SLOT_AFTER = {
+        "classification": ("ingestion",),
+        "clustering": ("classification",),
+        "enrichment": ("clustering",),
+        "social": ("enrichment",),
+        "purge": (
+            "ingestion",
+            "classification",
+            "clustering",
+            "enrichment",
+            "fn_refresh",
+            "social",
+        ),
+    }
+
+    def _ingestion_nodes(self):
+        return [
+            PhaseNode(
+                "p1_ingest",
                 "Phase 1: RSS Ingestion",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 1: RSS Ingestion",
-                    run_ingestion,
-                    max_feeds=None,
-                ),
-                self.timeout_ingestion,
-            )
-            await self.run_with_timeout(
+                run_ingestion,
+                resource="net",
+                timeout=self.timeout_ingestion,
+                kwargs={"max_feeds": None},
+            ),
+            PhaseNode(
+                "p2_match",
                 "Phase 2: Centroid Matching",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 2: Centroid Matching",
-                    phase2_process,
-                    batch_size=100,
-                    max_titles=None,
-                ),
-                self.timeout_ingestion,
-            )
-            self.last_run["ingestion"] = time.time()
-            self._save_last_run(
-                "ingestion",
-                duration_ms=int((time.time() - slot_t0) * 1000),
-            )
-        else:
-            remaining = int(
-                self.ingestion_interval - (time.time() - self.last_run["ingestion"])
+                phase2_process,
+                deps=("p1_ingest",),
+                resource="cpu",
+                timeout=self.timeout_ingestion,
+                kwargs={"batch_size": 100, "max_titles": None},
+            ),
+        ]
+
+    def _classification_nodes(self, stats):
+        nodes = []
+        if stats["titles_need_labels"] > 0:
+            nodes.append(
+                PhaseNode(
+                    "p31_labels",
+                    "Phase 3.1: Label + Signal Extraction",
+                    phase31_extract,
+                    resource="llm",
+                    timeout=self.timeout_classification,
+                    kwargs={
+                        "max_titles": self.config.v3_p31_max_titles,
+                        "batch_size": self.config.v3_p31_batch_size,
+                        "concurrency": self.config.v3_p31_concurrency,
+                    },
+                )
             )
-            print("\nSlot 1 INGESTION: next in %ds" % remaining)
-
-        # --- SLOT 2: CLASSIFICATION (Phase 3.1 + 3.2 + 3.3) ---
-        if self.should_run_slot("classification"):
-            slot_t0 = time.time()
-            has_work = stats["titles_need_labels"] > 0 or stats["titles_need_track"] > 0
-            if has_work:
-                # Phase 3.1: Label + Signal Extraction
-                if stats["titles_need_labels"] > 0:
-                    await self.run_with_timeout(
-                        "Phase 3.1: Label + Signal Extraction",
-                        asyncio.to_thread(
-                            self.run_phase_with_retry,
-                            "Phase 3.1: Label + Signal Extraction",
-                            phase31_extract,
-                            max_titles=self.config.v3_p31_max_titles,
-                            batch_size=self.config.v3_p31_batch_size,
-                            concurrency=self.config.v3_p31_concurrency,
-                        ),
-                        self.timeout_classification,
-                    )
-                    # Phase 3.2: Entity Centroid Backfill (always after 3.1)
-                    await self.run_with_timeout(
-                        "Phase 3.2: Entity Centroid Backfill",
-                        asyncio.to_thread(
-                            self.run_phase_with_retry,
-                            "Phase 3.2: Entity Centroid Backfill",
-                            phase32_backfill,
-                            batch_size=500,
-                        ),
-                        self.timeout_classification,
-                    )
-
-                # Phase 3.3: Track Assignment (mechanical)
-                if stats["titles_need_track"] > 0:
-                    await self.run_with_timeout(
-                        "Phase 3.3: Track Assignment",
-                        asyncio.to_thread(
-                            self.run_phase_with_retry,
-                            "Phase 3.3: Track Assignment",
-                            phase33_process,
-                            max_titles=self.classification_batch_size,
-                        ),
-                        self.timeout_classification,
-                    )
-            else:
-                print("\nSlot 2 CLASSIFICATION: no work")
-            self.last_run["classification"] = time.time()
-            self._save_last_run(
-                "classification",
-                duration_ms=int((time.time() - slot_t0) * 1000),
+            # Phase 3.2: Entity Centroid Backfill (always after 3.1)
+            nodes.append(
+                PhaseNode(
+                    "p32_backfill",
+                    "Phase 3.2: Entity Centroid Backfill",
+                    phase32_backfill,
+                    deps=("p31_labels",),
+                    timeout=self.timeout_classification,
+                    kwargs={"batch_size": 500},
+                )
             )
-        else:
-            remaining = int(
-                self.classification_interval
-                - (time.time() - self.last_run["classification"])
+        if stats["titles_need_track"] > 0:
+            nodes.append(
+                PhaseNode(
+                    "p33_tracks",
+                    "Phase 3.3: Track Assignment",
+                    phase33_process,
+                    deps=("p32_backfill",),
+                    timeout=self.timeout_classification,
+                    kwargs={"max_titles": self.classification_batch_size},
+                )
             )
-            print("\nSlot 2 CLASSIFICATION: next in %ds" % remaining)
+        return nodes
 
-        # --- SLOT 3: CLUSTERING (Phase 4 cluster + 3.2 reconcile + 4.5a promote + 4.2* materialize) ---
-        if self.should_run_slot("clustering"):
-            slot_t0 = time.time()
+    def _clustering_nodes(self):
+        promote = ("p45a_promote",)
+        narratives = ("p42f_match_narratives",)
+        return [
             # Phase 4: Event Clustering (day-beat, D-056)
-            await self.run_with_timeout(
+            PhaseNode(
+                "p4_cluster",
                 "Phase 4: Event Clustering",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4: Event Clustering",
-                    self.run_event_clustering,
-                ),
-                self.timeout_clustering,
-            )
+                self.run_event_clustering,
+                resource="cpu",
+                timeout=self.timeout_clustering,
+                shared=True,
+            ),
             # Phase 3.2: Sibling reconciliation (same-CTM + cross-CTM, soft-delete)
-            await self.run_with_timeout(
+            PhaseNode(
+                "p32_reconcile",
                 "Phase 3.2: Sibling Reconciliation",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 3.2: Sibling Reconciliation",
-                    self.run_reconcile_siblings,
-                ),
-                900,
-            )
+                self.run_reconcile_siblings,
+                deps=("p4_cluster",),
+                resource="cpu",
+                timeout=900,
+            ),
             # Phase 4.5a-promote: instant mechanical ranking (no LLM)
-            await self.run_with_timeout(
+            PhaseNode(
+                "p45a_promote",
                 "Phase 4.5a: Promote",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.5a: Promote",
-                    self.run_promote,
-                ),
-                300,
-            )
+                self.run_promote,
+                deps=("p32_reconcile",),
+                shared=True,
+            ),
             # Phase 4.2: Materialize pre-computed views (mv_* tables)
-            await self.run_with_timeout(
+            PhaseNode(
+                "p42a_signals",
                 "Phase 4.2a: Centroid Top Signals",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.2a: Centroid Top Signals",
-                    self.run_materialize_signals,
-                ),
-                300,
-            )
-            await self.run_with_timeout(
+                self.run_materialize_signals,
+                deps=promote,
+            ),
+            PhaseNode(
+                "p42b_signal_graph",
                 "Phase 4.2b: Signal Graph",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.2b: Signal Graph",
-                    self.run_materialize_signal_graph,
-                ),
-                300,
-            )
-            await self.run_with_timeout(
-                "Phase 4.2c: Publisher Stats",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.2c: Publisher Stats",
-                    self.run_materialize_publisher_stats,
-                ),
-                600,
-            )
-            await self.run_with_timeout(
+                self.run_materialize_signal_graph,
+                deps=promote,
+            ),
+            PhaseNode(
+                "p42d_event_triples",
                 "Phase 4.2d: Event Triples",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.2d: Event Triples",
-                    self.run_materialize_event_triples,
-                ),
-                300,
-            )
-            await self.run_with_timeout(
+                self.run_materialize_event_triples,
+                deps=promote,
+            ),
+            # Baselines read mv_event_triples
+            PhaseNode(
+                "p42e_baselines",
                 "Phase 4.2e: Centroid Baselines",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.2e: Centroid Baselines",
-                    self.run_materialize_baselines,
-                ),
-                300,
-            )
-            await self.run_with_timeout(
+                self.run_materialize_baselines,
+                deps=("p42d_event_triples",),
+            ),
+            PhaseNode(
+                "p42e2_centroid_stats",
                 "Phase 4.2e2: Centroid Stats",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.2e2: Centroid Stats",
-                    self.run_materialize_centroid_stats,
-                ),
-                120,
-            )
-            await self.run_with_timeout(
+                self.run_materialize_centroid_stats,
+                deps=promote,
+                timeout=120,
+            ),
+            PhaseNode(
+                "p42e3_centroid_month",
                 "Phase 4.2e3: Centroid Month View",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.2e3: Centroid Month View",
-                    self.run_materialize_centroid_month_view,
-                ),
-                600,
-            )
-            await self.run_with_timeout(
+                self.run_materialize_centroid_month_view,
+                deps=promote,
+                timeout=600,
+            ),
+            PhaseNode(
+                "p42f_match_narratives",
+                "Phase 4.2f: Narrative Matching",
+                self.run_match_narratives,
+                deps=promote,
+            ),
+            # Everything below reads narrative attributions
+            PhaseNode(
+                "p42c_publisher_stats",
+                "Phase 4.2c: Publisher Stats",
+                self.run_materialize_publisher_stats,
+                deps=narratives,
+                timeout=600,
+            ),
+            PhaseNode(
+                "p42e4_calendar_month",
                 "Phase 4.2e4: Calendar Month View",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.2e4: Calendar Month View",
-                    self.run_materialize_calendar_month_view,
-                ),
-                900,
-            )
-            await self.run_with_timeout(
+                self.run_materialize_calendar_month_view,
+                deps=narratives,
+                timeout=900,
+            ),
+            PhaseNode(
+                "p42e5_global_month",
                 "Phase 4.2e5: Global Month View",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.2e5: Global Month View",
-                    self.run_materialize_global_month_view,
-                ),
-                300,
-            )
-            await self.run_with_timeout(
-                "Phase 4.2f: Narrative Matching",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.2f: Narrative Matching",
-                    self.run_match_narratives,
-                ),
-                300,
-            )
-            await self.run_with_timeout(
+                self.run_materialize_global_month_view,
+                deps=narratives,
+            ),
+            PhaseNode(
+                "p42g_narratives_landing",
                 "Phase 4.2g: Narratives Landing",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.2g: Narratives Landing",
-                    self.run_materialize_narratives_landing,
-                ),
-                300,
-            )
-            await self.run_with_timeout(
+                self.run_materialize_narratives_landing,
+                deps=narratives,
+            ),
+            PhaseNode(
+                "p42h_narrative_detail",
                 "Phase 4.2h: Narrative Detail",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.2h: Narrative Detail",
-                    self.run_materialize_narrative_detail,
-                ),
-                600,
-            )
-            await self.run_with_timeout(
+                self.run_materialize_narrative_detail,
+                deps=narratives,
+                timeout=600,
+            ),
+            # Positions also read event_positions, rebuilt by fn_refresh
+            PhaseNode(
+                "p42h2_positions",
                 "Phase 4.2h2: Position Pages",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.2h2: Position Pages",
-                    self.run_materialize_positions,
-                ),
-                600,
-            )
-            await self.run_with_timeout(
+                self.run_materialize_positions,
+                deps=narratives + ("fn_refresh",),
+                timeout=600,
+            ),
+            # Outlet landing reads mv_publisher_stats
+            PhaseNode(
+                "p42i_outlet_landing",
                 "Phase 4.2i: Outlet Landing",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.2i: Outlet Landing",
-                    self.run_materialize_outlet_landing,
-                ),
-                600,
-            )
-            await self.run_with_timeout(
+                self.run_materialize_outlet_landing,
+                deps=("p42c_publisher_stats",),
+                timeout=600,
+            ),
+            PhaseNode(
+                "p42j_signal_pages",
                 "Phase 4.2j: Signal Pages",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.2j: Signal Pages",
-                    self.run_materialize_signal_pages,
-                ),
-                900,
-            )
-            self.last_run["clustering"] = time.time()
-            self._save_last_run(
-                "clustering",
-                duration_ms=int((time.time() - slot_t0) * 1000),
-            )
-        else:
-            remaining = int(
-                self.clustering_interval - (time.time() - self.last_run["clustering"])
-            )
-            print("\nSlot 3 CLUSTERING: next in %ds" % remaining)
-
-        # --- SLOT 4: ENRICHMENT ---
-        if self.should_run_slot("enrichment"):
-            slot_t0 = time.time()
+                self.run_materialize_signal_pages,
+                deps=promote,
+                timeout=900,
+            ),
+        ]
+
+    def _enrichment_nodes(self):
+        return [
             # Phase 4.5a-describe: LLM prose for promoted events missing titles (EN+DE)
-            await self.run_with_timeout(
+            PhaseNode(
+                "p45a_describe",
                 "Phase 4.5a: Describe Promoted",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.5a: Describe Promoted",
-                    self.run_describe_promoted,
-                ),
-                3600,
-            )
-            # Phase 4.5-day: Daily thematic briefs (EN+DE)
-            await self.run_with_timeout(
+                self.run_describe_promoted,
+                resource="llm",
+                timeout=3600,
+                shared=True,
+            ),
+            # Phase 4.5-day: Daily thematic briefs (EN+DE), built on described events
+            PhaseNode(
+                "p45d_daily_briefs",
                 "Phase 4.5-day: Daily Briefs",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.5-day: Daily Briefs",
-                    self.run_daily_briefs,
-                ),
-                1800,
-            )
+                self.run_daily_briefs,
+                deps=("p45a_describe",),
+                resource="llm",
+                timeout=1800,
+                shared=True,
+            ),
             # Phase 4.2g: LLM narrative discovery (ideological tier, new events only)
-            await self.run_with_timeout(
+            PhaseNode(
+                "p42g_llm_discovery",
                 "Phase 4.2g: LLM Narrative Discovery",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.2g: LLM Narrative Discovery",
-                    self.run_narrative_llm_discovery,
-                ),
-                600,
-            )
+                self.run_narrative_llm_discovery,
+                resource="llm",
+                timeout=600,
+            ),
             # Phase 4.2h: LLM narrative review (operational tier, prune false positives)
-            await self.run_with_timeout(
+            PhaseNode(
+                "p42h_llm_review",
                 "Phase 4.2h: LLM Narrative Review",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 4.2h: LLM Narrative Review",
-                    self.run_narrative_llm_review,
-                ),
-                600,
-            )
+                self.run_narrative_llm_review,
+                resource="llm",
+                timeout=600,
+            ),
             # Phase 5.5-rolling: centroid rolling-30d summaries (EN+DE)
-            await self.run_with_timeout(
+            PhaseNode(
+                "p55_centroid_summaries",
                 "Phase 5.5-rolling: Centroid Summaries",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 5.5-rolling: Centroid Summaries",
-                    self.run_centroid_rolling_summaries,
-                ),
-                3600,
-            )
-            self.last_run["enrichment"] = time.time()
-            self._save_last_run(
-                "enrichment",
-                duration_ms=int((time.time() - slot_t0) * 1000),
+                self.run_centroid_rolling_summaries,
+                deps=("p45a_describe",),
+                resource="llm",
+                timeout=3600,
+            ),
+        ]
+
+    def _fn_refresh_nodes(self):
+        # Attributes promoted events; waits for promote + narrative matching
+        # when Slot 3 runs in the same cycle.
+        return [
+            PhaseNode(
+                "fn_refresh",
+                "Slot FN: FN Attribution Refresh",
+                self.run_fn_refresh,
+                deps=("p45a_promote", "p42f_match_narratives"),
+                timeout=self.timeout_fn_refresh,
             )
-        else:
-            remaining = int(
-                self.enrichment_interval - (time.time() - self.last_run["enrichment"])
+        ]
+
+    def _social_nodes(self):
+        return [
+            PhaseNode(
+                "social",
+                "Phase 5: Social Posting",
+                self._run_social,
+                resource="net",
+                timeout=self.timeout_social,
             )
-            print("\nSlot 4 ENRICHMENT: next in %ds" % remaining)
+        ]
 
-        # --- SLOT FN: FRICTION-NODE REFRESH (attribution + asset evidence) ---
-        if self.should_run_slot("fn_refresh"):
-            slot_t0 = time.time()
-            await self.run_with_timeout(
-                "Slot FN: FN Attribution Refresh",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Slot FN: FN Attribution Refresh",
-                    self.run_fn_refresh,
-                ),
-                self.timeout_fn_refresh,
+    def _purge_nodes(self):
+        return [
+            PhaseNode(
+                "purge",
+                "Daily Purge",
+                self.run_daily_purge,
+                timeout=self.timeout_purge,
             )
-            self.last_run["fn_refresh"] = time.time()
-            self._save_last_run(
-                "fn_refresh",
-                duration_ms=int((time.time() - slot_t0) * 1000),
+        ]
+
+    def _counters_nodes(self):
+        return [
+            PhaseNode(
+                "queue_counters",
+                "Queue Counter Reconciliation",
+                self.run_reconcile_counters,
+                timeout=self.timeout_counters,
             )
-        else:
-            remaining = int(
-                self.fn_refresh_interval - (time.time() - self.last_run["fn_refresh"])
+        ]
+
+    def _link_slots(self, slot_nodes: dict) -> list:
+        """Flatten due slots into one node list with cross-slot edges"""
+        terminals = {}
+        for slot, nodes in slot_nodes.items():
+            keys = {n.key for n in nodes}
+            used = {d for n in nodes for d in n.deps}
+            terminals[slot] = tuple(sorted(keys - used))
+
+        all_nodes = []
+        for slot, nodes in slot_nodes.items():
+            keys = {n.key for n in nodes}
+            after = tuple(
+                k
+                for earlier in self.SLOT_AFTER.get(slot, ())
+                for k in terminals.get(earlier, ())
+            )
+            for node in nodes:
+                node.slot = slot
+                if after and not keys.intersection(node.deps):
+                    node.deps = tuple(node.deps) + after
+                all_nodes.append(node)
+        return all_nodes
+
+    def _run_node(self, node: PhaseNode):
+        """PhaseDAG worker: the phase with the daemon's retry/backoff.
+
+        Shared nodes lease per CTM internally. Any other node first leases
+        itself ('node', key): if another worker holds it, or finished it
+        within half its slot's (wake) interval, this worker skips it.
+        """
+        if node.shared:
+            return self.run_phase_with_retry(
+                node.name, node.func, max_retries=node.retries, **node.kwargs
             )
-            print("\nSlot FN REFRESH: next in %ds" % remaining)
 
-        # --- SLOT 5: SOCIAL POSTING ---
-        if self.should_run_slot("social") and self.config.social_posting_enabled:
-            slot_t0 = time.time()
-            await self.run_with_timeout(
-                "Phase 5: Social Posting",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Phase 5: Social Posting",
-                    self._run_social,
-                ),
-                self.timeout_social,
+        interval = getattr(self, "%s_interval" % node.slot, 0)
+        fresh = 0.5 * min(interval, self.wake_min_interval.get(node.slot, interval))
+        # Pool connections only around lease calls, not across the phase
+        conn = self.get_connection()
+        try:
+            acquired = self.leases.try_acquire(conn, "node", node.key, int(fresh))
+        finally:
+            self.return_connection(conn)
+        if not acquired:
+            print("%s: running on another worker, skipped" % node.name)
+            return None
+
+        done = False
+        try:
+            result = self.run_phase_with_retry(
+                node.name, node.func, max_retries=node.retries, **node.kwargs
             )
-            self.last_run["social"] = time.time()
-            self._save_last_run(
-                "social",
-                duration_ms=int((time.time() - slot_t0) * 1000),
+            done = True
+            return result
+        finally:
+            conn = self.get_connection()
+            try:
+                self.leases.release(conn, "node", node.key, done=done)
+            finally:
+                self.return_connection(conn)
+
+    def _save_node_state(self, node: PhaseNode, result: NodeResult):
+        """Persist per-node duration/status as daemon_state 'node:<key>'"""
+        self._save_last_run(
+            "node:%s" % node.key,
+            duration_ms=result.duration_ms,
+            status=result.status,
+            error=result.error,
+            ts=result.finished or time.time(),
+        )
+
+    async def run_cycle(self):
+        """Run one complete pipeline cycle (due slots as one phase graph)"""
+        self.cycle_count += 1
+        cycle_start = time.time()
+
+        print("\n" + "#" * 70)
+        print("# PIPELINE CYCLE %d" % self.cycle_count)
+        print("# %s" % datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        print("#" * 70)
+
+        # Get queue stats
+        stats = self.get_queue_stats()
+        print("\nQueue Status:")
+        print("  Pending titles (Phase 2):        %d" % stats["pending_titles"])
+        print("  Titles need labels (Phase 3.1):  %d" % stats["titles_need_labels"])
+        print("  Titles need track (Phase 3.3):   %d" % stats["titles_need_track"])
+        print("  CTMs for clustering (Phase 4):   %d" % stats["ctms_for_clustering"])
+        print("  CTMs need summary (Phase 4.5b):  %d" % stats["ctms_need_summary"])
+
+        slot_nodes = {}
+        slots = [
+            ("ingestion", "Slot 1 INGESTION", self.ingestion_interval),
+            ("classification", "Slot 2 CLASSIFICATION", self.classification_interval),
+            ("clustering", "Slot 3 CLUSTERING", self.clustering_interval),
+            ("enrichment", "Slot 4 ENRICHMENT", self.enrichment_interval),
+            ("fn_refresh", "Slot FN REFRESH", self.fn_refresh_interval),
+            ("social", "Slot 5 SOCIAL", self.social_interval),
+            ("purge", "Daily Purge", self.purge_interval),
+            ("counters", "Queue Counters", self.counters_interval),
+        ]
+        for slot, label, interval in slots:
+            if slot == "social" and not self.config.social_posting_enabled:
+                continue
+            if not self.should_run_slot(slot):
+                remaining = int(interval - (time.time() - self.last_run[slot]))
+                print("\n%s: next in %ds" % (label, remaining))
+                continue
+            # Notifications arriving from here on ask for another run
+            woken = slot in self.pending_work
+            self.pending_work.discard(slot)
+            if woken:
+                print("\n%s: woken by upstream writes" % label)
+            if slot == "ingestion":
+                slot_nodes[slot] = self._ingestion_nodes()
+            elif slot == "classification":
+                slot_nodes[slot] = self._classification_nodes(stats)
+                if not slot_nodes[slot]:
+                    print("\nSlot 2 CLASSIFICATION: no work")
+            elif slot == "clustering":
+                slot_nodes[slot] = self._clustering_nodes()
+            elif slot == "enrichment":
+                slot_nodes[slot] = self._enrichment_nodes()
+            elif slot == "fn_refresh":
+                slot_nodes[slot] = self._fn_refresh_nodes()
+            elif slot == "social":
+                slot_nodes[slot] = self._social_nodes()
+            elif slot == "purge":
+                slot_nodes[slot] = self._purge_nodes()
+            elif slot == "counters":
+                slot_nodes[slot] = self._counters_nodes()
+
+        nodes = self._link_slots(slot_nodes)
+        results = {}
+        if nodes:
+            dag = PhaseDAG(
+                nodes,
+                self.resource_limits,
+                self._run_node,
+                on_finish=self._save_node_state,
             )
-        elif self.config.social_posting_enabled:
-            remaining = int(
-                self.social_interval - (time.time() - self.last_run["social"])
+            results = await dag.run()
+            print(
+                "\nPhase graph: %d nodes, critical path %.1fs"
+                % (len(nodes), dag.critical_path_ms(results) / 1000)
             )
-            print("\nSlot 5 SOCIAL: next in %ds" % remaining)
 
-        # --- DAILY PURGE ---
-        if self.should_run_slot("purge"):
-            slot_t0 = time.time()
-            await self.run_with_timeout(
-                "Daily Purge",
-                asyncio.to_thread(
-                    self.run_phase_with_retry,
-                    "Daily Purge",
-                    self.run_daily_purge,
-                ),
-                self.timeout_purge,
-            )
-            self.last_run["purge"] = time.time()
+        # Slot bookkeeping: a slot with an errored node is not marked as run,
+        # so it fires again next cycle (as before, when the error aborted it).
+        first_error = None
+        for slot, slot_node_list in slot_nodes.items():
+            slot_results = [results[n.key] for n in slot_node_list]
+            errors = [r for r in slot_results if r.status == "error"]
+            if errors:
+                first_error = first_error or errors[0].exception
+                continue
+            starts = [r.started for r in slot_results if r.started]
+            ends = [r.finished for r in slot_results if r.finished]
+            self.last_run[slot] = time.time()
             self._save_last_run(
-                "purge",
-                duration_ms=int((time.time() - slot_t0) * 1000),
+                slot,
+                duration_ms=int((max(ends) - min(starts)) * 1000) if starts else 0,
             )
-        else:
-            remaining = int(
-                self.purge_interval - (time.time() - self.last_run["purge"])
-            )
-            print("\nDaily Purge: next in %ds" % remaining)
 
         cycle_duration = time.time() - cycle_start
         print("\n" + "=" * 70)
         print("Cycle %d completed in %.1fs" % (self.cycle_count, cycle_duration))
         print("=" * 70)
 
+        if first_error is not None:
+            raise first_error
+
         # Print full statistics after cycle completion
         self.print_full_statistics()
 
@@ -1660,11 +1932,11 @@ class PipelineDaemon:
             % (self.ingestion_interval // 3600)
         )
         print(
-            "  Slot 2 CLASSIFICATION: %dm  (Phase 3.1 + 3.2 + 3.3)"
+            "  Slot 2 CLASSIFICATION: %dm  (Phase 3.1 + 3.2 + 3.3; woken by NOTIFY)"
             % (self.classification_interval // 60)
         )
         print(
-            "  Slot 3 CLUSTERING:     %dm  (Phase 4 + 4.1)"
+            "  Slot 3 CLUSTERING:     %dm  (Phase 4 + 4.1; woken by NOTIFY)"
             % (self.clustering_interval // 60)
         )
         print(
@@ -1681,22 +1953,26 @@ class PipelineDaemon:
                 % (self.social_interval // 3600)
             )
         print("  Daily Purge:           %dh" % (self.purge_interval // 3600))
+        print(
+            "  Queue Counters:        %dh  (exact recount)"
+            % (self.counters_interval // 3600)
+        )
         print("\nBatch Sizes:")
         print("  Classification: %d titles/run" % self.classification_batch_size)
         print("  Event summaries: %d events/run" % self.enrichment_max_events)
         print("  CTM summaries:   %d CTMs/run" % self.enrichment_max_ctms)
+        print("  Worker id:       %s" % self.leases.worker_id)
         print("\nPress Ctrl+C to shutdown gracefully\n")
 
+        self._wake = asyncio.Event()
+        self._start_listener()
+
         while self.running:
             try:
                 await self.run_cycle()
 
-                # Sleep between cycles (short interval for responsiveness)
-                sleep_time = 60  # 1 minute between cycle checks
-                for _ in range(sleep_time):
-                    if not self.running:
-                        break
-                    await asyncio.sleep(1)
+                # Sleep until the next slot is due or a NOTIFY wakes one up
+                await self._wait_for_work()
 
             except KeyboardInterrupt:
                 print("\nKeyboard interrupt detected, shutting down...")
@@ -1716,6 +1992,10 @@ class PipelineDaemon:
                 print("Waiting 60s before retry...")
                 await asyncio.sleep(60)
 
+        self._stop_listener()
+        self.leases.close()
+        self._close_cluster_pool()
+
         # Close connection pool
         if hasattr(self, "pool") and self.pool:
             self.pool.closeall()
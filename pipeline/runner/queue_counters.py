@@ -0,0 +1,215 @@
+"""
+Queue-depth counters for the pipeline daemon
+
+pipeline_queue_counters is maintained by statement-level triggers (see
+db/migrations/20261016_queue_counters.sql), so reading queue depths is a
+SUM over a few rows instead of the anti-join COUNTs get_queue_stats used
+to run every cycle.
+
+reconcile() recounts exactly and adds the difference as a correction. Both
+sides are read in one REPEATABLE READ snapshot and the correction is
+applied additively afterwards, so writers are never blocked and deltas
+committed meanwhile are kept.
+
+Counters that gate a phase are never trusted at zero: confirm_empty()
+checks them with an EXISTS, so drift cannot starve Phase 3.1 / 3.3 until
+the next reconcile.
+"""
+
+from psycopg2.extensions import ISOLATION_LEVEL_REPEATABLE_READ
+
+# Queues the daemon schedules on (counter key -> get_queue_stats key)
+QUEUES = {
+    "status:pending": "pending_titles",
+    "titles_need_labels": "titles_need_labels",
+    "titles_need_track": "titles_need_track",
+    "ctms_for_clustering": "ctms_for_clustering",
+    "ctms_need_summary": "ctms_need_summary",
+}
+
+
+# Gating queues (get_queue_stats key -> EXISTS query for "any work left")
+GATING_EXISTS = {
+    "titles_need_labels": """
+        SELECT EXISTS (
+            SELECT 1 FROM titles_v3 t
+            WHERE t.processing_status = 'assigned'
+              AND t.centroid_ids IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM title_labels tl WHERE tl.title_id = t.id)
+        )
+        """,
+    "titles_need_track": """
+        SELECT EXISTS (
+            SELECT 1 FROM titles_v3 t
+            WHERE t.processing_status = 'assigned'
+              AND t.centroid_ids IS NOT NULL
+              AND NOT EXISTS (
+                  SELECT 1 FROM title_assignments ta WHERE ta.title_id = t.id
+              )
+        )
+        """,
+}
+
+
+def count_exact(cur, min_titles: int) -> dict:
+    """Exact depths for every counter key (the expensive queries)"""
+    counts = {}
+
+    cur.execute(
+        """
+        SELECT 'status:' || COALESCE(processing_status, 'null'), COUNT(*)
+        FROM titles_v3
+        GROUP BY 1
+        """
+    )
+    counts.update(cur.fetchall())
+    counts.setdefault("status:pending", 0)
+
+    # Phase 3.1 queue (assigned titles without labels)
+    cur.execute(
+        """
+        SELECT COUNT(*)
+        FROM titles_v3 t
+        WHERE t.processing_status = 'assigned'
+          AND t.centroid_ids IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM title_labels tl WHERE tl.title_id = t.id)
+        """
+    )
+    counts["titles_need_labels"] = cur.fetchone()[0]
+
+    # Phase 3.3 queue (assigned titles without track assignment).
+    # NOT EXISTS instead of NOT IN — the latter spilled to disk
+    # (BuffileRead) and ran 30+ min on Render. 2026-05-06.
+    cur.execute(
+        """
+        SELECT COUNT(*)
+        FROM titles_v3 t
+        WHERE t.processing_status = 'assigned'
+          AND t.centroid_ids IS NOT NULL
+          AND NOT EXISTS (
+              SELECT 1 FROM title_assignments ta
+              WHERE ta.title_id = t.id
+          )
+        """
+    )
+    counts["titles_need_track"] = cur.fetchone()[0]
+
+    # Phase 4 cluster queue (CTMs that may need event regeneration)
+    cur.execute(
+        """
+        SELECT COUNT(*)
+        FROM ctm c
+        WHERE c.title_count >= 3
+          AND c.is_frozen = false
+        """
+    )
+    counts["ctms_for_clustering"] = cur.fetchone()[0]
+
+    # Phase 4.5 summary queue: no summary yet, or new events since the last
+    # one and the 24h cooldown passed. Time-dependent, so not trigger-kept.
+    cur.execute(
+        """
+        SELECT COUNT(*)
+        FROM ctm c
+        WHERE c.title_count >= %s
+          AND c.is_frozen = false
+          AND EXISTS (SELECT 1 FROM events_v3 e WHERE e.ctm_id = c.id)
+          AND (
+              c.summary_text IS NULL
+              OR (
+                  (SELECT COUNT(*) FROM events_v3 e WHERE e.ctm_id = c.id)
+                      > COALESCE(c.event_count_at_summary, 0)
+                  AND (c.last_summary_at IS NULL
+                       OR c.last_summary_at < NOW() - INTERVAL '24 hours')
+              )
+          )
+        """,
+        (min_titles,),
+    )
+    counts["ctms_need_summary"] = cur.fetchone()[0]
+
+    return counts
+
+
+def read_counters(cur) -> dict:
+    """Current counter totals per key (no QUEUES keys before the first reconcile)"""
+    cur.execute(
+        "SELECT queue, SUM(depth)::bigint FROM pipeline_queue_counters GROUP BY queue"
+    )
+    return dict(cur.fetchall())
+
+
+def queue_stats(counters: dict) -> dict:
+    """Map counter totals onto get_queue_stats() keys (never negative)"""
+    return {key: max(0, int(counters.get(q) or 0)) for q, key in QUEUES.items()}
+
+
+def confirm_empty(cur, stats: dict) -> list:
+    """Check gating queues whose counter reads 0 exactly (EXISTS stops at
+    the first row). Queues that do have work are set to 1 -- "at least
+    one" -- in `stats`.
+
+    Returns:
+        keys whose counter had drifted to 0
+    """
+    drifted = []
+    for key, sql in GATING_EXISTS.items():
+        if stats.get(key):
+            continue
+        cur.execute(sql)
+        if cur.fetchone()[0]:
+            stats[key] = 1
+            drifted.append(key)
+    return drifted
+
+
+def reconcile(conn, min_titles: int) -> dict:
+    """Recount exactly and correct the counters.
+
+    Returns:
+        {counter key: correction} for keys that had drifted
+    """
+    old_level = conn.isolation_level
+    conn.rollback()
+    conn.set_isolation_level(ISOLATION_LEVEL_REPEATABLE_READ)
+    try:
+        with conn.cursor() as cur:
+            # Same snapshot: counters reflect exactly the committed writes
+            # the exact counts see.
+            counters = read_counters(cur)
+            exact = count_exact(cur, min_titles)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.set_isolation_level(old_level)
+
+    corrections = {
+        key: exact.get(key, 0) - (counters.get(key) or 0)
+        for key in set(exact) | set(counters)
+    }
+    corrections = {key: delta for key, delta in corrections.items() if delta}
+
+    # Queue keys get a row even at zero so readers can tell "reconciled"
+    missing = set(QUEUES) - set(counters)
+    with conn.cursor() as cur:
+        for key in sorted(set(corrections) | missing):
+            delta = corrections.get(key, 0)
+            cur.execute(
+                """
+                INSERT INTO pipeline_queue_counters
+                    (queue, shard, depth, reconciled_at)
+                VALUES (%s, 0, %s, NOW())
+                ON CONFLICT (queue, shard) DO UPDATE
+                   SET depth = pipeline_queue_counters.depth + EXCLUDED.depth,
+                       updated_at = NOW(),
+                       reconciled_at = NOW()
+                """,
+                (key, delta),
+            )
+        cur.execute(
+            "UPDATE pipeline_queue_counters SET reconciled_at = NOW() WHERE shard = 0"
+        )
+    conn.commit()
+    return corrections
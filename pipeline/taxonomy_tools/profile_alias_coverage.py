@@ -26,6 +26,8 @@ from common import (
     title_matches_alias,
 )
 
+from pipeline.phase_2.match_centroids import load_taxonomy_rows
+
 
 def load_titles_for_centroid(centroid_id, title_status, limit_titles):
     """
@@ -84,35 +86,14 @@ def load_aliases_for_centroid(centroid_id, language_filter):
     Returns:
         dict: {language: [(alias, normalized_alias, taxonomy_id, centroid_id), ...]}
     """
-    conn = get_db_connection()
-
-    with conn.cursor() as cur:
-        if centroid_id:
-            # Filter by specific centroid
-            cur.execute(
-                """
-                SELECT id, centroid_id, aliases
-                FROM taxonomy_v3
-                WHERE is_active = true
-                  AND taxonomy_function = 'centroid_anchor'
-                  AND centroid_id = %s
-                """,
-                (centroid_id,),
-            )
-        else:
-            # All active taxonomy items
-            cur.execute(
-                """
-                SELECT id, centroid_id, aliases
-                FROM taxonomy_v3
-                WHERE is_active = true
-                  AND taxonomy_function = 'centroid_anchor'
-                """
-            )
-
-        taxonomy_items = cur.fetchall()
-
-    conn.close()
+    # Shared compiled-taxonomy artifact (rebuilt only when taxonomy_v3
+    # changes); linked_id is the centroid for centroid_anchor rows
+    taxonomy_items = [
+        (taxonomy_id, linked_id, aliases)
+        for taxonomy_id, _, linked_id, aliases, function in load_taxonomy_rows()
+        if function == "centroid_anchor"
+        and (not centroid_id or linked_id == centroid_id)
+    ]
 
     # Organize by language
     aliases_by_lang = defaultdict(list)
@@ -4,6 +4,10 @@ Usage:
     python scripts/llm_cost_report.py           # local
     python scripts/llm_cost_report.py --render  # Render DB
     python scripts/llm_cost_report.py --days 7  # last 7 days instead of 1
+
+prefix    = share of tokens_in served from the provider's prompt cache
+cache_hit = share of items answered from our own result caches (no call)
+p95_ms    = 95th percentile call latency (llm_stats.latency_ms)
 """
 
 import argparse
@@ -44,11 +48,16 @@ def main():
     cur.execute(
         """
         SELECT phase,
-               COUNT(*)                                AS calls,
-               COALESCE(SUM(tokens_in), 0)             AS in_tokens,
-               COALESCE(SUM(tokens_out), 0)            AS out_tokens,
-               COALESCE(AVG(latency_ms), 0)::int       AS avg_ms,
-               COUNT(*) FILTER (WHERE status != 'ok')  AS errors
+               COUNT(*) FILTER (WHERE status != 'cache')   AS calls,
+               COALESCE(SUM(tokens_in), 0)                 AS in_tokens,
+               COALESCE(SUM(tokens_out), 0)                AS out_tokens,
+               COALESCE(SUM(tokens_cached), 0)             AS cached_tokens,
+               COALESCE(AVG(latency_ms), 0)::int           AS avg_ms,
+               COALESCE(PERCENTILE_CONT(0.95) WITHIN GROUP
+                        (ORDER BY latency_ms), 0)::int     AS p95_ms,
+               COUNT(*) FILTER (WHERE status NOT IN ('ok', 'cache')) AS errors,
+               COALESCE(SUM(cache_hits), 0)                AS hits,
+               COALESCE(SUM(cache_misses), 0)              AS misses
           FROM llm_stats
          WHERE created_at >= NOW() - (%s || ' days')::interval
          GROUP BY phase
@@ -62,17 +71,49 @@ def main():
         print("No llm_stats rows in the window.")
         return
 
-    fmt = "{:<24} {:>8} {:>12} {:>12} {:>10} {:>7}"
-    print(fmt.format("phase", "calls", "tokens_in", "tokens_out", "avg_ms", "errors"))
-    print("-" * 78)
-    tot_c = tot_in = tot_out = 0
-    for phase, calls, t_in, t_out, ms, errs in rows:
-        print(fmt.format(phase, calls, f"{t_in:,}", f"{t_out:,}", ms, errs))
+    fmt = "{:<24} {:>8} {:>12} {:>8} {:>12} {:>10} {:>10} {:>7} {:>9}"
+    print(
+        fmt.format(
+            "phase",
+            "calls",
+            "tokens_in",
+            "prefix",
+            "tokens_out",
+            "avg_ms",
+            "p95_ms",
+            "errors",
+            "cache_hit",
+        )
+    )
+    print("-" * 108)
+    tot_c = tot_in = tot_cached = tot_out = 0
+    for phase, calls, t_in, t_out, t_cached, ms, p95, errs, hits, misses in rows:
+        prefix = f"{t_cached / t_in:.0%}" if t_in else ""
+        hit_rate = f"{hits / (hits + misses):.0%}" if hits + misses else ""
+        print(
+            fmt.format(
+                phase,
+                calls,
+                f"{t_in:,}",
+                prefix,
+                f"{t_out:,}",
+                ms,
+                p95,
+                errs,
+                hit_rate,
+            )
+        )
         tot_c += calls
         tot_in += t_in
+        tot_cached += t_cached
         tot_out += t_out
-    print("-" * 78)
-    print(fmt.format("TOTAL", tot_c, f"{tot_in:,}", f"{tot_out:,}", "", ""))
+    print("-" * 108)
+    prefix = f"{tot_cached / tot_in:.0%}" if tot_in else ""
+    print(
+        fmt.format(
+            "TOTAL", tot_c, f"{tot_in:,}", prefix, f"{tot_out:,}", "", "", "", ""
+        )
+    )
     print(f"\nGrand total tokens: {tot_in + tot_out:,}")
 
     conn.close()
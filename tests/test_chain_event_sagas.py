@@ -0,0 +1,43 @@
+"""
+Tests for saga candidate pairs (pipeline.phase_4.chain_event_sagas)
+
+Run: python -m pytest tests/test_chain_event_sagas.py
+"""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pipeline.phase_4.chain_event_sagas import (  # noqa: E402
+    build_tag_idf,
+    compute_score,
+    score_candidates,
+)
+
+
+def test_rare_shared_tag_pair_is_a_candidate():
+    rng = random.Random(5)
+    common = ["common%d" % k for k in range(12)]
+    events = [
+        {
+            "title": " ".join("word%d" % rng.randrange(100000) for _ in range(6)),
+            "tags": rng.sample(common, 8),
+        }
+        for _ in range(600)
+    ]
+    # One rare tag shared among common ones, nothing shared in titles
+    events.append({"title": "Port strike halts exports", "tags": ["rare"] + common[:5]})
+    events.append(
+        {"title": "Shipping insurers raise premiums", "tags": ["rare"] + common[4:9]}
+    )
+    a, b = len(events) - 2, len(events) - 1
+    tags_a, tags_b = set(events[a]["tags"]), set(events[b]["tags"])
+
+    tag_idf = build_tag_idf(events)
+    score, overlap = compute_score(events[a], events[b], tag_idf)
+    assert overlap >= 2 and score >= 0.35
+    # Plain (unweighted) tag Dice is below the threshold
+    assert 2 * len(tags_a & tags_b) / (len(tags_a) + len(tags_b)) < 0.35
+
+    assert (a, b) in score_candidates(events, 0.35, tag_idf)
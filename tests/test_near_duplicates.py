@@ -0,0 +1,94 @@
+"""
+Tests for core.near_duplicates (MinHash/LSH candidate pairs)
+
+Run: python -m pytest tests/test_near_duplicates.py
+"""
+
+import math
+import random
+import sys
+from itertools import combinations
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from core.near_duplicates import (  # noqa: E402
+    MinHashLSH,
+    candidate_pairs,
+    dice_to_jaccard,
+    weighted_dice_pairs,
+)
+
+
+def zipf_sets(n, vocab_size=5000, size=8, seed=7):
+    """Token sets drawn from a Zipf vocabulary: a few tokens in most sets"""
+    rng = random.Random(seed)
+    vocab = ["w%d" % k for k in range(vocab_size)]
+    weights = [1.0 / (k + 1) for k in range(vocab_size)]
+    return [set(rng.choices(vocab, weights, k=size)) for _ in range(n)]
+
+
+def test_skewed_input_stays_subquadratic():
+    n = 3000
+    sets = zipf_sets(n)
+    lsh = MinHashLSH(dice_to_jaccard(0.35))
+    pairs = lsh.candidate_pairs(sets)
+
+    all_pairs = n * (n - 1) / 2
+    assert len(pairs) < 0.25 * all_pairs
+    # Bucket cap bounds candidates linearly in n
+    assert len(pairs) <= lsh.bands * n * lsh.max_bucket / 2
+
+
+def test_skewed_input_keeps_near_duplicates():
+    rng = random.Random(3)
+    sets = zipf_sets(3000)
+    planted = []
+    for k in range(50):
+        i = 2 * k
+        near = set(sets[i])
+        near.discard(rng.choice(sorted(near)))
+        near.add("planted%d" % k)
+        sets.append(near)
+        planted.append((i, len(sets) - 1))
+
+    pairs = set(candidate_pairs(sets, dice_to_jaccard(0.35)))
+    assert all(p in pairs for p in planted)
+
+
+def test_small_input_returns_every_pair():
+    sets = [{"a", "b"}, set(), {"c"}, {"d", "e"}]
+    assert candidate_pairs(sets, 0.5) == list(combinations([0, 2, 3], 2))
+
+
+def weighted_dice(a, b, weight):
+    total = sum(weight(t) for t in a) + sum(weight(t) for t in b)
+    return 2 * sum(weight(t) for t in a & b) / total if total else 0.0
+
+
+def test_weighted_dice_keeps_rare_shared_tag():
+    # One rare tag among common ones: plain Dice 0.33, IDF-weighted 0.84
+    idf = {"rare": 1.0}
+
+    def weight(t):
+        return idf.get(t, 0.05)
+
+    a = {"rare", "c1", "c2", "c3", "c4", "c5"}
+    b = {"rare", "c1", "c6", "c7", "c8", "c9"}
+    others = [{"c%d" % k, "c%d" % (k + 1)} for k in range(2, 9)]
+    assert 2 * len(a & b) / (len(a) + len(b)) < 0.35
+    assert weighted_dice(a, b, weight) >= 0.35
+    assert (0, 1) in weighted_dice_pairs([a, b] + others, 0.35, weight)
+
+
+def test_weighted_dice_pairs_are_exact():
+    sets = zipf_sets(800, vocab_size=300, size=5, seed=11)
+    df = {}
+    for tokens in sets:
+        for t in tokens:
+            df[t] = df.get(t, 0) + 1
+    idf = {t: math.log(len(sets) / n) / math.log(len(sets)) for t, n in df.items()}
+    pairs = set(weighted_dice_pairs(sets, 0.35, idf.get))
+    for i, j in combinations(range(len(sets)), 2):
+        if weighted_dice(sets[i], sets[j], idf.get) >= 0.35:
+            assert (i, j) in pairs
+    assert len(pairs) < 0.25 * len(sets) * (len(sets) - 1) / 2